@@ -0,0 +1,109 @@
+import json
+from collections import Counter
+
+import pytest
+
+from x_rpc.balancer import (
+    Endpoint,
+    FileDiscovery,
+    LeastOutstandingLoadBalancer,
+    LoadBalancerType,
+    PowerOfTwoLoadBalancer,
+    RoundRobinLoadBalancer,
+    WeightedLoadBalancer,
+    get_load_balancer,
+    parse_endpoints,
+)
+from x_rpc.balancer.exceptions import InvalidEndpoint, LoadBalancerNotFound, NoAvailableEndpoint
+from x_rpc.config import Config
+
+
+def make_endpoints(*weights):
+    return [Endpoint(f"127.0.0.1:{8000 + i}", weight) for i, weight in enumerate(weights)]
+
+
+def test_parse_endpoints():
+    endpoints = parse_endpoints(["a:1", {"target": "b:2", "weight": 3}, ("c:3", 2)])
+    assert [(endpoint.target, endpoint.weight) for endpoint in endpoints] == [("a:1", 1), ("b:2", 3), ("c:3", 2)]
+    assert [endpoint.target for endpoint in parse_endpoints("a:1, b:2,")] == ["a:1", "b:2"]
+    with pytest.raises(InvalidEndpoint):
+        parse_endpoints(["localhost"])
+    with pytest.raises(InvalidEndpoint):
+        parse_endpoints([{"weight": 1}])
+
+
+@pytest.mark.parametrize(
+    "balancer_class",
+    [RoundRobinLoadBalancer, WeightedLoadBalancer, LeastOutstandingLoadBalancer, PowerOfTwoLoadBalancer],
+)
+def test_no_available_endpoint(balancer_class):
+    with pytest.raises(NoAvailableEndpoint):
+        balancer_class().pick()
+
+
+def test_round_robin():
+    balancer = RoundRobinLoadBalancer(make_endpoints(1, 1, 1))
+    assert [balancer.pick().target[-1] for _ in range(6)] == list("012012")
+
+
+def test_weighted():
+    balancer = WeightedLoadBalancer(make_endpoints(1, 3, 0))
+    counter = Counter(balancer.pick().target for _ in range(20000))
+    assert "127.0.0.1:8002" not in counter
+    assert 2.5 < counter["127.0.0.1:8001"] / counter["127.0.0.1:8000"] < 3.5
+
+
+def test_least_outstanding():
+    balancer = LeastOutstandingLoadBalancer(make_endpoints(1, 1, 1))
+    acquired = [balancer.acquire() for _ in range(3)]
+    # 每个地址各一个请求
+    assert len({endpoint.target for endpoint in acquired}) == 3
+    balancer.release(acquired[1])
+    assert balancer.pick() is acquired[1]
+    assert balancer.acquire() is acquired[1]
+    balancer.acquire()
+    assert sorted(endpoint.outstanding for endpoint in balancer.endpoints) == [1, 1, 2]
+    # 更新地址列表后保留进行中的请求数
+    balancer.update(make_endpoints(1, 1, 1, 1))
+    assert balancer.pick().target == "127.0.0.1:8003"
+    # 移除的地址完成请求不影响负载均衡
+    removed = [endpoint for endpoint in balancer.endpoints if endpoint.outstanding == 1][0]
+    balancer.update([endpoint for endpoint in make_endpoints(1, 1, 1, 1) if endpoint.target != removed.target])
+    balancer.release(removed)
+    assert balancer.pick().target == "127.0.0.1:8003"
+
+
+def test_power_of_two():
+    endpoints = make_endpoints(1, 1)
+    balancer = PowerOfTwoLoadBalancer(endpoints)
+    endpoints[0].outstanding = 10
+    assert all(balancer.pick() is endpoints[1] for _ in range(100))
+    assert PowerOfTwoLoadBalancer(endpoints[:1]).pick() is endpoints[0]
+
+
+def test_get_load_balancer():
+    config = Config({"USER_LOAD_BALANCER": "least_outstanding", "USER_ENDPOINTS": "a:1,b:2"})
+    balancer = get_load_balancer(config, "user")
+    assert isinstance(balancer, LeastOutstandingLoadBalancer)
+    assert [endpoint.target for endpoint in balancer.endpoints] == ["a:1", "b:2"]
+    assert isinstance(get_load_balancer(Config(), "order"), RoundRobinLoadBalancer)
+    config = Config({"CLIENT_LOAD_BALANCER": LoadBalancerType.POWER_OF_TWO})
+    assert isinstance(get_load_balancer(config, "order", make_endpoints(1)), PowerOfTwoLoadBalancer)
+    with pytest.raises(LoadBalancerNotFound):
+        get_load_balancer(Config({"CLIENT_LOAD_BALANCER": "random"}), "user")
+
+
+def test_file_discovery(tmp_path):
+    path = tmp_path / "endpoints.json"
+    discovery = FileDiscovery(str(path))
+    assert not discovery.refresh()
+    path.write_text(json.dumps({"user": ["a:1", {"target": "b:2", "weight": 2}]}))
+    assert discovery.refresh()
+    assert [endpoint.target for endpoint in discovery.get_endpoints("user")] == ["a:1", "b:2"]
+    assert discovery.get_endpoints("order") is None
+    # 文件没有变化
+    assert not discovery.refresh()
+    # 不合法的内容保留上一次的服务地址
+    path.write_text("{")
+    assert not discovery.refresh()
+    assert len(discovery.get_endpoints("user")) == 2
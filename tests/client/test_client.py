@@ -0,0 +1,288 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+
+from x_rpc.balancer.exceptions import NoAvailableEndpoint
+from x_rpc.client import Client
+from x_rpc.client.exceptions import RemoteException
+from x_rpc.config import Config
+from x_rpc.exceptions import BusinessException, ErrorType, RequestTimeout
+from x_rpc.server import Server
+from x_rpc.utils.deadline import reset_deadline, set_deadline
+
+
+@pytest_asyncio.fixture
+async def server():
+    server = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+
+    @server.handler()
+    async def echo(request):
+        await asyncio.sleep(0.01)
+        return request.body
+
+    @server.handler()
+    def fail(request):
+        raise BusinessException(1001, "business error")
+
+    @server.handler()
+    async def slow(request):
+        await asyncio.sleep(1)
+
+    await server.start()
+    yield server
+    await server.close()
+
+
+def get_target(server):
+    host, port = server.sockets[0].getsockname()[:2]
+    return f"{host}:{port}"
+
+
+def test_client_config_from_env(monkeypatch):
+    monkeypatch.setenv("XRPC_CLIENT_POOL_SIZE", "8")
+    monkeypatch.setenv("XRPC_CLIENT_IDLE_TIMEOUT", "1.5")
+    monkeypatch.setenv("XRPC_CLIENT_MAX_IN_FLIGHT", "100")
+    client = Client()
+    assert client.pool_size == 8
+    assert client.idle_timeout == 1.5
+    assert client.max_in_flight == 100
+
+
+@pytest.mark.asyncio
+async def test_fan_out_reuses_connections(server):
+    client = Client(Config({"CLIENT_POOL_SIZE": 2, "CLIENT_MAX_IN_FLIGHT": 1000}))
+    target = get_target(server)
+    bodies = [str(i).encode() for i in range(1000)]
+    try:
+        results = await asyncio.gather(*(client.call(target, "echo", body) for body in bodies))
+        assert results == bodies
+        assert len(client.get_pool(target).connections) <= 2
+        assert len(server.connections) <= 2
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight(server):
+    client = Client(Config({"CLIENT_POOL_SIZE": 1, "CLIENT_MAX_IN_FLIGHT": 10}))
+    target = get_target(server)
+    try:
+        results = await asyncio.gather(*(client.call(target, "echo", b"x") for _ in range(50)))
+        assert results == [b"x"] * 50
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_remote_exception(server):
+    client = Client()
+    try:
+        with pytest.raises(RemoteException) as exc_info:
+            await client.call(get_target(server), "fail")
+        assert exc_info.value.code == 1001
+        assert exc_info.value.exception_type == ErrorType.BUSINESS
+        assert exc_info.value.message == "business error"
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout(server):
+    client = Client()
+    try:
+        with pytest.raises(RequestTimeout):
+            await client.call(get_target(server), "slow", timeout=0.05)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout_waiting_for_connection(server):
+    client = Client(Config({"CLIENT_POOL_SIZE": 1, "CLIENT_MAX_IN_FLIGHT": 1}))
+    target = get_target(server)
+    try:
+        busy = asyncio.ensure_future(client.call(target, "slow"))
+        await asyncio.sleep(0.05)
+        # 连接已满时，等待可用连接的时间也计入超时时间
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(RequestTimeout):
+            await client.call(target, "echo", b"x", timeout=0.05)
+        assert loop.time() - started < 0.5
+        busy.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await busy
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_deadline_propagation(server):
+    client = Client()
+    target = get_target(server)
+
+    @server.handler()
+    def remaining(request):
+        return str(request.timeout).encode()
+
+    @server.handler()
+    async def proxy(request):
+        return await client.call(target, "remaining", timeout=10)
+
+    server.router.compile()
+    try:
+        # 没有截止时间
+        assert await client.call(target, "remaining") == b"None"
+        # 下游调用的超时时间不超过上游请求的剩余时间
+        assert 0 < float(await client.call(target, "proxy", timeout=1)) <= 1
+        # 上游请求已经过期，不再发送请求
+        token = set_deadline(asyncio.get_running_loop().time() - 1)
+        try:
+            with pytest.raises(RequestTimeout):
+                await client.call(target, "remaining", timeout=10)
+        finally:
+            reset_deadline(token)
+        assert all(not connection.waiters for connection in client.get_pool(target).connections)
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout(server):
+    client = Client(Config({"CLIENT_IDLE_TIMEOUT": 0.05}))
+    target = get_target(server)
+    try:
+        await client.call(target, "echo", b"x")
+        assert len(client.get_pool(target).connections) == 1
+        await asyncio.sleep(0.2)
+        assert len(client.get_pool(target).connections) == 0
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_invoke_with_serializer():
+    config = Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0, "USER_SERIALIZER": "binary"})
+    server = Server(config)
+
+    @server.handler("user.get", serialize=True)
+    def get_user(request):
+        return {"id": request.body["id"], "avatar": b"\x89PNG"}
+
+    await server.start()
+    client = Client(config)
+    try:
+        result = await client.invoke(get_target(server), "user.get", {"id": 1})
+        assert result == {"id": 1, "avatar": b"\x89PNG"}
+        # 无法解析的请求体返回 400
+        with pytest.raises(RemoteException) as exc_info:
+            await client.call(get_target(server), "user.get", b"\x0a")
+        assert exc_info.value.code == 400
+    finally:
+        await client.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_call_service(server, tmp_path):
+    second = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+    second.add_handler("echo", lambda request: b"second")
+    await second.start()
+    client = Client(Config({"ECHO_ENDPOINTS": [get_target(server), get_target(second)]}))
+    try:
+        results = await asyncio.gather(*(client.call("echo", "echo", b"first") for _ in range(4)))
+        assert sorted(results) == [b"first", b"first", b"second", b"second"]
+        assert all(endpoint.outstanding == 0 for endpoint in client.get_balancer("echo").endpoints)
+    finally:
+        await client.close()
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_call_service_with_discovery(server, tmp_path):
+    path = tmp_path / "endpoints.json"
+    path.write_text(json.dumps({"echo": [get_target(server)]}))
+    client = Client(Config({"CLIENT_DISCOVERY_FILE": str(path), "CLIENT_DISCOVERY_INTERVAL": 0}))
+    try:
+        assert await client.call("echo", "echo", b"x") == b"x"
+        path.write_text(json.dumps({"echo": []}))
+        with pytest.raises(NoAvailableEndpoint):
+            await client.call("echo", "echo", b"x")
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_discovery_removes_endpoints(server, tmp_path):
+    second = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+    started = asyncio.Event()
+    finished = asyncio.Event()
+
+    @second.handler("echo")
+    async def slow_echo(request):
+        started.set()
+        await finished.wait()
+        return b"second"
+
+    await second.start()
+    path = tmp_path / "endpoints.json"
+    path.write_text(json.dumps({"echo": [get_target(server), get_target(second)], "other": [get_target(server)]}))
+    client = Client(Config({"CLIENT_DISCOVERY_FILE": str(path), "CLIENT_DISCOVERY_INTERVAL": 0}))
+    try:
+        assert await client.call("other", "echo", b"x") == b"x"
+        results = [await client.call("echo", "echo", b"first")]
+        pending = asyncio.ensure_future(client.call("echo", "echo", b"first"))
+        await started.wait()
+        assert set(client.pools) == {get_target(server), get_target(second)}
+
+        # 删除的地址等进行中的请求完成后关闭连接池
+        path.write_text(json.dumps({"echo": [get_target(server)], "other": [get_target(server)]}))
+        results.append(await client.call("echo", "echo", b"first"))
+        assert get_target(second) in client.pools
+        finished.set()
+        results.append(await pending)
+        assert sorted(results) == [b"first", b"first", b"second"]
+        assert set(client.pools) == {get_target(server)}
+
+        # 服务从文件中删除后清空地址
+        path.write_text(json.dumps({"echo": [get_target(server)]}))
+        with pytest.raises(NoAvailableEndpoint):
+            await client.call("other", "echo", b"x")
+        assert await client.call("echo", "echo", b"x") == b"x"
+    finally:
+        await client.close()
+        await second.close()
+
+
+@pytest.mark.asyncio
+async def test_discovery_removes_connecting_endpoint(server, tmp_path, monkeypatch):
+    path = tmp_path / "endpoints.json"
+    path.write_text(json.dumps({"echo": [get_target(server)]}))
+    client = Client(Config({"CLIENT_DISCOVERY_FILE": str(path), "CLIENT_DISCOVERY_INTERVAL": 0}))
+    connecting = asyncio.Event()
+    connected = asyncio.Event()
+    create_connection = client.transport.create_connection
+
+    async def slow_create_connection(*args, **kwargs):
+        connecting.set()
+        await connected.wait()
+        return await create_connection(*args, **kwargs)
+
+    monkeypatch.setattr(client.transport, "create_connection", slow_create_connection)
+    try:
+        pending = asyncio.ensure_future(client.call("echo", "echo", b"x"))
+        await connecting.wait()
+        pool = client.get_pool(get_target(server))
+
+        # 请求还在建立连接时地址被删除，连接池等请求完成后再关闭
+        path.write_text(json.dumps({"echo": []}))
+        client.get_balancer("echo")
+        assert client.pools.get(get_target(server)) is pool
+        connected.set()
+        assert await pending == b"x"
+        assert get_target(server) not in client.pools
+        assert not pool.connections
+    finally:
+        await client.close()
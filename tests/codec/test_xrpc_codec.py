@@ -0,0 +1,114 @@
+import pytest
+
+from x_rpc.codec import XRPCCodec
+from x_rpc.codec.exceptions import FrameDecodeError
+from x_rpc.codec.xrpc_codec import FLAG_DEADLINE, FLAG_RESPONSE, HEADER, HEADER_SIZE, MAGIC, MAX_FRAME_SIZE, VERSION
+from x_rpc.exceptions import ErrorCode
+
+
+@pytest.fixture
+def codec():
+    return XRPCCodec()
+
+
+def test_decode_request(codec):
+    buffer = bytearray()
+    frames = codec.decode(buffer, codec.encode_request(1, "echo", b"hello"))
+    assert len(frames) == 1
+    frame = frames[0]
+    assert frame.request_id == 1
+    assert frame.flags == 0
+    assert frame.status == 0
+    assert frame.method == "echo"
+    assert frame.body == b"hello"
+    assert isinstance(frame.body, bytes)
+    assert not buffer
+
+
+def test_decode_response(codec):
+    frames = codec.decode(bytearray(), codec.encode_response(2, ErrorCode.ERR_UNKNOWN, b"error"))
+    assert frames[0].request_id == 2
+    assert frames[0].flags & FLAG_RESPONSE
+    assert frames[0].status == ErrorCode.ERR_UNKNOWN
+    assert frames[0].method == ""
+    assert frames[0].body == b"error"
+
+
+def test_decode_partial_frames(codec):
+    data = codec.encode_request(1, "echo", b"hello") + codec.encode_request(2, "echo", b"world")
+    buffer = bytearray()
+    frames = []
+    # 逐字节接收数据
+    for i in range(len(data)):
+        frames.extend(codec.decode(buffer, data[i:i + 1]))
+    assert [frame.body for frame in frames] == [b"hello", b"world"]
+    assert not buffer
+
+
+def test_decode_pipelined_frames(codec):
+    data = b"".join(codec.encode_request(i, "echo", str(i).encode()) for i in range(100))
+    buffer = bytearray()
+    # 第一次接收包含多个完整帧和一个不完整的帧
+    frames = codec.decode(buffer, data[:-3])
+    assert len(frames) == 99
+    assert len(buffer) == len(codec.encode_request(99, "echo", b"99")) - 3
+    frames.extend(codec.decode(buffer, data[-3:]))
+    assert [frame.request_id for frame in frames] == list(range(100))
+    assert not buffer
+
+
+def test_decode_invalid_method(codec):
+    data = bytearray(codec.encode_request(1, "echo", b"a"))
+    data[HEADER_SIZE] = 0xFF
+    frames = codec.decode(bytearray(), bytes(data) + codec.encode_request(2, "echo", b"b"))
+    assert frames[0].method is None
+    assert frames[0].body == b"a"
+    assert frames[1].method == "echo"
+
+
+def test_decode_invalid_magic(codec):
+    data = HEADER.pack(0, VERSION, 0, 1, 0, 0, 0)
+    with pytest.raises(FrameDecodeError):
+        codec.decode(bytearray(), data)
+
+
+def test_decode_frame_too_large(codec):
+    data = HEADER.pack(MAGIC, VERSION, 0, 1, 0, 0, MAX_FRAME_SIZE + 1)
+    with pytest.raises(FrameDecodeError):
+        codec.decode(bytearray(), data)
+
+
+def test_header_size():
+    assert HEADER_SIZE == 16
+
+
+def test_encode_cached_response():
+    codec = XRPCCodec()
+    frame = codec.encode_cached_response(1, 503, b"Service Unavailable")
+    assert frame == codec.encode_response(1, 503, b"Service Unavailable")
+    frame = codec.encode_cached_response(2, 503, b"Service Unavailable")
+    frames = codec.decode(bytearray(), frame)
+    assert frames[0].request_id == 2
+    assert frames[0].status == 503
+    assert frames[0].body == b"Service Unavailable"
+
+
+def test_decode_request_with_deadline(codec):
+    data = codec.encode_request(1, "echo", b"hello", timeout=1.5) + codec.encode_request(2, "echo", b"world")
+    buffer = bytearray()
+    frames = []
+    for i in range(len(data)):
+        frames.extend(codec.decode(buffer, data[i:i + 1]))
+    assert frames[0].flags & FLAG_DEADLINE
+    assert frames[0].timeout == 1.5
+    assert frames[0].method == "echo"
+    assert frames[0].body == b"hello"
+    assert not frames[1].flags & FLAG_DEADLINE
+    assert frames[1].timeout is None
+    assert frames[1].body == b"world"
+
+
+def test_encode_deadline_rounding(codec):
+    # 不足一毫秒的剩余时间向上取整，过期的请求编码为 0
+    assert codec.decode(bytearray(), codec.encode_request(1, "echo", b"", timeout=0.0001))[0].timeout == 0.001
+    assert codec.decode(bytearray(), codec.encode_request(1, "echo", b"", timeout=-1))[0].timeout == 0
@@ -1,3 +1,4 @@
+import os
 from contextlib import contextmanager
 from os import environ
 from pathlib import Path
@@ -8,6 +9,7 @@ import pytest
 
 from x_rpc.config import Config
 from x_rpc.exceptions import PyFileException
+from x_rpc.utils import module as module_utils
 
 
 @contextmanager
@@ -161,8 +163,7 @@ def test_load_config_from_file_invalid_syntax():
 
 
 def test_overwrite_exisiting_config():
-    config = Config()
-    config.DEFAULT = 1
+    config = Config({"DEFAULT": 1})
 
     class OtherConfig:
         DEFAULT = 2
@@ -235,3 +236,60 @@ def test_setter():
     config = SetterConfig()
     config.a = 1
     assert config.b == 2
+
+
+def test_load_from_file_cache(monkeypatch):
+    calls = []
+    original_compile_file = module_utils.compile_file
+
+    def compile_file(location):
+        calls.append(location)
+        return original_compile_file(location)
+
+    monkeypatch.setattr(module_utils, "compile_file", compile_file)
+    with temp_path() as config_path:
+        config_path.write_text("VALUE = ['a', 'b']")
+        config = Config()
+        config.load_from_path(config_path)
+        assert config.VALUE == ["a", "b"]
+
+        # 文件没有变化时使用缓存，不会再次编译执行
+        config = Config()
+        config.load_from_path(config_path)
+        assert len(calls) == 1
+        assert config.VALUE == ["a", "b"]
+
+        # 文件变化后重新加载
+        config_path.write_text("VALUE = ['a', 'c']")
+        stat_result = config_path.stat()
+        os.utime(config_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1000))
+        config = Config()
+        config.load_from_path(config_path)
+        assert len(calls) == 2
+        assert config.VALUE == ["a", "c"]
+
+
+def test_load_from_file_cache_copy():
+    with temp_path() as config_path:
+        config_path.write_text("VALUE = {'hosts': ['a'], 'options': {'debug': False}}")
+        config = Config()
+        config.load_from_path(config_path)
+        # 原地修改嵌套的配置值不会影响之后的加载
+        config.VALUE["hosts"].append("b")
+        config.VALUE["options"]["debug"] = True
+        config = Config()
+        config.load_from_path(config_path)
+        assert config.VALUE == {"hosts": ["a"], "options": {"debug": False}}
+
+
+def test_load_from_envvar_cache(monkeypatch):
+    with TemporaryDirectory() as td:
+        for name, value in (("a", 1), ("b", 2)):
+            Path(td, name).write_text(f"VALUE = {value}")
+        monkeypatch.setenv("APP_CONFIG_NAME", "a")
+        config = Config()
+        config.load_from_path(f"{td}/${{APP_CONFIG_NAME}}")
+        assert config.VALUE == 1
+        monkeypatch.setenv("APP_CONFIG_NAME", "b")
+        config.load_from_path(f"{td}/${{APP_CONFIG_NAME}}")
+        assert config.VALUE == 2
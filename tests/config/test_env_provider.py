@@ -0,0 +1,92 @@
+from x_rpc.config import Config
+from x_rpc.config.provider.env_index import DefaultEnvironIndex, EnvironIndex
+
+
+def test_scan(monkeypatch):
+    monkeypatch.setenv("XRPCTEST_A", "1")
+    monkeypatch.setenv("XRPCTEST_B", "2")
+    monkeypatch.setenv("XRPCTESTX", "3")
+    index = EnvironIndex()
+    index.refresh()
+    assert index.scan("XRPCTEST_") == [("XRPCTEST_A", "1"), ("XRPCTEST_B", "2")]
+
+
+def test_cache_invalidation(monkeypatch):
+    monkeypatch.setenv("XRPCTEST_A", "1")
+    index = EnvironIndex()
+    assert index.load(["XRPCTEST_"]) == {"A": 1}
+    version = index.version
+    assert index.load(["XRPCTEST_"]) == {"A": 1}
+    assert index.version == version
+    # 原地修改环境变量的值
+    monkeypatch.setenv("XRPCTEST_A", "2")
+    assert index.load(["XRPCTEST_"]) == {"A": 2}
+    assert index.version == version + 1
+    # 强制重建索引
+    index.invalidate()
+    assert index.load(["XRPCTEST_"]) == {"A": 2}
+    assert index.version == version + 2
+    monkeypatch.delenv("XRPCTEST_A")
+    assert index.load(["XRPCTEST_"]) == {}
+    monkeypatch.setenv("XRPCTEST_B", "1")
+    assert index.load(["XRPCTEST_"]) == {"B": 1}
+
+
+def test_load_copy(monkeypatch):
+    monkeypatch.setenv("XRPCTEST_DB__HOST", "127.0.0.1")
+    index = EnvironIndex()
+    config = index.load(["XRPCTEST_"], "__")
+    config["DB"]["HOST"] = "changed"
+    assert index.load(["XRPCTEST_"], "__") == {"DB": {"HOST": "127.0.0.1"}}
+
+
+def test_config_reuse_index(monkeypatch):
+    monkeypatch.setenv("XRPC_REUSE_VALUE", "1")
+    assert Config().REUSE_VALUE == 1
+    version = DefaultEnvironIndex.version
+    # 环境变量没有变化时，创建 Config 不重建索引
+    for _ in range(10):
+        assert Config().REUSE_VALUE == 1
+    assert DefaultEnvironIndex.version == version
+    # 环境变量的数量不变时也能发现变化
+    monkeypatch.delenv("XRPC_REUSE_VALUE")
+    monkeypatch.setenv("XRPC_REUSE_OTHER", "2")
+    config = Config()
+    assert "REUSE_VALUE" not in config
+    assert config.REUSE_OTHER == 2
+    assert DefaultEnvironIndex.version == version + 1
+
+
+def test_config_reload_environ(monkeypatch):
+    monkeypatch.setenv("XRPC_RELOAD_VALUE", "1")
+    config = Config()
+    monkeypatch.setenv("XRPC_RELOAD_VALUE", "2")
+    assert config.reload().RELOAD_VALUE == 2
+
+
+def test_nested(monkeypatch):
+    monkeypatch.setenv("XRPCTEST_DB__POOL_SIZE", "10")
+    monkeypatch.setenv("XRPCTEST_DB__HOST", "127.0.0.1")
+    monkeypatch.setenv("XRPCTEST_DB__REPLICA__HOST", "127.0.0.2")
+    monkeypatch.setenv("XRPCTEST_NAME", "xrpc")
+    index = EnvironIndex()
+    assert index.load(["XRPCTEST_"], "__") == {
+        "DB": {"POOL_SIZE": 10, "HOST": "127.0.0.1", "REPLICA": {"HOST": "127.0.0.2"}},
+        "NAME": "xrpc",
+    }
+    assert index.load(["XRPCTEST_"])["DB__POOL_SIZE"] == 10
+
+
+def test_multi_prefix(monkeypatch):
+    monkeypatch.setenv("XRPC_MULTI_A", "1")
+    monkeypatch.setenv("XRPC_MULTI_B", "1")
+    monkeypatch.setenv("MYAPP_MULTI_B", "2")
+    config = Config(env_prefix=["XRPC_", "MYAPP_"])
+    assert config.MULTI_A == 1
+    assert config.MULTI_B == 2
+
+
+def test_config_nested(monkeypatch):
+    monkeypatch.setenv("XRPC_DB__POOL_SIZE", "10")
+    config = Config(env_nested_delimiter="__")
+    assert config.DB == {"POOL_SIZE": 10}
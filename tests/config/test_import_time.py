@@ -0,0 +1,57 @@
+"""使用 python -X importtime 检查导入耗时，防止导入耗时退化"""
+import subprocess
+import sys
+
+# 导入 x_rpc.config 并创建配置的耗时预算（微秒），留出足够的余量避免测试不稳定
+IMPORT_TIME_BUDGET = 100000
+# 创建默认配置时不应该导入的模块
+FORBIDDEN_MODULES = {
+    "asyncio",
+    "concurrent.futures",
+    "importlib.metadata",
+    "inspect",
+    "yaml",
+    "x_rpc.config.provider.ini_provider",
+    "x_rpc.config.provider.json_provider",
+    "x_rpc.config.provider.path_provider",
+    "x_rpc.config.provider.toml_provider",
+    "x_rpc.config.provider.yaml_provider",
+    "x_rpc.config.shared",
+    "x_rpc.config.watcher",
+}
+
+
+def get_import_times(code):
+    """返回 模块名 -> 累计导入耗时（微秒），只统计顶层导入 ."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        module_name = name.strip()
+        import_times[module_name] = int(cumulative)
+        # 缩进的模块是被其他模块导入的，耗时已经计入上层模块
+        if name[1:2] != " ":
+            total += int(cumulative)
+    return import_times, total
+
+
+def test_import_config_is_lazy():
+    import_times, _ = get_import_times("import x_rpc.config")
+    assert "x_rpc.config.config" not in import_times
+    assert "x_rpc.config.provider" not in import_times
+    assert "x_rpc.plugin.helper" not in import_times
+
+
+def test_create_config_import_time():
+    # 先执行一次，生成字节码缓存
+    get_import_times("from x_rpc.config import Config; Config()")
+    import_times, total = get_import_times("from x_rpc.config import Config; Config()")
+    assert not FORBIDDEN_MODULES & set(import_times)
+    # importlib.import_module 导入的模块不会出现在 importtime 的输出中，通过环境变量提供者导入的模块判断
+    assert "x_rpc.config.provider.env_index" in import_times
+    assert total < IMPORT_TIME_BUDGET, sorted(import_times.items(), key=lambda item: item[1])[-10:]
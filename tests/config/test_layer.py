@@ -0,0 +1,75 @@
+from x_rpc.config import Config, ConfigLayer
+
+
+def test_layer_precedence(tmp_path, monkeypatch):
+    path = tmp_path / "app.json"
+    monkeypatch.setenv("XRPC_LAYER_PORT", "8002")
+    config = Config({"HOST": "default", "LAYER_PORT": 8000, "DEBUG": False})
+    # 后加载的配置文件不会覆盖环境变量
+    path.write_text('{"HOST": "file", "LAYER_PORT": 8001}')
+    config.load_from_path(str(path))
+    assert config.HOST == "file"
+    assert config.LAYER_PORT == 8002
+    assert config.DEBUG is False
+
+    config.update_layer(ConfigLayer.DEFAULTS, {"HOST": "other"})
+    assert config.HOST == "file"
+    config.HOST = "runtime"
+    assert config.HOST == "runtime"
+
+
+def test_explain(tmp_path, monkeypatch):
+    path = tmp_path / "app.json"
+    path.write_text('{"LAYER_PORT": 8001}')
+    monkeypatch.setenv("XRPC_LAYER_PORT", "8002")
+    config = Config({"LAYER_PORT": 8000})
+    config.load_from_path(str(path))
+
+    origin = config.explain("LAYER_PORT")
+    assert origin.layer == ConfigLayer.ENV
+    assert origin.value == 8002
+    assert origin.overridden == [(ConfigLayer.FILE, 8001), (ConfigLayer.DEFAULTS, 8000)]
+
+    config.set_layer(ConfigLayer.REMOTE, {"LAYER_PORT": 8003})
+    assert config.LAYER_PORT == 8003
+    assert config.explain("LAYER_PORT").layer == ConfigLayer.REMOTE
+
+    # 清空远程覆盖配置后恢复环境变量的值
+    config.set_layer(ConfigLayer.REMOTE, {})
+    assert config.LAYER_PORT == 8002
+    assert config.explain("LAYER_PORT").layer == ConfigLayer.ENV
+
+
+def test_reload_layer(tmp_path, monkeypatch):
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1}')
+    config = Config()
+    config.load_from_path(str(path))
+    monkeypatch.setenv("XRPC_LAYER_VALUE", "1")
+    path.write_text('{"VALUE": 20}')
+    snapshot = config.reload(ConfigLayer.FILE)
+    assert snapshot.VALUE == 20
+    # 只重新加载了配置文件层
+    assert "LAYER_VALUE" not in snapshot
+    assert config.explain("VALUE").layer == ConfigLayer.FILE
+
+
+def test_load_from_object_layer(monkeypatch):
+    class Settings:
+        OBJECT_VALUE = 1
+        OBJECT_ENV = 1
+
+    monkeypatch.setenv("XRPC_OBJECT_ENV", "2")
+    config = Config({"OBJECT_VALUE": 0})
+    config.load_from_object(Settings)
+    assert config.OBJECT_VALUE == 1
+    assert config.explain("OBJECT_VALUE").layer == ConfigLayer.FILE
+    # 环境变量和运行时配置覆盖对象中的配置
+    assert config.OBJECT_ENV == 2
+    config.OBJECT_VALUE = 3
+    assert config.reload().OBJECT_VALUE == 3
+    config.set_layer(ConfigLayer.RUNTIME, {})
+    assert config.OBJECT_VALUE == 1
+    # 重新加载时重新解析对象
+    Settings.OBJECT_VALUE = 4
+    assert config.reload(ConfigLayer.FILE).OBJECT_VALUE == 4
@@ -0,0 +1,134 @@
+import json
+from textwrap import dedent
+
+import pytest
+
+from x_rpc.config import Config
+from x_rpc.config.exceptions import ConfigParseError
+from x_rpc.config.provider import ConfigProviderType, get_provider_type
+
+
+@pytest.mark.parametrize(
+    "location, provider_type",
+    [
+        ("/etc/app.toml", ConfigProviderType.TOML),
+        ("/etc/app.json", ConfigProviderType.JSON),
+        ("/etc/app.yaml", ConfigProviderType.YAML),
+        ("/etc/app.yml", ConfigProviderType.YAML),
+        ("/etc/app.ini", ConfigProviderType.INI),
+        ("/etc/app.cfg", ConfigProviderType.INI),
+        ("/etc/app.py", ConfigProviderType.PATH),
+        ("${APP_CONFIG}", ConfigProviderType.PATH),
+        ("app.settings.json", ConfigProviderType.PATH),
+    ],
+)
+def test_get_provider_type(location, provider_type):
+    assert get_provider_type(location) == provider_type
+
+
+def test_load_from_json(tmp_path):
+    path = tmp_path / "app.json"
+    routes = {f"service{i}.method": f"127.0.0.1:{8000 + i}" for i in range(1000)}
+    path.write_text(json.dumps({"VALUE": "some value", "ROUTES": routes, "lower": 1}))
+    config = Config()
+    config.load_from_path(str(path))
+    assert config.VALUE == "some value"
+    assert config.ROUTES == routes
+    assert "lower" not in config
+
+
+def test_load_from_toml(tmp_path):
+    path = tmp_path / "app.toml"
+    path.write_text(
+        dedent(
+            """
+            VALUE = "some value"
+            PORT = 8000
+
+            [DATABASE]
+            HOST = "127.0.0.1"
+            """
+        )
+    )
+    config = Config()
+    config.load_from_path(str(path))
+    assert config.VALUE == "some value"
+    assert config.PORT == 8000
+    assert config.DATABASE == {"HOST": "127.0.0.1"}
+
+
+def test_load_from_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "app.yaml"
+    path.write_text(
+        dedent(
+            """
+            VALUE: some value
+            HOSTS:
+              - 127.0.0.1
+              - 127.0.0.2
+            """
+        )
+    )
+    config = Config()
+    config.load_from_path(str(path))
+    assert config.VALUE == "some value"
+    assert config.HOSTS == ["127.0.0.1", "127.0.0.2"]
+
+
+def test_load_from_yaml_is_safe(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "app.yaml"
+    path.write_text("VALUE: !!python/object/apply:os.system ['echo unsafe']")
+    with pytest.raises(ConfigParseError):
+        Config().load_from_path(str(path))
+
+
+def test_load_from_ini(tmp_path):
+    path = tmp_path / "app.ini"
+    path.write_text(
+        dedent(
+            """
+            [DATABASE]
+            Host = 127.0.0.1
+            PORT = 3306
+            """
+        )
+    )
+    config = Config()
+    config.load_from_path(str(path))
+    assert config.DATABASE == {"Host": "127.0.0.1", "PORT": "3306"}
+
+
+def test_load_from_ini_lowercase_section(tmp_path):
+    path = tmp_path / "app.ini"
+    path.write_text(
+        dedent(
+            """
+            [server]
+            host = 0.0.0.0
+            [Server]
+            port = 8000
+            """
+        )
+    )
+    config = Config()
+    config.load_from_path(str(path))
+    # 段落名转换为大写，同名段落合并
+    assert config.SERVER == {"host": "0.0.0.0", "port": "8000"}
+
+
+def test_explicit_provider_type(tmp_path):
+    path = tmp_path / "app.conf"
+    path.write_text(json.dumps({"VALUE": 1}))
+    config = Config()
+    config.load_from_path(str(path), ConfigProviderType.JSON)
+    assert config.VALUE == 1
+
+
+@pytest.mark.parametrize("suffix, content", [(".json", "{"), (".json", "[]"), (".toml", "VALUE = "), (".ini", "VALUE")])
+def test_parse_error(tmp_path, suffix, content):
+    path = tmp_path / f"app{suffix}"
+    path.write_text(content)
+    with pytest.raises(ConfigParseError):
+        Config().load_from_path(str(path))
@@ -0,0 +1,118 @@
+import sys
+from typing import List, Optional
+
+import pytest
+
+from x_rpc.config import Config, ConfigSchema
+from x_rpc.config.exceptions import ConfigException
+
+
+class ServerSchema(ConfigSchema):
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    SERVER_DEBUG: bool = False
+    SERVER_TIMEOUT: float = 1.0
+    SERVER_NAME: Optional[str] = None
+    SERVER_ALLOW_HOSTS: List[str] = []
+
+
+class RequiredSchema(ConfigSchema):
+    TOKEN: str
+
+
+class ChildSchema(ServerSchema):
+    WORKERS: int = 1
+
+
+def test_schema_slots():
+    assert set(ServerSchema.__slots__) == {
+        "SERVER_HOST",
+        "SERVER_PORT",
+        "SERVER_DEBUG",
+        "SERVER_TIMEOUT",
+        "SERVER_NAME",
+        "SERVER_ALLOW_HOSTS",
+    }
+    schema = ServerSchema()
+    assert not hasattr(schema, "__dict__")
+    with pytest.raises(ConfigException):
+        schema.SERVER_PORT = 1
+
+
+def test_schema_defaults():
+    schema = ServerSchema()
+    assert schema.SERVER_HOST == "127.0.0.1"
+    assert schema.SERVER_PORT == 8000
+    assert schema.SERVER_DEBUG is False
+    assert schema.SERVER_NAME is None
+    assert schema.SERVER_ALLOW_HOSTS == []
+
+
+def test_schema_converters():
+    schema = ServerSchema(
+        {
+            "SERVER_PORT": "9000",
+            "SERVER_DEBUG": "yes",
+            "SERVER_TIMEOUT": 2,
+            "SERVER_NAME": 1,
+            "SERVER_ALLOW_HOSTS": "a, b,",
+        }
+    )
+    assert schema.SERVER_PORT == 9000
+    assert schema.SERVER_DEBUG is True
+    assert schema.SERVER_TIMEOUT == 2.0
+    assert isinstance(schema.SERVER_TIMEOUT, float)
+    assert schema.SERVER_NAME == "1"
+    assert schema.SERVER_ALLOW_HOSTS == ["a", "b"]
+
+
+def test_schema_invalid():
+    with pytest.raises(ConfigException, match="SERVER_PORT"):
+        ServerSchema(SERVER_PORT="port")
+    with pytest.raises(ConfigException, match="TOKEN is required"):
+        RequiredSchema()
+
+
+class StringAnnotationSchema(ConfigSchema):
+    # 等价于 from __future__ import annotations
+    PORT: "int" = 1
+    TIMEOUT: "Optional[float]" = None
+    HOSTS: "List[int]" = []
+
+
+def test_schema_string_annotations():
+    schema = StringAnnotationSchema(PORT="2", TIMEOUT="1", HOSTS="1,2")
+    assert schema.PORT == 2
+    assert schema.TIMEOUT == 1.0
+    assert schema.HOSTS == [1, 2]
+    with pytest.raises(ConfigException, match="UnknownType"):
+
+        class InvalidSchema(ConfigSchema):
+            VALUE: "UnknownType" = None  # noqa: F821
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="X | None requires Python 3.10")
+def test_schema_union_type():
+    class UnionSchema(ConfigSchema):
+        PORT: "int | None" = None
+
+    assert UnionSchema().PORT is None
+    assert UnionSchema(PORT="1").PORT == 1
+
+
+def test_schema_inheritance():
+    schema = ChildSchema(WORKERS="4", SERVER_PORT=1)
+    assert schema.WORKERS == 4
+    assert schema.SERVER_PORT == 1
+    assert ChildSchema.__slots__ == ("WORKERS",)
+
+
+def test_bind(monkeypatch):
+    monkeypatch.setenv("XRPC_SERVER_PORT", "9000")
+    config = Config({"SERVER_DEBUG": "on"})
+    schema = config.bind(ServerSchema)
+    assert schema.SERVER_PORT == 9000
+    assert schema.SERVER_DEBUG is True
+    assert config.bind(ServerSchema) is schema
+    config.SERVER_PORT = 9001
+    assert config.bind(ServerSchema).SERVER_PORT == 9001
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from x_rpc.config import Config, ConfigLayer
+from x_rpc.config.exceptions import ConfigException
+from x_rpc.config.shared import SharedConfigReader, SharedConfigWriter
+
+
+def test_writer_reader(tmp_path):
+    path = tmp_path / "config.shm"
+    writer = SharedConfigWriter(path)
+    assert writer.write({"VALUE": 1}) == 1
+    reader = SharedConfigReader(path)
+    assert reader.read() == (1, {"VALUE": 1})
+
+    # 超过映射的大小后扩容，读取者重新映射
+    values = {"VALUE": "x" * os.sysconf("SC_PAGESIZE") * 3}
+    assert writer.write(values) == 2
+    assert reader.generation == 2
+    assert reader.read() == (2, values)
+    writer.close()
+
+    # 新的主进程沿用之前的代数
+    writer = SharedConfigWriter(path)
+    assert writer.write({"VALUE": 3}) == 3
+    assert reader.read() == (3, {"VALUE": 3})
+    writer.close()
+    reader.close()
+
+
+def test_reader_invalid_file(tmp_path):
+    with pytest.raises(ConfigException):
+        SharedConfigReader(tmp_path / "missing.shm")
+    path = tmp_path / "empty.shm"
+    path.write_bytes(b"")
+    with pytest.raises(ConfigException):
+        SharedConfigReader(path)
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ConfigException):
+        SharedConfigReader(path)
+
+
+def test_attach(tmp_path, monkeypatch):
+    path = tmp_path / "config.shm"
+    monkeypatch.setenv("XRPC_SHARED_VALUE", "1")
+    master = Config({"DEFAULT": 1})
+    assert master.share(path) == 1
+
+    monkeypatch.setenv("XRPC_SHARED_VALUE", "2")
+    worker = Config.attach(path)
+    # 工作进程不扫描环境变量
+    assert worker.SHARED_VALUE == 1
+    assert worker.snapshot.DEFAULT == 1
+    assert worker.explain("DEFAULT").layer == ConfigLayer.FILE
+    assert not worker.refresh()
+
+    master.reload()
+    # 单个配置项的更新不会立即写入
+    master.RUNTIME = 1
+    assert "RUNTIME" not in worker.snapshot
+    master.RUNTIME_OTHER = 1
+    assert master.share() == 3
+    snapshot = worker.snapshot
+    assert snapshot.RUNTIME_OTHER == 1
+    assert snapshot.SHARED_VALUE == 2
+    assert snapshot.RUNTIME == 1
+    assert worker.snapshot is snapshot
+
+
+def test_share_without_path():
+    with pytest.raises(ConfigException):
+        Config().share()
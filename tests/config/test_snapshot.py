@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+
+import pytest
+
+from x_rpc.config import Config
+from x_rpc.config.exceptions import ConfigException, ConfigParseError
+from x_rpc.config.layer import ConfigLayer
+from x_rpc.config.provider import ConfigProviderType
+from x_rpc.config.watcher import ConfigWatcher, Inotify
+
+
+def touch(path, content):
+    path.write_text(content)
+    # 保证修改时间发生变化
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1000000))
+
+
+def test_snapshot():
+    config = Config({"VALUE": 1})
+    snapshot = config.snapshot
+    assert snapshot.VALUE == 1
+    assert snapshot["VALUE"] == 1
+    assert "VALUE" in snapshot
+    assert config.snapshot is snapshot
+    with pytest.raises(ConfigException):
+        snapshot.VALUE = 2
+    with pytest.raises(AttributeError, match="Config has no 'MISSING'"):
+        _ = snapshot.MISSING
+
+    config.VALUE = 2
+    new_snapshot = config.snapshot
+    assert new_snapshot.VALUE == 2
+    assert new_snapshot.version > snapshot.version
+    # 旧的快照不会变化
+    assert snapshot.VALUE == 1
+
+
+def test_reload(tmp_path, monkeypatch):
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1, "FILE_ONLY": 1}')
+    config = Config({"DEFAULT": 1})
+    config.load_from_path(str(path))
+    config.RUNTIME = 1
+    version = config.version
+
+    touch(path, '{"VALUE": 2}')
+    monkeypatch.setenv("XRPC_RELOAD_ANSWER", "42")
+    snapshot = config.reload()
+    assert snapshot.version > version
+    assert snapshot.VALUE == 2
+    assert snapshot.DEFAULT == 1
+    assert snapshot.RUNTIME == 1
+    assert snapshot.RELOAD_ANSWER == 42
+    assert "FILE_ONLY" not in snapshot
+    assert config.VALUE == 2
+    assert "FILE_ONLY" not in config
+
+
+def test_update_unchanged_keeps_snapshot():
+    config = Config({"VALUE": 1})
+    snapshot = config.snapshot
+    config.VALUE = 1
+    # 被高优先级配置层覆盖的配置不影响快照
+    config.RUNTIME_ONLY = 1
+    config.update_layer(ConfigLayer.DEFAULTS, {"RUNTIME_ONLY": 2})
+    new_snapshot = config.snapshot
+    assert new_snapshot is not snapshot
+    config.update_layer(ConfigLayer.DEFAULTS, {"RUNTIME_ONLY": 3})
+    assert config.snapshot is new_snapshot
+    assert config.RUNTIME_ONLY == 1
+
+
+def test_reload_in_place(tmp_path):
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1, "FILE_ONLY": 1}')
+    config = Config()
+    config.load_from_path(str(path))
+    missing = []
+    stopped = threading.Event()
+
+    def read():
+        # 不加锁读取配置，重新加载过程中保留的配置项不会消失
+        while not stopped.is_set():
+            if "VALUE" not in config:
+                missing.append(True)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for value in range(200):
+            path.write_text('{"VALUE": %d}' % value)
+            config.reload(ConfigLayer.FILE)
+    finally:
+        stopped.set()
+        reader.join()
+    assert not missing
+    assert config.VALUE == 199
+    assert "FILE_ONLY" not in config
+
+
+def test_reload_failed_keeps_snapshot(tmp_path):
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1}')
+    config = Config()
+    config.load_from_path(str(path))
+    snapshot = config.snapshot
+    touch(path, "{")
+    with pytest.raises(ConfigParseError):
+        config.reload()
+    assert config.snapshot is snapshot
+    assert config.VALUE == 1
+
+
+def test_watch(tmp_path):
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1}')
+    config = Config()
+    config.load_from_path(str(path))
+    reloaded = threading.Event()
+    config.watch(interval=0.05, callback=lambda snapshot: reloaded.set())
+    try:
+        time.sleep(0.1)
+        touch(path, '{"VALUE": 2}')
+        assert reloaded.wait(5)
+        assert config.snapshot.VALUE == 2
+    finally:
+        config.unwatch()
+
+
+def test_watch_relative_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1}')
+    config = Config()
+    # 不包含路径分隔符的文件名需要指定配置提供者类型，否则作为模块字符串加载
+    config.load_from_path("app.json", ConfigProviderType.JSON)
+    config.load_from_path("x_rpc.config.constants")
+    # 相对路径转换为绝对路径后监听，模块字符串不监听
+    assert config._watch_paths == [str(path)]
+    reloaded = threading.Event()
+    config.watch(interval=0.05, callback=lambda snapshot: reloaded.set())
+    try:
+        time.sleep(0.1)
+        touch(path, '{"VALUE": 2}')
+        assert reloaded.wait(5)
+        assert config.snapshot.VALUE == 2
+    finally:
+        config.unwatch()
+
+
+def test_watcher_polling(tmp_path, monkeypatch):
+    monkeypatch.setattr(Inotify, "create", classmethod(lambda cls: None))
+    path = tmp_path / "app.py"
+    path.write_text("VALUE = 1")
+    changed = threading.Event()
+    watcher = ConfigWatcher([str(path)], changed.set, interval=0.05)
+    watcher.start()
+    try:
+        touch(path, "VALUE = 2")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+        watcher.join()
@@ -0,0 +1,92 @@
+import types
+
+from x_rpc.config import utils
+from x_rpc.config.utils import parse_config_from_object
+
+
+def test_parse_dict():
+    assert parse_config_from_object({"A": 1, "b": 2}) == {"A": 1}
+    assert parse_config_from_object({"A": 1, "B": 2, "c": 3}, allow=["B", "c", "D"]) == {"B": 2}
+
+
+def test_parse_object():
+    class Base:
+        A = 1
+        b = 2
+
+    class Settings(Base):
+        C = 3
+
+    settings = Settings()
+    settings.D = 4
+    assert parse_config_from_object(Settings) == {"C": 3}
+    assert parse_config_from_object(settings) == {"D": 4, "C": 3}
+
+
+def test_parse_module_changed():
+    module = types.ModuleType("generated_config")
+    for i in range(100):
+        setattr(module, f"KEY_{i}", i)
+    module.lower = 1
+    config = parse_config_from_object(module)
+    assert len(config) == 100
+
+    config["KEY_0"] = -1
+    assert parse_config_from_object(module)["KEY_0"] == 0
+
+    # 属性数量不变时修改或替换属性也能被感知到
+    module.KEY_1 = -1
+    del module.KEY_2
+    module.NEW_KEY = 1
+    config = parse_config_from_object(module)
+    assert config["KEY_1"] == -1
+    assert "KEY_2" not in config
+    assert config["NEW_KEY"] == 1
+
+
+def test_parse_module_cache(monkeypatch):
+    module = types.ModuleType("generated_config")
+    module.A = 1
+    module.B = [1]
+    calls = []
+    parse_namespace = utils._parse_namespace
+
+    def counting_parse_namespace(config):
+        calls.append(config)
+        return parse_namespace(config)
+
+    monkeypatch.setattr(utils, "_parse_namespace", counting_parse_namespace)
+    assert parse_config_from_object(module) == {"A": 1, "B": [1]}
+    # 模块没有变化时不重新解析
+    assert parse_config_from_object(module) == {"A": 1, "B": [1]}
+    assert len(calls) == 1
+
+    # 替换为相等的对象也会重新解析
+    module.A = True
+    config = parse_config_from_object(module)
+    assert config["A"] is True
+    assert len(calls) == 2
+    # 原地修改属性值
+    module.B.append(2)
+    assert parse_config_from_object(module)["B"] == [1, 2]
+
+
+def test_parse_class_changed():
+    class Settings:
+        A = 1
+
+    assert parse_config_from_object(Settings) == {"A": 1}
+    Settings.A = 2
+    assert parse_config_from_object(Settings) == {"A": 2}
+
+
+def test_parse_module_all():
+    module = types.ModuleType("generated_config")
+    module.__all__ = ["EXPORTED", "lower"]
+    module.EXPORTED = 1
+    module.HIDDEN = 2
+    module.lower = 3
+    # __all__ 只有显式传入时才作为允许列表
+    assert parse_config_from_object(module) == {"EXPORTED": 1, "HIDDEN": 2}
+    assert parse_config_from_object(module, allow=module.__all__) == {"EXPORTED": 1}
+    assert parse_config_from_object(module, allow=["HIDDEN"]) == {"HIDDEN": 2}
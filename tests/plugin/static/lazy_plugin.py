@@ -0,0 +1,10 @@
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.LAZY, "registered")
+class RegisteredPlugin:
+    pass
+
+
+class UnregisteredPlugin:
+    pass
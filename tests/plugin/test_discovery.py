@@ -0,0 +1,57 @@
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from x_rpc.plugin import (
+    PluginException,
+    PluginType,
+    discover_entry_points,
+    get_plugin_instance,
+    load_plugin_manifest,
+    register_lazy_plugin,
+)
+from x_rpc.plugin import discovery
+
+LAZY_MODULE = "tests.plugin.static.lazy_plugin"
+
+
+@pytest.fixture(autouse=True)
+def unload_lazy_module():
+    sys.modules.pop(LAZY_MODULE, None)
+    yield
+    sys.modules.pop(LAZY_MODULE, None)
+
+
+def test_load_plugin_manifest(tmp_path):
+    manifest = {
+        "LAZY": {
+            "registered": f"{LAZY_MODULE}:RegisteredPlugin",
+            "unregistered": f"{LAZY_MODULE}:UnregisteredPlugin",
+        }
+    }
+    path = tmp_path / "plugins.json"
+    path.write_text(json.dumps(manifest))
+    assert load_plugin_manifest(path) == 2
+    # 读取清单时不导入插件模块
+    assert LAZY_MODULE not in sys.modules
+
+    instance = get_plugin_instance(PluginType.LAZY, "registered")
+    assert LAZY_MODULE in sys.modules
+    assert type(instance).__name__ == "RegisteredPlugin"
+    instance = get_plugin_instance(PluginType.LAZY, "unregistered")
+    assert type(instance).__name__ == "UnregisteredPlugin"
+
+
+def test_discover_entry_points(monkeypatch):
+    eps = [SimpleNamespace(name="LAZY_EP.1", value=f"{LAZY_MODULE}:UnregisteredPlugin")]
+    monkeypatch.setattr("importlib.metadata.entry_points", lambda: {discovery.ENTRY_POINT_GROUP: eps})
+    assert discover_entry_points() == 1
+    assert LAZY_MODULE not in sys.modules
+    assert type(get_plugin_instance(PluginType.LAZY_EP, 1)).__name__ == "UnregisteredPlugin"
+
+
+def test_register_invalid_target():
+    with pytest.raises(PluginException):
+        register_lazy_plugin(PluginType.LAZY, "invalid", LAZY_MODULE)
@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from x_rpc.plugin import PluginType, get_plugin_instance, register_plugin
+import pytest
+
+from x_rpc.plugin import PluginException, PluginType, get_plugin_instance, get_plugin_instance_async
+from x_rpc.plugin import PluginStore, load_plugins, register_plugin
 
 
 @register_plugin(PluginType.UNITTEST, "unittest")
@@ -15,3 +22,182 @@ def test_register_plugin():
     plugin_instance = get_plugin_instance(PluginType.UNITTEST, "unittest")
     assert plugin_instance.a == 1
     assert plugin_instance.b == 2
+
+
+class SlowPlugin:
+    count = 0
+
+    def __init__(self):
+        SlowPlugin.count += 1
+        time.sleep(0.05)
+
+
+register_plugin(PluginType.UNITTEST, "slow")(SlowPlugin)
+
+
+def test_get_plugin_instance_concurrently():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: get_plugin_instance(PluginType.UNITTEST, "slow"), range(8)))
+    assert SlowPlugin.count == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+class AsyncCounter:
+    count = 0
+
+
+@register_plugin(PluginType.UNITTEST, "async")
+async def create_async_plugin():
+    AsyncCounter.count += 1
+    await asyncio.sleep(0.05)
+    return AsyncCounter()
+
+
+@pytest.mark.asyncio
+async def test_get_plugin_instance_async():
+    instances = await asyncio.gather(
+        *(get_plugin_instance_async(PluginType.UNITTEST, "async") for _ in range(8))
+    )
+    assert AsyncCounter.count == 1
+    assert isinstance(instances[0], AsyncCounter)
+    assert all(instance is instances[0] for instance in instances)
+    assert get_plugin_instance(PluginType.UNITTEST, "async") is instances[0]
+    assert await get_plugin_instance_async(PluginType.UNITTEST, "unittest") is get_plugin_instance(
+        PluginType.UNITTEST, "unittest"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_plugin_instance_async_creator_cancelled():
+    register_plugin(PluginType.UNITTEST, "async_cancel")(create_async_plugin)
+    creator = asyncio.ensure_future(get_plugin_instance_async(PluginType.UNITTEST, "async_cancel"))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(get_plugin_instance_async(PluginType.UNITTEST, "async_cancel"))
+    await asyncio.sleep(0)
+    creator.cancel()
+    # 等待者重新创建插件实例，不会被取消
+    instance = await waiter
+    assert isinstance(instance, AsyncCounter)
+    assert creator.cancelled()
+    assert get_plugin_instance(PluginType.UNITTEST, "async_cancel") is instance
+
+
+def test_get_plugin_instance_async_factory():
+    register_plugin(PluginType.UNITTEST, "async_only")(create_async_plugin)
+    with pytest.raises(PluginException):
+        get_plugin_instance(PluginType.UNITTEST, "async_only")
+
+
+@pytest.fixture
+def plugin_store(monkeypatch):
+    """使用独立的插件仓库，不受其他测试注册的插件影响 ."""
+    from x_rpc.plugin import discovery, helper
+
+    store = PluginStore()
+    monkeypatch.setattr(helper, "DefaultPluginStore", store)
+    monkeypatch.setattr(discovery, "DefaultPluginStore", store)
+    return store
+
+
+class BootRecorder:
+    # IO密集型插件必须同时初始化才能通过屏障，不依赖执行时间判断是否并发
+    barrier = threading.Barrier(2, timeout=5)
+    plugin_io_bound = False
+
+    def __init__(self, events, name):
+        events.append(("start", name))
+        if self.plugin_io_bound:
+            self.barrier.wait()
+        events.append(("end", name))
+
+
+class DatabasePlugin(BootRecorder):
+    plugin_io_bound = True
+
+
+class CachePlugin(BootRecorder):
+    plugin_io_bound = True
+
+
+class ServicePlugin(BootRecorder):
+    plugin_depends = [(PluginType.LOAD, "database"), (PluginType.LOAD, "cache")]
+
+
+def test_load_plugins(plugin_store):
+    events = []
+    BootRecorder.barrier.reset()
+    register_plugin(PluginType.LOAD, "database", True, events, "database")(DatabasePlugin)
+    register_plugin(PluginType.LOAD, "cache", True, events, "cache")(CachePlugin)
+    register_plugin(PluginType.LOAD, "service", True, events, "service")(ServicePlugin)
+    report = load_plugins()
+    # 依赖的插件都初始化完成后才初始化
+    assert events[-2:] == [("start", "service"), ("end", "service")]
+    assert {name for _, name in events[:4]} == {"database", "cache"}
+    records = {(record.plugin_type, record.plugin_name): record for record in report.records}
+    assert records[(PluginType.LOAD, "database")].io_bound
+    assert not records[(PluginType.LOAD, "service")].io_bound
+    assert len(report.get_slowest(1)) == 1
+    assert "LOAD:service" in str(report)
+    # 已创建的实例不再重复初始化
+    assert len(load_plugins()) == 0
+
+
+class Options:
+    """构造参数名与依赖声明无关 ."""
+
+    def __init__(self, depends=None, io_bound=None):
+        self.depends = depends
+        self.io_bound = io_bound
+
+
+def test_register_plugin_kwargs(plugin_store):
+    register_plugin(PluginType.LOAD, "options", True, depends="db", io_bound="yes")(Options)
+    instance = get_plugin_instance(PluginType.LOAD, "options")
+    assert instance.depends == "db"
+    assert instance.io_bound == "yes"
+
+
+class DependOnManual(BootRecorder):
+    plugin_depends = [(PluginType.LOAD, "manual")]
+
+
+class DependOnAsync(BootRecorder):
+    plugin_depends = [(PluginType.LOAD, "async")]
+
+
+def test_load_plugins_with_uninitialized_depends(plugin_store):
+    events = []
+    register_plugin(PluginType.LOAD, "manual", False)(Options)
+    register_plugin(PluginType.LOAD, "depend_on_manual", True, events, "depend_on_manual")(DependOnManual)
+    # 依赖不需要实例化的插件
+    load_plugins()
+    assert events == [("start", "depend_on_manual"), ("end", "depend_on_manual")]
+    register_plugin(PluginType.LOAD, "async")(create_async_plugin)
+    register_plugin(PluginType.LOAD, "depend_on_async", True, events, "depend_on_async")(DependOnAsync)
+    with pytest.raises(PluginException, match="depends on async plugin"):
+        load_plugins()
+
+
+class DependOnMissing(BootRecorder):
+    plugin_depends = [(PluginType.LOAD_ERROR, "missing")]
+
+
+def test_load_plugins_with_missing_depends(plugin_store):
+    register_plugin(PluginType.LOAD_ERROR, "error", True, [], "error")(DependOnMissing)
+    with pytest.raises(PluginException, match="depends on unknown plugin"):
+        load_plugins()
+
+
+class CircularA(BootRecorder):
+    plugin_depends = [(PluginType.LOAD_ERROR, "b")]
+
+
+class CircularB(BootRecorder):
+    plugin_depends = [(PluginType.LOAD_ERROR, "a")]
+
+
+def test_load_plugins_with_circular_depends(plugin_store):
+    register_plugin(PluginType.LOAD_ERROR, "a", True, [], "a")(CircularA)
+    register_plugin(PluginType.LOAD_ERROR, "b", True, [], "b")(CircularB)
+    with pytest.raises(PluginException, match="circular dependencies"):
+        load_plugins()
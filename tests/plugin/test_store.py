@@ -0,0 +1,88 @@
+import pytest
+
+from x_rpc.plugin import Plugin, PluginStore, PluginStoreFrozen, PluginType, get_plugin_handle, register_plugin
+
+
+class StorePlugin:
+    pass
+
+
+@register_plugin(PluginType.UNITTEST, "handle")
+class HandlePlugin:
+    pass
+
+
+@pytest.fixture
+def store():
+    store = PluginStore()
+    store.add_plugin(PluginType.UNITTEST, "store", Plugin(StorePlugin, PluginType.UNITTEST, "store"))
+    return store
+
+
+def test_get_missing(store):
+    assert store.get_plugin(PluginType.UNKNOWN, "store") is None
+    assert store.get_plugin(PluginType.UNITTEST, "unknown") is None
+    assert store.get_plugin_instance(PluginType.UNKNOWN, "store") is None
+
+
+def test_plugin_handle(store):
+    handle = store.get_plugin_handle(PluginType.UNITTEST, "store")
+    assert handle.instance is None
+    instance = StorePlugin()
+    store.add_plugin_instance(PluginType.UNITTEST, "store", instance)
+    assert handle.instance is instance
+    assert store.get_plugin_handle(PluginType.UNITTEST, "store") is handle
+
+
+def test_freeze(store):
+    instance = StorePlugin()
+    store.add_plugin_instance(PluginType.UNITTEST, "store", instance)
+    store.freeze()
+    assert store.frozen
+    assert store.get_plugin_instance(PluginType.UNITTEST, "store") is instance
+    assert store.get_plugin_handle(PluginType.UNITTEST, "store").instance is instance
+    with pytest.raises(PluginStoreFrozen):
+        store.add_plugin(PluginType.UNITTEST, "other", Plugin(StorePlugin, PluginType.UNITTEST, "other"))
+    with pytest.raises(PluginStoreFrozen):
+        store.add_plugin_instance(PluginType.UNITTEST, "store", StorePlugin())
+    with pytest.raises(TypeError):
+        store.get_all_plugin()[PluginType.UNITTEST]["other"] = None
+
+
+def test_get_plugin_handle():
+    handle = get_plugin_handle(PluginType.UNITTEST, "handle")
+    assert isinstance(handle.instance, HandlePlugin)
+    assert get_plugin_handle(PluginType.UNITTEST, "handle").instance is handle.instance
+
+
+@pytest.fixture
+def default_store(monkeypatch):
+    """使用独立的插件仓库，冻结后不影响其他测试 ."""
+    from x_rpc.plugin import discovery, helper
+
+    store = PluginStore()
+    monkeypatch.setattr(helper, "DefaultPluginStore", store)
+    monkeypatch.setattr(discovery, "DefaultPluginStore", store)
+    return store
+
+
+def test_freeze_plugins_allows_lazy_instances(default_store):
+    from x_rpc.plugin import freeze_plugins, get_plugin_instance, register_lazy_plugin
+
+    register_plugin(PluginType.UNITTEST, "eager")(StorePlugin)
+    register_plugin(PluginType.UNITTEST, "manual", False)(StorePlugin)
+    register_lazy_plugin(PluginType.UNITTEST, "lazy", "tests.plugin.test_store:StorePlugin")
+    freeze_plugins()
+    # 可以实例化的插件在冻结前创建
+    assert isinstance(default_store.get_plugin_instance(PluginType.UNITTEST, "eager"), StorePlugin)
+    handles = dict(default_store.handles)
+    # 冻结后仍然可以第一次创建插件实例和导入延迟注册的插件
+    assert isinstance(get_plugin_instance(PluginType.UNITTEST, "manual"), StorePlugin)
+    lazy = get_plugin_instance(PluginType.UNITTEST, "lazy")
+    assert isinstance(lazy, StorePlugin)
+    assert get_plugin_handle(PluginType.UNITTEST, "lazy").instance is lazy
+    assert get_plugin_handle(PluginType.UNKNOWN, "missing").instance is None
+    # 冻结后不再修改句柄表
+    assert default_store.handles == handles
+    with pytest.raises(PluginStoreFrozen):
+        register_lazy_plugin(PluginType.UNITTEST, "other", "tests.plugin.test_store:StorePlugin")
@@ -0,0 +1,108 @@
+import pytest
+
+from x_rpc.config import Config
+from x_rpc.plugin import PluginType, get_plugin_instance
+from x_rpc.serializer import BinarySerializer, JsonSerializer, SerializerType, get_serializer
+from x_rpc.serializer.exceptions import SerializerDecodeError, SerializerException, SerializerNotFound
+
+PAYLOAD = {
+    "id": 12345,
+    "name": "xrpc",
+    "price": 3.14,
+    "enabled": True,
+    "tags": ["a", "b", "c"],
+    "extra": None,
+    "items": [{"sku": i, "count": i * 2} for i in range(10)],
+}
+
+
+def get_serializers():
+    serializers = [JsonSerializer(), BinarySerializer()]
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        serializers.append(get_plugin_instance(PluginType.SERIALIZER, SerializerType.MSGPACK))
+    return serializers
+
+
+@pytest.fixture(params=get_serializers(), ids=lambda serializer: type(serializer).__name__)
+def serializer(request):
+    return request.param
+
+
+def test_encode_decode(serializer):
+    data = serializer.encode(PAYLOAD)
+    assert isinstance(data, bytes)
+    assert serializer.decode(data) == PAYLOAD
+
+
+def test_batch(serializer):
+    objs = [PAYLOAD, [1, 2, 3], "text", 1]
+    datas = serializer.encode_batch(objs)
+    assert len(datas) == len(objs)
+    assert serializer.decode_batch(datas) == objs
+
+
+def test_binary_types():
+    serializer = BinarySerializer()
+    obj = {"bytes": b"\x00\x01", "big": 1 << 100, "negative": -(1 << 70), "tuple": (1, 2), "empty": ""}
+    result = serializer.decode(serializer.encode(obj))
+    assert result["bytes"] == b"\x00\x01"
+    assert result["big"] == 1 << 100
+    assert result["negative"] == -(1 << 70)
+    assert result["tuple"] == [1, 2]
+    assert result["empty"] == ""
+
+
+def test_binary_invalid():
+    serializer = BinarySerializer()
+    with pytest.raises(SerializerException):
+        serializer.encode(object())
+    with pytest.raises(SerializerException):
+        serializer.decode(serializer.encode("text")[:-1])
+    with pytest.raises(SerializerException):
+        serializer.decode(serializer.encode("text") + b"\x00")
+
+
+def test_msgpack_types():
+    pytest.importorskip("msgpack")
+    serializer = get_plugin_instance(PluginType.SERIALIZER, SerializerType.MSGPACK)
+    obj = {"bytes": b"\x00\x01", "text": "文本", "list": [1, 2.5, None, True]}
+    assert serializer.decode(serializer.encode(obj)) == obj
+
+
+# 各序列化插件无法解析的请求体
+MALFORMED_PAYLOADS = {
+    "JsonSerializer": [b"{", b"\xff", b"[1, 2] 3"],
+    "BinarySerializer": [b"\x06\x00\x00\x00\x05ab", b"\x0a", b"\x00\x00", b""],
+    "MsgpackSerializer": [b"\xc1", b"\x92\x01", b"\x01\x02", b"\xa1\xff"],
+}
+
+
+def test_decode_malformed(serializer):
+    for data in MALFORMED_PAYLOADS[type(serializer).__name__]:
+        with pytest.raises(SerializerDecodeError) as exc_info:
+            serializer.decode(data)
+        # 返回 400 Bad Request 而不是未知异常
+        assert exc_info.value.code == 400
+
+
+def test_get_serializer():
+    config = Config({"SERIALIZER": "binary", "USER_SERIALIZER": SerializerType.JSON.value})
+    assert isinstance(get_serializer(config), BinarySerializer)
+    assert isinstance(get_serializer(config, "order"), BinarySerializer)
+    assert isinstance(get_serializer(config, "user"), JsonSerializer)
+    assert isinstance(get_serializer(Config()), JsonSerializer)
+    with pytest.raises(SerializerNotFound):
+        get_serializer(Config({"SERIALIZER": "unknown"}))
+
+
+def test_benchmark_encode(benchmark, serializer):
+    benchmark(serializer.encode_batch, [PAYLOAD] * 100)
+
+
+def test_benchmark_decode(benchmark, serializer):
+    datas = serializer.encode_batch([PAYLOAD] * 100)
+    benchmark(serializer.decode_batch, datas)
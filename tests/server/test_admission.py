@@ -0,0 +1,191 @@
+import asyncio
+import time
+
+import pytest
+
+from x_rpc.codec import XRPCCodec
+from x_rpc.config import Config
+from x_rpc.exceptions import ErrorCode, ServiceUnavailable, TooManyRequests
+from x_rpc.server import Server
+from x_rpc.server.admission import AdmissionController, AIMDLimit
+from x_rpc.standard import status
+
+
+def handler(request):
+    return request.body
+
+
+def test_aimd_limit():
+    limit = AIMDLimit(4, min_limit=2, backoff=0.5, latency_threshold=0.1)
+    # 已经观测到的基线耗时
+    limit.baseline = 0.01
+    assert all(limit.try_acquire() for _ in range(4))
+    assert not limit.try_acquire()
+    # 耗时超过阈值时乘性减小
+    limit.release(1.0)
+    assert limit.limit == 2
+    assert limit.in_flight == 3
+    assert not limit.try_acquire()
+    limit.release(1.0)
+    assert limit.limit == 2
+    limit.release(0.0)
+    limit.release(0.0)
+    assert limit.in_flight == 0
+    # 并发被充分利用时加性增大，不超过最大并发
+    for _ in range(100):
+        limit.try_acquire()
+        limit.try_acquire()
+        limit.release(0.0)
+        limit.release(0.0)
+    assert limit.limit == 4
+
+
+def test_aimd_limit_idle():
+    limit = AIMDLimit(10, latency_threshold=0.1)
+    limit.limit = 5
+    # 并发没有被充分利用时不增大
+    for _ in range(100):
+        limit.try_acquire()
+        limit.release(0.0)
+    assert limit.limit == 5
+
+
+def test_aimd_limit_baseline():
+    limit = AIMDLimit(10, latency_threshold=0.1, latency_tolerance=2.0)
+    # 处理本身比较慢的函数，耗时稳定时不减小并发限制
+    for _ in range(100):
+        limit.try_acquire()
+        limit.release(1.0)
+    assert limit.limit == 10
+    assert limit.baseline == pytest.approx(1.0)
+    # 耗时超过基线的倍数时减小
+    limit.try_acquire()
+    limit.release(3.0)
+    assert limit.limit == 9
+
+
+def test_aimd_limit_latency_ramp():
+    limit = AIMDLimit(10, latency_threshold=0.001, latency_tolerance=2.0)
+    for _ in range(100):
+        limit.try_acquire()
+        limit.release(0.01)
+    # 耗时缓慢增大，每个请求比上一个请求只慢 1%，基线不会跟着上升
+    latency = 0.01
+    for _ in range(100):
+        latency *= 1.01
+        limit.try_acquire()
+        limit.release(latency)
+    assert limit.baseline < 0.011
+    assert limit.limit < 10
+
+
+def test_aimd_limit_latency_step():
+    limit = AIMDLimit(10, latency_threshold=0.001, latency_tolerance=2.0)
+    limit.try_acquire()
+    limit.release(0.01)
+    # 处理函数持续变慢后基线最终跟上，并发限制重新增大
+    for _ in range(3000):
+        acquired = sum(limit.try_acquire() for _ in range(4))
+        for _ in range(acquired):
+            limit.release(0.03)
+    assert limit.baseline > 0.015
+    assert limit.limit >= 4
+
+
+def test_admission_controller():
+    admission = AdmissionController(3, method_max_in_flight=2)
+    assert admission.admit(handler) is None
+    assert admission.admit(handler) is None
+    assert admission.admit(handler) is TooManyRequests
+    assert admission.limit.in_flight == 2
+    assert admission.admit(test_aimd_limit) is None
+    assert admission.admit(test_aimd_limit) is ServiceUnavailable
+    assert admission.rejected == 2
+    admission.release(handler, 0.0)
+    assert admission.method_limits[handler].in_flight == 1
+    assert admission.admit(handler) is None
+
+
+def test_admission_method_rejection():
+    admission = AdmissionController(2, method_max_in_flight=1)
+    assert admission.admit(handler) is None
+    # 被处理函数限制拒绝的请求不会增大全局并发限制
+    for _ in range(5):
+        assert admission.admit(handler) is TooManyRequests
+    assert admission.limit.limit == 2
+    assert admission.limit.in_flight == 1
+
+
+def test_admission_queue_delay():
+    admission = AdmissionController(10, max_queue_delay=0.1)
+    admission.queue_delay = 0.5
+    assert admission.admit(handler) is ServiceUnavailable
+    admission.queue_delay = 0.0
+    assert admission.admit(handler) is None
+
+
+@pytest.mark.asyncio
+async def test_admission_probe():
+    loop = asyncio.get_running_loop()
+    admission = AdmissionController(10)
+    admission.start(loop)
+    try:
+        await asyncio.sleep(0.06)
+        # 阻塞事件循环
+        time.sleep(0.2)
+        await asyncio.sleep(0.01)
+        assert admission.queue_delay > 0.1
+    finally:
+        admission.stop()
+
+
+def test_admission_disabled():
+    assert Server(Config()).admission is None
+
+
+@pytest.mark.asyncio
+async def test_server_sheds_requests():
+    config = {"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0, "SERVER_MAX_IN_FLIGHT": 3, "SERVER_METHOD_MAX_IN_FLIGHT": 2}
+    server = Server(Config(config))
+    event = asyncio.Event()
+
+    @server.handler()
+    async def wait(request):
+        await event.wait()
+        return request.body
+
+    @server.handler()
+    async def other(request):
+        await event.wait()
+        return request.body
+
+    @server.handler()
+    def echo(request):
+        return request.body
+
+    await server.start()
+    codec = XRPCCodec()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    methods = ["wait", "wait", "wait", "other", "other", "echo"]
+    writer.write(b"".join(codec.encode_request(i, method, b"ok") for i, method in enumerate(methods)))
+    buffer = bytearray()
+    frames = []
+    try:
+        # 超过限制的请求立即返回
+        while len(frames) < 3:
+            frames.extend(codec.decode(buffer, await reader.read(65536)))
+        assert {frame.request_id: frame.status for frame in frames} == {
+            2: status.HTTP_429_TOO_MANY_REQUESTS,
+            4: status.HTTP_503_SERVICE_UNAVAILABLE,
+            5: status.HTTP_503_SERVICE_UNAVAILABLE,
+        }
+        event.set()
+        while len(frames) < len(methods):
+            frames.extend(codec.decode(buffer, await reader.read(65536)))
+        results = {frame.request_id: frame for frame in frames}
+        assert all(results[i].status == ErrorCode.SUCCESS and results[i].body == b"ok" for i in (0, 1, 3))
+        assert server.admission.limit.in_flight == 0
+    finally:
+        writer.close()
+        await server.close()
@@ -0,0 +1,78 @@
+import pytest
+
+from x_rpc.exceptions import MethodNotSupported, NotFound
+from x_rpc.server.exceptions import RouteExists
+from x_rpc.server.router import Router
+
+
+def handler():
+    pass
+
+
+def other_handler():
+    pass
+
+
+def test_static_route():
+    router = Router()
+    router.add_route("user.get", handler)
+    assert router.get("user.get") == (handler, None)
+    assert router.get("user.get", "POST") == (handler, None)
+    with pytest.raises(NotFound):
+        router.get("user.delete")
+    assert "user.get" in router
+    assert len(router) == 1
+
+
+def test_param_route():
+    router = Router()
+    router.add_route("/users/<user_id>/orders/<order_id>", handler, ["GET"])
+    router.add_route("/users/me/orders/<order_id>", other_handler, ["GET"])
+    router.add_route("user.<action>", handler)
+
+    assert router.get("/users/1/orders/2", "GET") == (handler, {"user_id": "1", "order_id": "2"})
+    assert router.get("/users/me/orders/2", "GET") == (other_handler, {"order_id": "2"})
+    assert router.get("user.get") == (handler, {"action": "get"})
+    with pytest.raises(NotFound):
+        router.get("/users/1/orders")
+    with pytest.raises(NotFound):
+        router.get("/users//orders/2", "GET")
+
+
+def test_backtracking():
+    router = Router()
+    router.add_route("/files/static/index", handler)
+    router.add_route("/files/<name>/download", other_handler)
+    assert router.get("/files/static/download") == (other_handler, {"name": "static"})
+    assert router.get("/files/static/index") == (handler, None)
+
+
+def test_method_not_supported():
+    router = Router()
+    router.add_route("/users/<user_id>", handler, ["get", "PUT"])
+    router.add_route("/users/<user_id>", other_handler, ["DELETE"])
+    assert router.get("/users/1", "DELETE") == (other_handler, {"user_id": "1"})
+    with pytest.raises(MethodNotSupported) as exc_info:
+        router.get("/users/1", "POST")
+    assert exc_info.value.headers == {"Allow": "DELETE, GET, PUT"}
+    assert exc_info.value.method == "POST"
+    # 请求方法不区分大小写
+    assert router.get("/users/1", "get") == (handler, {"user_id": "1"})
+    assert router.get("/users/1", "delete") == (other_handler, {"user_id": "1"})
+
+
+def test_route_exists():
+    router = Router()
+    router.add_route("user.get", handler)
+    router.add_route("/users/<user_id>", handler, ["GET"])
+    with pytest.raises(RouteExists):
+        router.add_route("user.get", other_handler)
+    with pytest.raises(RouteExists):
+        router.add_route("/users/<user_id>", other_handler, ["get"])
+    # 只有参数名不同的路由
+    with pytest.raises(RouteExists):
+        router.add_route("/users/<name>", other_handler, ["POST"])
+    # 注册失败不影响已有的路由
+    assert router.get("user.get") == (handler, None)
+    assert router.get("/users/1", "GET") == (handler, {"user_id": "1"})
+    assert len(router) == 2
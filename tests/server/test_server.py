@@ -0,0 +1,278 @@
+import asyncio
+import json
+import signal
+
+import pytest
+
+from x_rpc.codec import XRPCCodec
+from x_rpc.codec.xrpc_codec import HEADER_SIZE
+from x_rpc.config import Config
+from x_rpc.exceptions import BusinessException, ErrorCode, InvalidSignal
+from x_rpc.server import Server
+from x_rpc.server.server import get_signal
+from x_rpc.standard import status
+
+
+@pytest.fixture
+def server():
+    server = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+
+    @server.handler()
+    def echo(request):
+        return request.body
+
+    @server.handler("async_echo")
+    async def _async_echo(request):
+        await asyncio.sleep(0)
+        return request.body
+
+    @server.handler()
+    def fail(request):
+        raise BusinessException(1001, "business error")
+
+    return server
+
+
+async def call(server, requests):
+    codec = XRPCCodec()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    # 所有请求一次性写入，验证流水线请求的处理
+    writer.write(b"".join(codec.encode_request(i, method, body) for i, (method, body) in enumerate(requests)))
+    buffer = bytearray()
+    frames = []
+    while len(frames) < len(requests):
+        frames.extend(codec.decode(buffer, await reader.read(65536)))
+    writer.close()
+    return {frame.request_id: frame for frame in frames}
+
+
+def test_server_config():
+    config = Config({"SERVER_HOST": "0.0.0.0", "SERVER_PORT": 9000, "SERVER_BACKLOG": 10})
+    server = Server(config)
+    assert server.host == "0.0.0.0"
+    assert server.port == 9000
+    assert server.backlog == 10
+
+
+@pytest.mark.asyncio
+async def test_dispatch(server):
+    await server.start()
+    try:
+        frames = await call(server, [("echo", b"a"), ("async_echo", b"b"), ("fail", b""), ("missing", b"")])
+    finally:
+        await server.close()
+    assert frames[0].status == ErrorCode.SUCCESS
+    assert frames[0].body == b"a"
+    assert frames[1].status == ErrorCode.SUCCESS
+    assert frames[1].body == b"b"
+    assert frames[2].status == 1001
+    assert frames[2].body == b"business error"
+    assert frames[3].status == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_dispatch_invalid_requests(server):
+    @server.handler()
+    def text(request):
+        return "not bytes"
+
+    await server.start()
+    codec = XRPCCodec()
+    # 方法名不是合法的 UTF-8
+    invalid_method = bytearray(codec.encode_request(1, "echo", b""))
+    invalid_method[HEADER_SIZE:HEADER_SIZE + 4] = b"\xff\xfe\xfd\xfc"
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(codec.encode_request(0, "text", b"") + bytes(invalid_method) + codec.encode_request(2, "echo", b"c"))
+    buffer = bytearray()
+    frames = []
+    try:
+        while len(frames) < 3:
+            frames.extend(codec.decode(buffer, await reader.read(65536)))
+    finally:
+        writer.close()
+        await server.close()
+    results = {frame.request_id: frame for frame in frames}
+    assert results[0].status == ErrorCode.ERR_UNKNOWN
+    assert b"str" in results[0].body
+    assert results[1].status == status.HTTP_400_BAD_REQUEST
+    # 后续流水线请求不受影响
+    assert results[2].status == ErrorCode.SUCCESS
+    assert results[2].body == b"c"
+
+
+@pytest.mark.asyncio
+async def test_dispatch_route_params(server):
+    @server.handler("user.<action>")
+    def user(request, action):
+        return action.encode("utf8")
+
+    await server.start()
+    try:
+        frames = await call(server, [("user.get", b""), ("user.get.all", b"")])
+    finally:
+        await server.close()
+    assert frames[0].body == b"get"
+    assert frames[1].status == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_dispatch_serialized_route_params(server):
+    @server.handler("/users/<user_id>", serialize=True)
+    def get_user(request, user_id):
+        return {"id": user_id, "body": request.body}
+
+    @server.handler("/users/<user_id>/orders", serialize=True)
+    async def get_orders(request, user_id):
+        return [user_id]
+
+    await server.start()
+    try:
+        frames = await call(server, [("/users/1", b'{"name": "a"}'), ("/users/2/orders", b"null")])
+    finally:
+        await server.close()
+    assert frames[0].status == ErrorCode.SUCCESS
+    assert json.loads(frames[0].body) == {"id": "1", "body": {"name": "a"}}
+    assert frames[1].status == ErrorCode.SUCCESS
+    assert json.loads(frames[1].body) == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_deadline(server):
+    cancelled = []
+
+    @server.handler()
+    async def slow(request):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(request.request_id)
+            raise
+
+    await server.start()
+    codec = XRPCCodec()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    requests = [("slow", b"", 0.05), ("echo", b"a", 0), ("async_echo", b"b", 1)]
+    writer.write(b"".join(codec.encode_request(i, *request) for i, request in enumerate(requests)))
+    buffer = bytearray()
+    frames = []
+    try:
+        while len(frames) < 3:
+            frames.extend(codec.decode(buffer, await reader.read(65536)))
+    finally:
+        writer.close()
+        await server.close()
+    results = {frame.request_id: frame for frame in frames}
+    # 超过截止时间的任务被取消
+    assert results[0].status == status.HTTP_408_REQUEST_TIMEOUT
+    assert cancelled == [0]
+    # 已经过期的请求不执行
+    assert results[1].status == status.HTTP_408_REQUEST_TIMEOUT
+    assert results[2].status == ErrorCode.SUCCESS
+    assert results[2].body == b"b"
+
+
+def test_get_signal():
+    assert get_signal("sighup") == signal.SIGHUP
+    assert get_signal(signal.SIGTERM) == signal.SIGTERM
+    with pytest.raises(InvalidSignal):
+        get_signal("SIGNOTEXIST")
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_requests():
+    server = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+    started = asyncio.Event()
+
+    @server.handler()
+    async def slow(request):
+        started.set()
+        await asyncio.sleep(0.2)
+        return b"done"
+
+    @server.handler()
+    def echo(request):
+        return request.body
+
+    await server.start()
+    codec = XRPCCodec()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    idle_reader, idle_writer = await asyncio.open_connection(host, port)
+    idle_writer.write(codec.encode_request(1, "echo", b"idle"))
+    assert codec.decode(bytearray(), await idle_reader.read(65536))[0].body == b"idle"
+    writer.write(codec.encode_request(1, "slow", b""))
+    await started.wait()
+
+    shutdown = asyncio.ensure_future(server.shutdown(timeout=5))
+    await asyncio.sleep(0)
+    assert server.draining
+    # 空闲连接直接关闭
+    assert await idle_reader.read() == b""
+    # 优雅退出时已经建立的连接上的请求仍然会被处理
+    writer.write(codec.encode_request(2, "echo", b"a"))
+    buffer = bytearray()
+    frames = {}
+    while len(frames) < 2:
+        data = await reader.read(65536)
+        assert data
+        frames.update((frame.request_id, frame) for frame in codec.decode(buffer, data))
+    assert frames[1].status == ErrorCode.SUCCESS
+    assert frames[1].body == b"done"
+    assert frames[2].body == b"a"
+    await shutdown
+    # 请求处理完成后连接被关闭
+    assert await reader.read() == b""
+    assert not server.connections
+    assert server.in_flight == 0
+    writer.close()
+    idle_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_new_connection():
+    server = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0}))
+
+    @server.handler()
+    def echo(request):
+        return request.body
+
+    await server.start()
+    codec = XRPCCodec()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    new_reader, new_writer = await asyncio.open_connection(host, port)
+    shutdown = asyncio.ensure_future(server.shutdown(timeout=5))
+    # 优雅退出开始后，新连接在宽限期内发送的请求仍然会被处理
+    await asyncio.sleep(0.1)
+    writer.write(codec.encode_request(1, "echo", b"a"))
+    frames = codec.decode(bytearray(), await reader.read(65536))
+    assert frames[0].body == b"a"
+    assert await reader.read() == b""
+    # 宽限期内没有发送请求的连接被关闭
+    assert await new_reader.read() == b""
+    await shutdown
+    assert not server.connections
+    writer.close()
+    new_writer.close()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_timeout():
+    server = Server(Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": 0, "SERVER_DRAIN_TIMEOUT": 0.1}))
+
+    @server.handler()
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    await server.start()
+    host, port = server.sockets[0].getsockname()[:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(XRPCCodec().encode_request(1, "hang", b""))
+    while not server.in_flight:
+        await asyncio.sleep(0.01)
+    await asyncio.wait_for(server.shutdown(), 5)
+    assert await reader.read() == b""
+    writer.close()
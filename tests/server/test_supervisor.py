@@ -0,0 +1,168 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from x_rpc.codec import XRPCCodec
+from x_rpc.config import Config
+from x_rpc.server import Server
+from x_rpc.server import supervisor as supervisor_module
+from x_rpc.server.supervisor import Supervisor
+
+APP = """
+import os
+import sys
+
+from x_rpc.config import Config
+from x_rpc.server import Server
+
+config = Config({"SERVER_HOST": "127.0.0.1", "SERVER_PORT": int(sys.argv[1]), "SERVER_WORKERS": 2})
+if len(sys.argv) > 2:
+    config.load_from_path(sys.argv[2])
+server = Server(config)
+
+
+@server.handler()
+def pid(request):
+    return str(os.getpid()).encode()
+
+
+server.run()
+"""
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def call_pid(port):
+    codec = XRPCCodec()
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(codec.encode_request(1, "pid", b""))
+        buffer = bytearray()
+        frames = []
+        while not frames:
+            frames = codec.decode(buffer, sock.recv(65536))
+    return int(frames[0].body)
+
+
+def collect_pids(port, count=50, timeout=10):
+    """建立多个连接，获得处理请求的工作进程 ."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return {call_pid(port) for _ in range(count)}
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+def test_supervisor():
+    port = get_free_port()
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[2]))
+    process = subprocess.Popen([sys.executable, "-c", APP, str(port)], env=env)
+    try:
+        pids = collect_pids(port)
+        assert len(pids) == 2
+        assert process.pid not in pids
+
+        # 工作进程崩溃后自动重启
+        killed = pids.pop()
+        os.kill(killed, signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while True:
+            new_pids = collect_pids(port)
+            if killed not in new_pids and len(new_pids) == 2:
+                break
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+        assert pids < new_pids
+
+        # 重新加载时启动新一代工作进程，期间请求不会失败
+        errors = []
+        stopped = threading.Event()
+
+        def request_loop():
+            while not stopped.is_set():
+                try:
+                    call_pid(port)
+                except OSError as exc:
+                    errors.append(exc)
+
+        thread = threading.Thread(target=request_loop)
+        thread.start()
+        try:
+            process.send_signal(signal.SIGHUP)
+            deadline = time.monotonic() + 10
+            while collect_pids(port) & new_pids:
+                assert time.monotonic() < deadline
+                time.sleep(0.1)
+        finally:
+            stopped.set()
+            thread.join()
+        assert not errors
+        assert len(collect_pids(port)) == 2
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(10) == 0
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+def test_reload_invalid_config(tmp_path):
+    port = get_free_port()
+    path = tmp_path / "app.json"
+    path.write_text('{"VALUE": 1}')
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[2]))
+    process = subprocess.Popen([sys.executable, "-c", APP, str(port), str(path)], env=env)
+    try:
+        pids = collect_pids(port)
+        assert len(pids) == 2
+
+        # 配置加载失败时主进程和当前的工作进程继续运行
+        path.write_text("{")
+        process.send_signal(signal.SIGHUP)
+        time.sleep(0.5)
+        assert process.poll() is None
+        assert collect_pids(port) == pids
+
+        # 修复配置后可以正常重新加载
+        path.write_text('{"VALUE": 2}')
+        process.send_signal(signal.SIGHUP)
+        deadline = time.monotonic() + 10
+        while collect_pids(port) & pids:
+            assert time.monotonic() < deadline
+            time.sleep(0.1)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(10) == 0
+
+
+def test_restart_after_reload(monkeypatch):
+    supervisor = Supervisor(Server(Config()), workers=1)
+    supervisor.running = True
+    supervisor.processes[100] = (0, time.monotonic(), 0)
+    spawned = []
+    monkeypatch.setattr(supervisor, "spawn", spawned.append)
+
+    def sleep(_):
+        # 延迟重启期间收到重新加载信号，启动了新一代工作进程
+        supervisor.generation += 1
+
+    monkeypatch.setattr(supervisor_module.time, "sleep", sleep)
+    supervisor._on_exit(100, 1 << 8)
+    assert not spawned
+
+    supervisor.processes[101] = (0, time.monotonic(), supervisor.generation)
+    monkeypatch.setattr(supervisor_module.time, "sleep", lambda _: None)
+    supervisor._on_exit(101, 1 << 8)
+    assert spawned == [0]
@@ -1,6 +1,19 @@
 import pytest
 
-from x_rpc.exceptions import BusinessException, ErrorCode, ErrorType, FrameException, NotFound, UnknownException
+from x_rpc.exceptions import (
+    BusinessException,
+    ErrorCode,
+    ErrorType,
+    FrameException,
+    LoadFileException,
+    NotFound,
+    ServiceUnavailable,
+    TooManyRequests,
+    Unauthorized,
+    UnknownException,
+    find_error_response,
+    get_error_response,
+)
 from x_rpc.standard import status
 
 
@@ -48,3 +61,37 @@ class TestNotFound:
         assert err_args.context is None
         assert err_args.message is None
         assert err_args.extra is None
+
+
+class TestErrorResponse:
+    def test_get_error_response(self):
+        response = get_error_response(ServiceUnavailable)
+        assert response is get_error_response(ServiceUnavailable)
+        assert response.code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.exception_type == ErrorType.FRAMEWORK
+        assert response.body == b"Service Unavailable"
+        assert response.exception.__traceback__ is None
+
+        response = get_error_response(TooManyRequests)
+        assert response.code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.body == b"Too Many Requests"
+
+    def test_find_error_response(self):
+        response = get_error_response(ServiceUnavailable)
+        assert find_error_response(ServiceUnavailable()) is response
+        # 错误信息不同时不能复用预先编码的错误响应
+        assert find_error_response(ServiceUnavailable("database is down")) is None
+        assert find_error_response(NotFound("missing")) is None
+
+    def test_default_status_code(self):
+        exc = LoadFileException("load failed")
+        assert exc.code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    def test_unauthorized_header(self):
+        exc = Unauthorized("Auth required.", scheme="Basic", realm="Restricted Area")
+        assert exc.headers == {"WWW-Authenticate": 'Basic realm="Restricted Area"'}
+        exc = Unauthorized("Auth required.", scheme="Bearer")
+        assert exc.headers == {"WWW-Authenticate": "Bearer"}
+        # 不可哈希的参数值不缓存
+        exc = Unauthorized("Auth required.", scheme="Bearer", scope=["read", "write"])
+        assert exc.headers == {"WWW-Authenticate": "Bearer scope=\"['read', 'write']\""}
@@ -1,9 +1,37 @@
 import pytest
 
-from x_rpc.utils.format import str_to_bool
+from x_rpc.utils.format import guess_value, str_to_bool
 
 
 def test_str_to_bool():
     assert str_to_bool("1") is True
     with pytest.raises(ValueError):
         assert str_to_bool("2") is False
+
+
+@pytest.mark.parametrize(
+    "value, expect",
+    [
+        ("42", 42),
+        ("-1", -1),
+        ("1_000", 1000),
+        ("2.3", 2.3),
+        ("1e3", 1000.0),
+        ("1.e5", 100000.0),
+        ("1.", 1.0),
+        (".5e-1", 0.05),
+        ("-inf", float("-inf")),
+        ("1e", "1e"),
+        (".", "."),
+        ("True", True),
+        ("off", False),
+        ("1", 1),
+        ("0x10", "0x10"),
+        ("1.2.3", "1.2.3"),
+        ("", ""),
+    ],
+)
+def test_guess_value(value, expect):
+    result = guess_value(value)
+    assert result == expect
+    assert type(result) is type(expect)
@@ -6,7 +6,14 @@ import pytest
 
 from x_rpc.config import Config
 from x_rpc.exceptions import LoadFileException
-from x_rpc.utils.module import import_string, load_module_from_file_location
+from x_rpc.utils.module import (
+    clear_import_cache,
+    get_import_times,
+    import_string,
+    instantiate_string,
+    load_module_from_file_location,
+    resolve_string,
+)
 
 
 def test_import_string_class():
@@ -61,3 +68,36 @@ def test_load_module_from_file_location_with_non_existing_env_variable():
         match="The following environment variables are not set: MuuMilk",
     ):
         load_module_from_file_location("${MuuMilk}")
+
+
+def test_resolve_string_cache():
+    clear_import_cache()
+    cls = resolve_string("x_rpc.config.Config")
+    assert cls is Config
+    assert resolve_string("x_rpc.config.Config") is cls
+    assert [path for path, _ in get_import_times()] == ["x_rpc.config.Config"]
+
+    config = instantiate_string("x_rpc.config.Config", {"VALUE": 1})
+    assert isinstance(config, Config)
+    assert config.VALUE == 1
+    assert instantiate_string("x_rpc.config.Config") is not config
+
+
+def test_resolve_string_negative_cache(monkeypatch):
+    clear_import_cache()
+    with pytest.raises(ImportError):
+        resolve_string("not_exist_module.attr")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should not import again")
+
+    monkeypatch.setattr("x_rpc.utils.module.import_module", fail)
+    with pytest.raises(ImportError):
+        resolve_string("not_exist_module.attr")
+    monkeypatch.undo()
+
+    with pytest.raises(AttributeError):
+        resolve_string("x_rpc.config.NotExist")
+    clear_import_cache()
+    with pytest.raises(ImportError):
+        resolve_string("not_exist_module.attr")
@@ -0,0 +1,21 @@
+from .base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from .discovery import FileDiscovery
+from .helper import get_load_balancer, get_load_balancer_type, parse_endpoints
+from .least_outstanding import LeastOutstandingLoadBalancer
+from .power_of_two import PowerOfTwoLoadBalancer
+from .round_robin import RoundRobinLoadBalancer
+from .weighted import WeightedLoadBalancer
+
+__all__ = [
+    "BaseLoadBalancer",
+    "Endpoint",
+    "FileDiscovery",
+    "LeastOutstandingLoadBalancer",
+    "LoadBalancerType",
+    "PowerOfTwoLoadBalancer",
+    "RoundRobinLoadBalancer",
+    "WeightedLoadBalancer",
+    "get_load_balancer",
+    "get_load_balancer_type",
+    "parse_endpoints",
+]
@@ -0,0 +1,66 @@
+from abc import ABCMeta, abstractmethod
+from enum import IntEnum, unique
+from typing import Iterable, Tuple
+
+
+@unique
+class LoadBalancerType(IntEnum):
+    ROUND_ROBIN = 1
+    WEIGHTED = 2
+    LEAST_OUTSTANDING = 3
+    POWER_OF_TWO = 4
+
+
+class Endpoint:
+    """一个服务地址 ."""
+
+    __slots__ = ("target", "weight", "outstanding")
+
+    def __init__(self, target: str, weight: int = 1):
+        # host:port
+        self.target = target
+        self.weight = weight
+        # 正在进行中的请求数
+        self.outstanding = 0
+
+    def __repr__(self):
+        return f"<Endpoint target={self.target} weight={self.weight} outstanding={self.outstanding}>"
+
+
+class BaseLoadBalancer(metaclass=ABCMeta):
+    """负载均衡器，每个服务一个实例
+
+    每次调用都会执行 pick()，实现必须是 O(1) 的并且不加锁：
+    更新地址列表时先生成新的状态，再通过一次赋值替换，pick() 只读取一次状态。
+    """
+
+    def __init__(self, endpoints: Iterable[Endpoint] = ()):
+        self.endpoints: Tuple[Endpoint, ...] = ()
+        self.update(endpoints)
+
+    def update(self, endpoints: Iterable[Endpoint]) -> None:
+        """更新地址列表，已有的地址保留进行中的请求数 ."""
+        existing = {endpoint.target: endpoint for endpoint in self.endpoints}
+        result = []
+        for endpoint in endpoints:
+            current = existing.get(endpoint.target)
+            if current is not None:
+                current.weight = endpoint.weight
+                endpoint = current
+            result.append(endpoint)
+        self.endpoints = tuple(result)
+
+    @abstractmethod
+    def pick(self) -> Endpoint:
+        """选择一个地址，没有可用地址时抛出 NoAvailableEndpoint ."""
+        raise NotImplementedError
+
+    def acquire(self) -> Endpoint:
+        """选择一个地址并开始一个请求 ."""
+        endpoint = self.pick()
+        endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint) -> None:
+        """请求完成 ."""
+        endpoint.outstanding -= 1
@@ -0,0 +1,49 @@
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from x_rpc.balancer.base import Endpoint
+from x_rpc.balancer.exceptions import LoadBalancerException
+from x_rpc.balancer.helper import parse_endpoints
+from x_rpc.utils.module import get_file_signature
+
+logger = logging.getLogger(__name__)
+
+
+class FileDiscovery:
+    """从本地 JSON 文件获得服务地址，文件的修改时间和大小没有变化时不重新解析
+
+    文件格式：{"user": ["127.0.0.1:8000", {"target": "127.0.0.1:8001", "weight": 2}]}
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.signature: Optional[Tuple[int, int]] = None
+        # 服务名 -> 地址列表
+        self.services: Dict[str, List[Endpoint]] = {}
+
+    def refresh(self) -> bool:
+        """重新读取文件，返回服务地址是否发生变化
+
+        文件不存在或者内容不合法时保留上一次的服务地址，避免写入文件的过程中读到不完整的内容。
+        """
+        try:
+            signature = get_file_signature(self.path)
+        except OSError:
+            return False
+        if signature == self.signature:
+            return False
+        try:
+            with open(self.path, encoding="utf8") as f:
+                data = json.load(f)
+            services = {service: parse_endpoints(endpoints) for service, endpoints in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError, LoadBalancerException) as exc:
+            logger.warning("can not load endpoints from %s: %s", self.path, exc)
+            return False
+        self.signature = signature
+        self.services = services
+        return True
+
+    def get_endpoints(self, service: str) -> Optional[List[Endpoint]]:
+        """获得服务的地址列表，文件中没有这个服务时返回 None ."""
+        return self.services.get(service)
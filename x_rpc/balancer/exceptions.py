@@ -0,0 +1,17 @@
+from x_rpc.exceptions import XRPCException
+
+
+class LoadBalancerException(XRPCException):
+    pass
+
+
+class LoadBalancerNotFound(LoadBalancerException):
+    pass
+
+
+class NoAvailableEndpoint(LoadBalancerException):
+    pass
+
+
+class InvalidEndpoint(LoadBalancerException):
+    pass
@@ -0,0 +1,62 @@
+from typing import Iterable, List, Optional, Union
+
+from x_rpc.balancer.base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from x_rpc.balancer.exceptions import InvalidEndpoint, LoadBalancerNotFound
+from x_rpc.plugin import PluginType, get_plugin
+
+
+def parse_endpoint(value) -> Endpoint:
+    """解析一个地址，支持 "host:port"、{"target": "host:port", "weight": 2} 和 ("host:port", 2) ."""
+    if isinstance(value, Endpoint):
+        return Endpoint(value.target, value.weight)
+    try:
+        if isinstance(value, str):
+            target, weight = value.strip(), 1
+        elif isinstance(value, dict):
+            target, weight = value["target"], int(value.get("weight", 1))
+        else:
+            target, weight = value[0], int(value[1])
+    except (KeyError, IndexError, TypeError, ValueError):
+        raise InvalidEndpoint(f"invalid endpoint {value!r}")
+    if ":" not in target:
+        raise InvalidEndpoint(f"invalid endpoint {value!r}, expected host:port")
+    return Endpoint(target, weight)
+
+
+def parse_endpoints(value: Union[str, Iterable]) -> List[Endpoint]:
+    """解析地址列表，字符串使用逗号分隔 ."""
+    if isinstance(value, str):
+        value = [item for item in value.split(",") if item.strip()]
+    return [parse_endpoint(item) for item in value]
+
+
+def get_load_balancer_type(name: Union[str, int, LoadBalancerType]) -> LoadBalancerType:
+    """将配置中的负载均衡名称或编号转换为负载均衡类型 ."""
+    if isinstance(name, str):
+        try:
+            return LoadBalancerType[name.upper()]
+        except KeyError:
+            raise LoadBalancerNotFound(f"load balancer {name} not found")
+    try:
+        return LoadBalancerType(name)
+    except ValueError:
+        raise LoadBalancerNotFound(f"load balancer {name} not found")
+
+
+def get_load_balancer(config, service: str, endpoints: Optional[Iterable[Endpoint]] = None) -> BaseLoadBalancer:
+    """根据配置创建服务的负载均衡器
+
+    优先使用服务级别的配置 <SERVICE>_LOAD_BALANCER，其次使用全局配置 CLIENT_LOAD_BALANCER，默认使用轮询；
+    没有指定地址列表时使用配置 <SERVICE>_ENDPOINTS
+    """
+    name = config.get(f"{service.upper()}_LOAD_BALANCER")
+    if name is None:
+        name = config.get("CLIENT_LOAD_BALANCER", LoadBalancerType.ROUND_ROBIN)
+    balancer_type = get_load_balancer_type(name)
+    plugin = get_plugin(PluginType.LOAD_BALANCER, balancer_type)
+    if plugin is None:
+        raise LoadBalancerNotFound(f"load balancer {balancer_type.name} not registered")
+    if endpoints is None:
+        endpoints = parse_endpoints(config.get(f"{service.upper()}_ENDPOINTS", ()))
+    # 负载均衡器有状态，每个服务创建一个实例
+    return plugin.create_instance(endpoints)
@@ -0,0 +1,53 @@
+from typing import Dict, Iterable
+
+from x_rpc.balancer.base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from x_rpc.balancer.exceptions import NoAvailableEndpoint
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.LOAD_BALANCER, LoadBalancerType.LEAST_OUTSTANDING, False)
+class LeastOutstandingLoadBalancer(BaseLoadBalancer):
+    """选择进行中的请求数最少的地址
+
+    地址按进行中的请求数分桶，并记录最小的请求数；请求数每次只变化 1，
+    开始和完成请求时只需要在相邻的桶之间移动地址，选择时取最小的桶中最早加入的地址。
+    在事件循环线程中使用，不加锁。
+    """
+
+    def update(self, endpoints: Iterable[Endpoint]) -> None:
+        super().update(endpoints)
+        # 进行中的请求数 -> 地址，使用字典保持加入的顺序
+        buckets: Dict[int, Dict[Endpoint, None]] = {}
+        for endpoint in self.endpoints:
+            buckets.setdefault(endpoint.outstanding, {})[endpoint] = None
+        self._buckets = buckets
+        self._min = min(buckets) if buckets else 0
+
+    def pick(self) -> Endpoint:
+        bucket = self._buckets.get(self._min)
+        if not bucket:
+            raise NoAvailableEndpoint("no available endpoint")
+        return next(iter(bucket))
+
+    def acquire(self) -> Endpoint:
+        endpoint = self.pick()
+        self._move(endpoint, endpoint.outstanding + 1)
+        return endpoint
+
+    def release(self, endpoint: Endpoint) -> None:
+        self._move(endpoint, endpoint.outstanding - 1)
+
+    def _move(self, endpoint: Endpoint, outstanding: int) -> None:
+        buckets = self._buckets
+        previous = endpoint.outstanding
+        endpoint.outstanding = outstanding
+        bucket = buckets.get(previous)
+        # 地址已经被移除
+        if bucket is None or endpoint not in bucket:
+            return
+        del bucket[endpoint]
+        if not bucket:
+            del buckets[previous]
+        buckets.setdefault(outstanding, {})[endpoint] = None
+        if outstanding < self._min or (previous == self._min and previous not in buckets):
+            self._min = outstanding
@@ -0,0 +1,24 @@
+from random import random
+
+from x_rpc.balancer.base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from x_rpc.balancer.exceptions import NoAvailableEndpoint
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.LOAD_BALANCER, LoadBalancerType.POWER_OF_TWO, False)
+class PowerOfTwoLoadBalancer(BaseLoadBalancer):
+    """随机选择两个不同的地址，使用进行中的请求数较少的一个 ."""
+
+    def pick(self) -> Endpoint:
+        endpoints = self.endpoints
+        size = len(endpoints)
+        if size < 2:
+            if not size:
+                raise NoAvailableEndpoint("no available endpoint")
+            return endpoints[0]
+        first = int(random() * size)
+        second = int(random() * (size - 1))
+        if second >= first:
+            second += 1
+        first_endpoint, second_endpoint = endpoints[first], endpoints[second]
+        return first_endpoint if first_endpoint.outstanding <= second_endpoint.outstanding else second_endpoint
@@ -0,0 +1,21 @@
+from itertools import count
+
+from x_rpc.balancer.base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from x_rpc.balancer.exceptions import NoAvailableEndpoint
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.LOAD_BALANCER, LoadBalancerType.ROUND_ROBIN, False)
+class RoundRobinLoadBalancer(BaseLoadBalancer):
+    """轮询，默认的负载均衡方式 ."""
+
+    def __init__(self, *args, **kwargs):
+        # next() 在持有 GIL 时原子地递增，多个线程同时调用也不需要加锁
+        self._counter = count()
+        super().__init__(*args, **kwargs)
+
+    def pick(self) -> Endpoint:
+        endpoints = self.endpoints
+        if not endpoints:
+            raise NoAvailableEndpoint("no available endpoint")
+        return endpoints[next(self._counter) % len(endpoints)]
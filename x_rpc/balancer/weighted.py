@@ -0,0 +1,41 @@
+from random import random
+from typing import Iterable, List
+
+from x_rpc.balancer.base import BaseLoadBalancer, Endpoint, LoadBalancerType
+from x_rpc.balancer.exceptions import NoAvailableEndpoint
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.LOAD_BALANCER, LoadBalancerType.WEIGHTED, False)
+class WeightedLoadBalancer(BaseLoadBalancer):
+    """按权重随机选择
+
+    更新地址列表时使用 Vose 别名法生成概率表和别名表，每次选择只需要两次随机数，与地址数量无关。
+    权重小于等于 0 的地址不会被选择。
+    """
+
+    def update(self, endpoints: Iterable[Endpoint]) -> None:
+        super().update(endpoints)
+        endpoints = tuple(endpoint for endpoint in self.endpoints if endpoint.weight > 0)
+        size = len(endpoints)
+        total = sum(endpoint.weight for endpoint in endpoints)
+        scaled = [endpoint.weight * size / total for endpoint in endpoints]
+        probabilities = [1.0] * size
+        aliases = list(range(size))
+        small: List[int] = [i for i, value in enumerate(scaled) if value < 1]
+        large: List[int] = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # 一次赋值替换，pick() 不会看到更新了一半的表
+        self._table = (endpoints, probabilities, aliases)
+
+    def pick(self) -> Endpoint:
+        endpoints, probabilities, aliases = self._table
+        if not endpoints:
+            raise NoAvailableEndpoint("no available endpoint")
+        index = int(random() * len(endpoints))
+        return endpoints[index] if random() < probabilities[index] else endpoints[aliases[index]]
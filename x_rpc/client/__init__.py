@@ -0,0 +1,3 @@
+from x_rpc.client.client import Client
+
+__all__ = ["Client"]
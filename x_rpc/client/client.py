@@ -0,0 +1,149 @@
+from time import monotonic
+from typing import Any, Dict, Optional, Set
+
+from x_rpc.balancer import BaseLoadBalancer, FileDiscovery, get_load_balancer, parse_endpoints
+from x_rpc.client.constants import (
+    DEFAULT_CLIENT_DISCOVERY_INTERVAL,
+    DEFAULT_CLIENT_IDLE_TIMEOUT,
+    DEFAULT_CLIENT_MAX_IN_FLIGHT,
+    DEFAULT_CLIENT_POOL_SIZE,
+)
+from x_rpc.client.pool import ConnectionPool
+from x_rpc.codec import CodecType
+from x_rpc.config import Config
+from x_rpc.plugin import PluginType, get_plugin_instance
+from x_rpc.serializer import BaseSerializer, get_serializer, get_service_name
+from x_rpc.transport import TransportType
+
+
+class Client:
+    """RPC客户端，为每个目标地址维护一个连接池
+
+    调用时的 target 可以是 host:port，也可以是服务名；使用服务名时通过服务的负载均衡器选择地址，
+    服务地址来自配置 <SERVICE>_ENDPOINTS 或者 CLIENT_DISCOVERY_FILE 指定的服务发现文件。
+    """
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config if config is not None else Config()
+        self.pool_size = self.config.get("CLIENT_POOL_SIZE", DEFAULT_CLIENT_POOL_SIZE)
+        self.idle_timeout = self.config.get("CLIENT_IDLE_TIMEOUT", DEFAULT_CLIENT_IDLE_TIMEOUT)
+        self.max_in_flight = self.config.get("CLIENT_MAX_IN_FLIGHT", DEFAULT_CLIENT_MAX_IN_FLIGHT)
+        self.codec = get_plugin_instance(PluginType.CODEC, self.config.get("CLIENT_CODEC", CodecType.XRPC))
+        self.transport = get_plugin_instance(
+            PluginType.TRANSPORT, self.config.get("CLIENT_TRANSPORT", TransportType.TCP)
+        )
+        # 目标地址 -> 连接池
+        self.pools: Dict[str, ConnectionPool] = {}
+        # 服务名 -> 序列化插件
+        self.serializers: Dict[str, BaseSerializer] = {}
+        # 服务名 -> 负载均衡器
+        self.balancers: Dict[str, BaseLoadBalancer] = {}
+        discovery_file = self.config.get("CLIENT_DISCOVERY_FILE")
+        self.discovery = FileDiscovery(discovery_file) if discovery_file else None
+        self.discovery_interval = self.config.get("CLIENT_DISCOVERY_INTERVAL", DEFAULT_CLIENT_DISCOVERY_INTERVAL)
+        self._discovery_checked = 0.0
+        # 已经从服务发现中删除，等待进行中的请求完成后关闭连接池的目标地址
+        self._retired: Set[str] = set()
+        # 目标地址 -> 进行中的请求数，包括还在等待连接的请求
+        self._outstanding: Dict[str, int] = {}
+
+    def get_pool(self, target: str) -> ConnectionPool:
+        pool = self.pools.get(target)
+        if pool is None:
+            pool = ConnectionPool(
+                target, self.codec, self.transport, self.pool_size, self.max_in_flight, self.idle_timeout
+            )
+            self.pools[target] = pool
+        return pool
+
+    def get_serializer(self, method: str) -> BaseSerializer:
+        service = get_service_name(method)
+        serializer = self.serializers.get(service)
+        if serializer is None:
+            serializer = self.serializers[service] = get_serializer(self.config, service)
+        return serializer
+
+    def _get_balanced_targets(self) -> Set[str]:
+        return {endpoint.target for balancer in self.balancers.values() for endpoint in balancer.endpoints}
+
+    def _refresh_discovery(self) -> None:
+        """按间隔检查服务发现文件，服务地址变化后更新所有负载均衡器，并关闭不再使用的连接池 ."""
+        now = monotonic()
+        if now - self._discovery_checked < self.discovery_interval:
+            return
+        self._discovery_checked = now
+        if not self.discovery.refresh():
+            return
+        targets = self._get_balanced_targets()
+        for service, balancer in self.balancers.items():
+            endpoints = self.discovery.get_endpoints(service)
+            if endpoints is None:
+                # 服务从文件中删除后使用配置中的地址，没有配置时清空地址
+                endpoints = parse_endpoints(self.config.get(f"{service.upper()}_ENDPOINTS", ()))
+            balancer.update(endpoints)
+        current_targets = self._get_balanced_targets()
+        # 重新加入的地址继续使用原来的连接池
+        self._retired -= current_targets
+        for target in targets - current_targets:
+            self._retire(target)
+
+    def _retire(self, target: str) -> None:
+        """关闭已删除地址的连接池，还有进行中的请求时等请求完成后再关闭
+
+        进行中的请求包括正在建立连接或者等待可用连接的请求，只看连接上的请求数会提前关闭连接池。
+        """
+        pool = self.pools.get(target)
+        if pool is not None and target in self._outstanding:
+            self._retired.add(target)
+            return
+        self._retired.discard(target)
+        if pool is not None:
+            del self.pools[target]
+            pool.close()
+
+    def get_balancer(self, service: str) -> BaseLoadBalancer:
+        if self.discovery is not None:
+            self._refresh_discovery()
+        balancer = self.balancers.get(service)
+        if balancer is None:
+            endpoints = self.discovery.get_endpoints(service) if self.discovery is not None else None
+            balancer = self.balancers[service] = get_load_balancer(self.config, service, endpoints)
+        return balancer
+
+    async def call(self, target: str, method: str, body: bytes = b"", timeout: Optional[float] = None) -> bytes:
+        """调用远程方法，target 为 host:port 或者服务名 ."""
+        if ":" in target:
+            return await self._call(target, method, body, timeout)
+        balancer = self.get_balancer(target)
+        endpoint = balancer.acquire()
+        try:
+            return await self._call(endpoint.target, method, body, timeout)
+        finally:
+            balancer.release(endpoint)
+
+    async def _call(self, target: str, method: str, body: bytes, timeout: Optional[float]) -> bytes:
+        outstanding = self._outstanding
+        outstanding[target] = outstanding.get(target, 0) + 1
+        try:
+            return await self.get_pool(target).call(method, body, timeout)
+        finally:
+            count = outstanding[target] - 1
+            if count:
+                outstanding[target] = count
+            else:
+                del outstanding[target]
+                # 已删除地址的最后一个请求完成后关闭连接池
+                if self._retired and target in self._retired:
+                    self._retire(target)
+
+    async def invoke(self, target: str, method: str, obj: Any = None, timeout: Optional[float] = None) -> Any:
+        """使用服务配置的序列化插件调用远程方法 ."""
+        serializer = self.get_serializer(method)
+        body = await self.call(target, method, serializer.encode(obj), timeout)
+        return serializer.decode(body)
+
+    async def close(self) -> None:
+        for pool in self.pools.values():
+            pool.close()
+        self.pools.clear()
+        self._retired.clear()
@@ -0,0 +1,8 @@
+# 每个目标地址的最大连接数
+DEFAULT_CLIENT_POOL_SIZE = 4
+# 连接空闲超过此时间（秒）后关闭
+DEFAULT_CLIENT_IDLE_TIMEOUT = 60.0
+# 单个连接上同时进行中的最大请求数
+DEFAULT_CLIENT_MAX_IN_FLIGHT = 512
+# 服务发现文件的检查间隔（秒）
+DEFAULT_CLIENT_DISCOVERY_INTERVAL = 5.0
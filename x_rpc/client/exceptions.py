@@ -0,0 +1,21 @@
+from x_rpc.exceptions import ErrorCode, ErrorType, XRPCBaseException, XRPCException
+from x_rpc.standard.http import STATUS_CODES
+
+
+class ClientException(XRPCException):
+    pass
+
+
+class ConnectionLost(ClientException):
+    pass
+
+
+class RemoteException(XRPCBaseException):
+    """服务端返回的错误响应 ."""
+
+    def __init__(self, code: int, message: str):
+        if code in STATUS_CODES or code == ErrorCode.ERR_UNKNOWN:
+            exception_type = ErrorType.FRAMEWORK
+        else:
+            exception_type = ErrorType.BUSINESS
+        super().__init__(exception_type, code, message)
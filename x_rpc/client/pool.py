@@ -0,0 +1,129 @@
+import asyncio
+from collections import deque
+from typing import Deque, List
+
+from x_rpc.client.protocol import ClientProtocol
+from x_rpc.exceptions import RequestTimeout
+from x_rpc.utils.deadline import get_timeout
+
+
+class ConnectionPool:
+    """一个目标地址的连接池，连接数有上限，每个连接复用多个请求 ."""
+
+    def __init__(
+        self,
+        target: str,
+        codec,
+        transport,
+        size: int,
+        max_in_flight: int,
+        idle_timeout: float,
+    ):
+        self.target = target
+        self.host, port = target.rsplit(":", 1)
+        self.port = int(port)
+        self.codec = codec
+        self.transport = transport
+        self.size = size
+        self.max_in_flight = max_in_flight
+        self.idle_timeout = idle_timeout
+        self.loop = asyncio.get_running_loop()
+        self.connections: List[ClientProtocol] = []
+        # 正在建立中的连接数
+        self._connecting = 0
+        # 等待可用连接的请求
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> ClientProtocol:
+        """获得一个可用的连接，优先复用已有的空闲连接 ."""
+        while True:
+            connection = self._least_loaded()
+            if connection is not None and (
+                connection.in_flight == 0 or len(self.connections) + self._connecting >= self.size
+            ):
+                return connection
+            if len(self.connections) + self._connecting < self.size:
+                return await self._connect()
+            if connection is not None:
+                return connection
+            # 连接数已达上限且所有连接都已满，等待连接释放
+            waiter = self.loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+
+    def _least_loaded(self):
+        best = None
+        max_in_flight = self.max_in_flight
+        for connection in self.connections:
+            in_flight = connection.in_flight
+            if in_flight < max_in_flight and not connection.is_closed:
+                if best is None or in_flight < best.in_flight:
+                    best = connection
+                    if in_flight == 0:
+                        break
+        return best
+
+    async def _connect(self) -> ClientProtocol:
+        self._connecting += 1
+        try:
+            _, connection = await self.transport.create_connection(
+                lambda: ClientProtocol(self), self.host, self.port
+            )
+        except BaseException:
+            # 连接失败，让等待者重新尝试建立连接
+            self._wakeup_all()
+            raise
+        finally:
+            self._connecting -= 1
+        self.connections.append(connection)
+        # 新连接可以承载多个请求，唤醒所有等待者重新选择连接
+        self._wakeup_all()
+        return connection
+
+    def release(self, connection: ClientProtocol) -> None:
+        """连接上有请求完成 ."""
+        if self._waiters:
+            self._wakeup()
+
+    def remove(self, connection: ClientProtocol) -> None:
+        """连接断开后从连接池中移除 ."""
+        try:
+            self.connections.remove(connection)
+        except ValueError:
+            pass
+        self._wakeup_all()
+
+    def _wakeup(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    def _wakeup_all(self):
+        waiters, self._waiters = self._waiters, deque()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def call(self, method: str, body: bytes, timeout: float = None) -> bytes:
+        """等待可用连接和等待响应共用同一个超时时间 ."""
+        timeout = get_timeout(timeout)
+        if timeout is None:
+            connection = await self.acquire()
+            return await connection.send(method, body)
+        deadline = self.loop.time() + timeout
+        try:
+            connection = await asyncio.wait_for(self.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise RequestTimeout()
+        return await connection.send(method, body, deadline - self.loop.time())
+
+    def close(self) -> None:
+        for connection in list(self.connections):
+            connection.close()
+        self.connections.clear()
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Dict
+
+from x_rpc.client.exceptions import ConnectionLost, RemoteException
+from x_rpc.codec.exceptions import CodecException
+from x_rpc.exceptions import ErrorCode, RequestTimeout
+from x_rpc.utils.deadline import get_timeout
+
+# 请求ID是32位无符号整数
+MAX_REQUEST_ID = 0xFFFFFFFF
+
+
+class ClientProtocol(asyncio.Protocol):
+    """客户端连接，在一个连接上复用多个进行中的请求，通过请求ID匹配响应 ."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.codec = pool.codec
+        self.loop = pool.loop
+        self.transport = None
+        self.buffer = bytearray()
+        # 请求ID -> 等待响应的future
+        self.waiters: Dict[int, asyncio.Future] = {}
+        self.next_request_id = 0
+        # 开始空闲的时间
+        self.idle_since = self.loop.time()
+        self._idle_handle = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.waiters)
+
+    @property
+    def is_closed(self) -> bool:
+        return self.transport is None or self.transport.is_closing()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._schedule_idle_check(self.pool.idle_timeout)
+
+    def connection_lost(self, exc):
+        self.transport = None
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        waiters, self.waiters = self.waiters, {}
+        for waiter in waiters.values():
+            if not waiter.done():
+                waiter.set_exception(ConnectionLost(f"connection to {self.pool.target} lost"))
+        self.pool.remove(self)
+
+    def data_received(self, data: bytes):
+        try:
+            frames = self.codec.decode(self.buffer, data)
+        except CodecException:
+            self.transport.close()
+            return
+        waiters = self.waiters
+        for frame in frames:
+            waiter = waiters.pop(frame.request_id, None)
+            # 请求已超时或被取消
+            if waiter is None or waiter.done():
+                continue
+            if frame.status == ErrorCode.SUCCESS:
+                waiter.set_result(frame.body)
+            else:
+                waiter.set_exception(RemoteException(frame.status, frame.body.decode("utf8")))
+        if frames:
+            if not waiters:
+                self.idle_since = self.loop.time()
+            self.pool.release(self)
+
+    def send(self, method: str, body: bytes, timeout: float = None) -> asyncio.Future:
+        """发送请求，返回等待响应的future
+
+        在服务端处理请求时调用，超时时间不超过当前请求的剩余时间，剩余时间随请求发送给下游服务。
+        """
+        waiter = self.loop.create_future()
+        timeout = get_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            # 当前请求已经过期，不再发送
+            waiter.set_exception(RequestTimeout())
+            return waiter
+        request_id = self.next_request_id
+        self.next_request_id = (request_id + 1) & MAX_REQUEST_ID
+        self.waiters[request_id] = waiter
+        if timeout is not None:
+            handle = self.loop.call_later(timeout, self._on_timeout, request_id)
+            waiter.add_done_callback(lambda _: handle.cancel())
+        self.transport.write(self.codec.encode_request(request_id, method, body, timeout))
+        return waiter
+
+    def _on_timeout(self, request_id: int):
+        waiter = self.waiters.pop(request_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(RequestTimeout())
+            if not self.waiters:
+                self.idle_since = self.loop.time()
+            self.pool.release(self)
+
+    def _schedule_idle_check(self, delay: float):
+        if delay:
+            self._idle_handle = self.loop.call_later(delay, self._check_idle)
+
+    def _check_idle(self):
+        """空闲连接检查，避免每个请求都创建和取消定时器 ."""
+        self._idle_handle = None
+        if self.is_closed:
+            return
+        idle_timeout = self.pool.idle_timeout
+        if not self.waiters:
+            idle_time = self.loop.time() - self.idle_since
+            if idle_time >= idle_timeout:
+                self.transport.close()
+                return
+            self._schedule_idle_check(idle_timeout - idle_time)
+        else:
+            self._schedule_idle_check(idle_timeout)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
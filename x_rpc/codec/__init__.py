@@ -0,0 +1,5 @@
+from .base import BaseCodec, CodecType
+from .frame import Frame
+from .xrpc_codec import XRPCCodec
+
+__all__ = ["BaseCodec", "CodecType", "Frame", "XRPCCodec"]
@@ -0,0 +1,33 @@
+from abc import ABCMeta, abstractmethod
+from enum import IntEnum, unique
+from typing import List, Optional, Union
+
+from .frame import Frame
+
+
+@unique
+class CodecType(IntEnum):
+    XRPC = 1
+
+
+class BaseCodec(metaclass=ABCMeta):
+    @abstractmethod
+    def encode_request(self, request_id: int, method: str, body: bytes, timeout: Optional[float] = None) -> bytes:
+        """编码请求帧
+
+        :param timeout: 请求的剩余处理时间（秒），服务端超过这个时间后取消请求
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode_response(self, request_id: int, status: int, body: bytes) -> bytes:
+        raise NotImplementedError
+
+    def encode_cached_response(self, request_id: int, status: int, body: bytes) -> Union[bytes, bytearray]:
+        """编码内容固定的响应，例如预先编码的错误响应，默认不缓存 ."""
+        return self.encode_response(request_id, status, body)
+
+    @abstractmethod
+    def decode(self, buffer: bytearray, data: Union[bytes, bytearray] = b"") -> List[Frame]:
+        """从接收缓冲区和新收到的数据中解析出所有完整的帧，剩余的不完整数据保留在缓冲区中 ."""
+        raise NotImplementedError
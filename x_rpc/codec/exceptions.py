@@ -0,0 +1,9 @@
+from x_rpc.exceptions import XRPCException
+
+
+class CodecException(XRPCException):
+    pass
+
+
+class FrameDecodeError(CodecException):
+    pass
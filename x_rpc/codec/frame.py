@@ -0,0 +1,31 @@
+from typing import Optional
+
+
+class Frame:
+    """一个请求或响应帧 ."""
+
+    __slots__ = ("request_id", "flags", "status", "method", "body", "timeout")
+
+    def __init__(
+        self,
+        request_id: int,
+        flags: int,
+        status: int,
+        method: Optional[str],
+        body: bytes,
+        timeout: Optional[float] = None,
+    ):
+        # 请求ID，用于在同一个连接上匹配请求和响应
+        self.request_id = request_id
+        # 帧标记位
+        self.flags = flags
+        # 状态码，请求帧为0
+        self.status = status
+        # 请求方法名，响应帧为空，不是合法的 UTF-8 时为 None
+        self.method = method
+        self.body = body
+        # 请求的剩余处理时间（秒），没有截止时间时为 None
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"<Frame request_id={self.request_id} status={self.status} method={self.method!r}>"
@@ -0,0 +1,118 @@
+from math import ceil
+from struct import Struct
+from typing import Dict, List, Optional, Tuple, Union
+
+from x_rpc.codec.base import BaseCodec, CodecType
+from x_rpc.codec.exceptions import FrameDecodeError
+from x_rpc.codec.frame import Frame
+from x_rpc.plugin import PluginType, register_plugin
+
+# 帧头：魔数、版本、标记位、请求ID、状态码、方法名长度、消息体长度
+HEADER = Struct("!HBBIHHI")
+HEADER_SIZE = HEADER.size
+# 请求ID在帧头中的偏移量
+REQUEST_ID = Struct("!I")
+REQUEST_ID_OFFSET = 4
+MAGIC = 0x5852
+VERSION = 1
+# 响应帧标记
+FLAG_RESPONSE = 0x01
+# 请求帧带有截止时间，帧头后面是剩余处理时间（毫秒）
+FLAG_DEADLINE = 0x02
+DEADLINE = Struct("!I")
+DEADLINE_SIZE = DEADLINE.size
+MAX_DEADLINE = 0xFFFFFFFF
+# 单个帧的最大长度
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def _decode_method(data: memoryview) -> Optional[str]:
+    """帧的长度合法但方法名不是合法的 UTF-8 时返回 None，由服务端返回错误响应，不影响后续的帧 ."""
+    try:
+        return str(data, "utf8")
+    except UnicodeDecodeError:
+        return None
+
+
+@register_plugin(PluginType.CODEC, CodecType.XRPC)
+class XRPCCodec(BaseCodec):
+    """长度前缀的二进制帧编解码器 ."""
+
+    def __init__(self):
+        # (状态码, 消息体) -> 请求ID为0的响应帧
+        self._response_templates: Dict[Tuple[int, bytes], bytes] = {}
+
+    def encode_request(self, request_id: int, method: str, body: bytes, timeout: Optional[float] = None) -> bytes:
+        method_bytes = method.encode("utf8")
+        if timeout is None:
+            header = HEADER.pack(MAGIC, VERSION, 0, request_id, 0, len(method_bytes), len(body))
+            return b"".join((header, method_bytes, body))
+        header = HEADER.pack(MAGIC, VERSION, FLAG_DEADLINE, request_id, 0, len(method_bytes), len(body))
+        # 不足一毫秒的剩余时间向上取整，避免还没有过期的请求被服务端丢弃
+        deadline = DEADLINE.pack(min(max(ceil(timeout * 1000), 0), MAX_DEADLINE))
+        return b"".join((header, deadline, method_bytes, body))
+
+    def encode_response(self, request_id: int, status: int, body: bytes) -> bytes:
+        return HEADER.pack(MAGIC, VERSION, FLAG_RESPONSE, request_id, status, 0, len(body)) + body
+
+    def encode_cached_response(self, request_id: int, status: int, body: bytes) -> bytearray:
+        """复制预先编码的响应帧并写入请求ID，消息体必须是有限的几种固定内容
+
+        返回可以直接写入传输层的 bytearray，不再转换为 bytes，避免多一次复制。
+        """
+        key = (status, body)
+        template = self._response_templates.get(key)
+        if template is None:
+            template = self._response_templates[key] = self.encode_response(0, status, body)
+        frame = bytearray(template)
+        REQUEST_ID.pack_into(frame, REQUEST_ID_OFFSET, request_id)
+        return frame
+
+    def decode(self, buffer: bytearray, data: Union[bytes, bytearray] = b"") -> List[Frame]:
+        """解析缓冲区和新收到的数据中所有完整的帧，不完整的数据保留在缓冲区中
+
+        缓冲区为空时直接从收到的数据中解析，避免拷贝到缓冲区；
+        帧头使用 unpack_from 按偏移量解析，只在最后统一移除已解析的数据。
+        """
+        if buffer:
+            buffer.extend(data)
+            source = buffer
+        else:
+            source = data
+        size = len(source)
+        offset = 0
+        frames = []
+        unpack_from = HEADER.unpack_from
+        view = memoryview(source)
+        try:
+            while size - offset >= HEADER_SIZE:
+                magic, version, flags, request_id, status, method_size, body_size = unpack_from(source, offset)
+                if magic != MAGIC or version != VERSION:
+                    raise FrameDecodeError(f"invalid frame header magic={magic:#x} version={version}")
+                if body_size > MAX_FRAME_SIZE:
+                    raise FrameDecodeError(f"frame body too large: {body_size}")
+                method_start = offset + HEADER_SIZE
+                if flags & FLAG_DEADLINE:
+                    method_start += DEADLINE_SIZE
+                body_start = method_start + method_size
+                frame_end = body_start + body_size
+                # 帧不完整，等待更多的数据
+                if frame_end > size:
+                    break
+                method = _decode_method(view[method_start:body_start]) if method_size else ""
+                body = view[body_start:frame_end].tobytes()
+                if flags & FLAG_DEADLINE:
+                    timeout = DEADLINE.unpack_from(source, offset + HEADER_SIZE)[0] / 1000
+                    frames.append(Frame(request_id, flags, status, method, body, timeout))
+                else:
+                    frames.append(Frame(request_id, flags, status, method, body))
+                offset = frame_end
+        finally:
+            view.release()
+
+        if source is buffer:
+            if offset:
+                del buffer[:offset]
+        elif offset < size:
+            buffer.extend(data[offset:])
+        return frames
@@ -1,3 +1,14 @@
-from x_rpc.config.config import Config
+from x_rpc.utils.lazy import lazy_exports
 
-__all__ = ["Config"]
+# 导出名称 -> 所在模块，第一次访问时才导入模块
+_EXPORTS = {
+    "Config": "x_rpc.config.config",
+    "ConfigLayer": "x_rpc.config.layer",
+    "ConfigOrigin": "x_rpc.config.layer",
+    "ConfigSchema": "x_rpc.config.schema",
+    "ConfigSnapshot": "x_rpc.config.snapshot",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,47 +1,135 @@
-from inspect import getmembers, isdatadescriptor
+import os
+import threading
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Type, Union
 
 from x_rpc.config.constants import XRPC_PREFIX
-from x_rpc.config.provider import ConfigProviderType
+from x_rpc.config.exceptions import ConfigException
+from x_rpc.config.layer import ConfigLayer, ConfigOrigin
+from x_rpc.config.provider import ConfigProviderType, get_provider_type
+from x_rpc.config.schema import ConfigSchema
+from x_rpc.config.snapshot import ConfigSnapshot
 from x_rpc.config.utils import parse_config_from_object
-from x_rpc.plugin import PluginType, get_plugin_instance
+from x_rpc.plugin.helper import get_plugin_instance
+from x_rpc.plugin.ptype import PluginType
+from x_rpc.utils.module import resolve_location
+
+# 配置提供者是单例，设置参数和加载配置需要加锁
+_provider_lock = threading.Lock()
+
+
+def load_from_provider(provider_type: ConfigProviderType, options: Dict) -> Dict:
+    """使用配置提供者加载配置 ."""
+    provider = get_plugin_instance(PluginType.CONFIG_PROVIDER, provider_type)
+    with _provider_lock:
+        provider.set_options(options)
+        return provider.load()
+
+
+def invalidate_environ() -> None:
+    """环境变量可能在进程内被修改，重新读取环境变量前使索引失效 ."""
+    from x_rpc.config.provider.env_index import DefaultEnvironIndex
+
+    DefaultEnvironIndex.invalidate()
 
 
 class DescriptorMeta(type):
     def __init__(cls, *_):
         # 获得类中所有的可修改属性名
-        cls.__setters__ = {name for name, _ in getmembers(cls, cls._is_setter)}
+        cls.__setters__ = {name for name in dir(cls) if cls._is_setter(getattr(cls, name, None))}
 
     @staticmethod
     def _is_setter(member: object):
         """判断一个类方法是否是属性设置方法 ."""
-        # isdatadescriptor: 如果对象是数据描述符，则返回True，数字标识符有__get__ 和__set__属性； 通常也有__name__和__doc__属性
-        return isdatadescriptor(member) and hasattr(member, "setter")
+        # 不使用 inspect.isdatadescriptor，避免导入 inspect 模块
+        return isinstance(member, property)
 
 
 class Config(dict, metaclass=DescriptorMeta):
-    """配置字典 ."""
+    """配置字典
+
+    配置分为多层（默认值、配置文件、环境变量、远程覆盖、运行时），高优先级的配置层覆盖低优先级的配置层，
+    与加载的先后顺序无关；每层的加载操作都会按顺序记录下来，reload() 时重新加载并整体替换配置；
+    请求处理过程中应该通过 config.snapshot 读取不可变的配置快照。
+    """
 
     def __init__(
         self,
         defaults: Dict[str, Union[str, bool, int, float, None]] = None,
-        env_prefix: Optional[str] = XRPC_PREFIX
+        env_prefix: Optional[Union[str, Sequence[str]]] = XRPC_PREFIX,
+        env_nested_delimiter: Optional[str] = None,
     ):
-        defaults = defaults or {}
-        super().__init__(defaults)
+        self._setup()
+        self.update_layer(ConfigLayer.DEFAULTS, defaults or {})
 
-        # 根据前缀从环境变量加载配置
+        # 根据前缀从环境变量加载配置，可以指定多个前缀
         if env_prefix and env_prefix != XRPC_PREFIX:
             options = {
-                "prefix": env_prefix,
+                "prefix": env_prefix if isinstance(env_prefix, str) else tuple(env_prefix),
             }
         else:
             options = {
                 "prefix": XRPC_PREFIX,
             }
+        options["nested_delimiter"] = env_nested_delimiter
         self.load_environment_vars(options)
 
+    def _setup(self) -> None:
+        # 内部属性不保存到字典中
+        object.__setattr__(self, "_lock", threading.RLock())
+        # 配置层 -> 按顺序记录的配置加载函数
+        object.__setattr__(self, "_loaders", {layer: [] for layer in ConfigLayer})
+        # 配置层 -> 该层合并后的配置
+        object.__setattr__(self, "_layer_values", {layer: {} for layer in ConfigLayer})
+        # 配置项 -> 生效的配置层
+        object.__setattr__(self, "_origins", {})
+        # 需要监听的配置文件
+        object.__setattr__(self, "_watch_paths", [])
+        object.__setattr__(self, "_watcher", None)
+        object.__setattr__(self, "_snapshot", None)
+        object.__setattr__(self, "_version", 0)
+        # 配置类 -> (配置快照, 配置类实例)
+        object.__setattr__(self, "_schemas", {})
+        # 主进程写入共享配置，工作进程读取共享配置
+        object.__setattr__(self, "_shared_writer", None)
+        object.__setattr__(self, "_shared_reader", None)
+        object.__setattr__(self, "_shared_generation", -1)
+
+    @classmethod
+    def attach(cls, path: Union[str, Path]) -> "Config":
+        """工作进程映射主进程共享的配置，不需要重新执行配置文件和扫描环境变量 ."""
+        from x_rpc.config.shared import SharedConfigReader
+
+        config = cls.__new__(cls)
+        config._setup()
+        reader = SharedConfigReader(path)
+        object.__setattr__(config, "_shared_reader", reader)
+        config._load(config._read_shared, ConfigLayer.FILE)
+        return config
+
+    def _read_shared(self) -> Dict:
+        generation, values = self._shared_reader.read()
+        object.__setattr__(self, "_shared_generation", generation)
+        return values
+
+    def share(self, path: Optional[Union[str, Path]] = None) -> int:
+        """将当前配置快照写入内存映射文件，返回当前代数
+
+        用于不是由主进程 fork 出来的进程读取配置（Supervisor 的工作进程 fork 时已经继承了配置）；
+        单个配置项的更新不会同步写入，批量修改配置后再次调用 share() 写入一次，reload() 会自动写入。
+        """
+        from x_rpc.config.shared import SharedConfigWriter
+
+        with self._lock:
+            if path is not None:
+                if self._shared_writer is not None:
+                    self._shared_writer.close()
+                object.__setattr__(self, "_shared_writer", SharedConfigWriter(path))
+            elif self._shared_writer is None:
+                raise ConfigException("config is not shared, call share(path) first")
+            return self._shared_writer.write(self.snapshot)
+
     def __getattr__(self, attr):
         """使用点号获取实例属性，如果属性不存在就自动调用__getattr__方法 ."""
         try:
@@ -65,26 +153,180 @@ class Config(dict, metaclass=DescriptorMeta):
         """给key赋值 ."""
         self.update({attr: value})
 
+    def update(self, *args, **kwargs) -> None:
+        """更新运行时配置，更新的值在重新加载时会被保留 ."""
+        self.update_layer(ConfigLayer.RUNTIME, dict(*args, **kwargs))
+
+    def update_layer(self, layer: ConfigLayer, values: Dict) -> None:
+        """更新指定配置层的静态配置 ."""
+        values = dict(values)
+        with self._lock:
+            loaders = self._loaders[layer]
+            # 合并连续的静态配置，避免加载函数无限增长
+            if loaders and isinstance(loaders[-1], dict):
+                loaders[-1].update(values)
+            else:
+                loaders.append(values)
+            self._apply(layer, values)
+
+    def set_layer(self, layer: ConfigLayer, values: Dict) -> ConfigSnapshot:
+        """替换指定配置层的全部配置，例如远程下发的覆盖配置 ."""
+        with self._lock:
+            self._loaders[layer][:] = [dict(values)]
+            return self.reload(layer)
+
+    def _apply(self, layer: ConfigLayer, values: Dict) -> None:
+        """增量合并一个配置层的新配置，被更高优先级配置层覆盖的配置项不生效 ."""
+        self._layer_values[layer].update(values)
+        origins = self._origins
+        changed = False
+        for key, value in values.items():
+            if origins.get(key, layer) <= layer:
+                origins[key] = layer
+                if key not in self or dict.__getitem__(self, key) is not value:
+                    dict.__setitem__(self, key, value)
+                    changed = True
+        # 配置没有变化时继续使用原来的快照，避免每次更新都重新复制整个配置
+        if not changed:
+            return
+        object.__setattr__(self, "_snapshot", None)
+
+    def _load(self, loader: Callable[[], Dict], layer: ConfigLayer) -> None:
+        """执行配置加载函数，并记录下来用于重新加载 ."""
+        with self._lock:
+            values = loader()
+            self._loaders[layer].append(loader)
+            self._apply(layer, values)
+
+    def explain(self, key: str) -> ConfigOrigin:
+        """获得配置项的来源，包括生效的配置层和被覆盖的配置层 ."""
+        with self._lock:
+            layer = self._origins[key]
+            overridden = [
+                (other, values[key])
+                for other, values in sorted(self._layer_values.items(), reverse=True)
+                if other < layer and key in values
+            ]
+            return ConfigOrigin(key, layer, self[key], overridden)
+
+    @property
+    def version(self) -> int:
+        """配置快照的版本号，每次配置变化后递增 ."""
+        return self.snapshot.version
+
+    def refresh(self) -> bool:
+        """工作进程检查共享配置的代数，主进程重新加载过配置时读取新的配置 ."""
+        reader = self._shared_reader
+        if reader is None or reader.generation == self._shared_generation:
+            return False
+        self.reload(ConfigLayer.FILE)
+        return True
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """获得当前配置的不可变快照 ."""
+        if self._shared_reader is not None:
+            self.refresh()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._publish(dict(self))
+        return snapshot
+
+    def bind(self, schema: Type[ConfigSchema]) -> ConfigSchema:
+        """将当前配置快照转换为类型化的配置类实例，配置没有变化时返回缓存的实例 ."""
+        snapshot = self.snapshot
+        cached = self._schemas.get(schema)
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+        instance = schema(snapshot)
+        self._schemas[schema] = (snapshot, instance)
+        return instance
+
+    def _publish(self, values: Dict) -> ConfigSnapshot:
+        version = self._version + 1
+        snapshot = ConfigSnapshot(values, version)
+        object.__setattr__(self, "_version", version)
+        object.__setattr__(self, "_snapshot", snapshot)
+        return snapshot
+
+    def reload(self, layer: Optional[ConfigLayer] = None) -> ConfigSnapshot:
+        """重新加载指定的配置层，默认重新加载所有配置层，加载完成后整体替换配置快照 ."""
+        with self._lock:
+            layer_values = dict(self._layer_values)
+            if layer is None or layer == ConfigLayer.ENV:
+                invalidate_environ()
+            for current in ConfigLayer if layer is None else (layer,):
+                values = {}
+                for loader in self._loaders[current]:
+                    values.update(loader if isinstance(loader, dict) else loader())
+                layer_values[current] = values
+            # 按优先级从低到高合并所有配置层
+            merged = {}
+            origins = {}
+            for current, values in sorted(layer_values.items()):
+                merged.update(values)
+                origins.update(dict.fromkeys(values, current))
+            snapshot = self._publish(merged)
+            object.__setattr__(self, "_layer_values", layer_values)
+            object.__setattr__(self, "_origins", origins)
+            # 原地更新后只删除被移除的配置项，不加锁的读取者不会看到清空的配置
+            dict.update(self, merged)
+            for key in [key for key in self if key not in merged]:
+                dict.__delitem__(self, key)
+            if self._shared_writer is not None:
+                self._shared_writer.write(snapshot)
+        return snapshot
+
+    def watch(self, interval: float = 1.0, callback: Optional[Callable[[ConfigSnapshot], None]] = None):
+        """在后台监听 load_from_path 加载的配置文件，文件变化后自动重新加载 ."""
+        from x_rpc.config.watcher import ConfigWatcher
+
+        self.unwatch()
+
+        def on_change():
+            # 只有配置文件层发生了变化
+            snapshot = self.reload(ConfigLayer.FILE)
+            if callback is not None:
+                callback(snapshot)
+
+        watcher = ConfigWatcher(self._watch_paths, on_change, interval)
+        object.__setattr__(self, "_watcher", watcher)
+        watcher.start()
+        return watcher
+
+    def unwatch(self) -> None:
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.stop()
+            watcher.join()
+            object.__setattr__(self, "_watcher", None)
+
     def load_environment_vars(self, options: Dict) -> None:
         """从环境变量加载配置 ."""
-        provider = get_plugin_instance(PluginType.CONFIG_PROVIDER, ConfigProviderType.ENV)
-        provider.set_options(options)
-        env_config = provider.load()
-        self.update(env_config)
+        self._load(partial(load_from_provider, ConfigProviderType.ENV, dict(options)), ConfigLayer.ENV)
 
     def load_from_object(self, obj):
+        """从对象/模块/类/字典加载配置文件层的配置，重新加载时重新解析对象 ."""
         if not isinstance(obj, (bytes, str, Path)):
-            config = parse_config_from_object(obj)
-            self.update(config)
+            self._load(partial(parse_config_from_object, obj), ConfigLayer.FILE)
 
-    def load_from_path(self, path: Union[bytes, str, dict, Any]) -> None:
-        """从指定路径获取配置 ."""
+    def load_from_path(
+        self, path: Union[bytes, str, dict, Any], provider_type: Optional[ConfigProviderType] = None
+    ) -> None:
+        """从指定路径获取配置，默认根据文件后缀选择配置提供者 ."""
         if isinstance(path, (bytes, str, Path)):
-            provider = get_plugin_instance(PluginType.CONFIG_PROVIDER, ConfigProviderType.PATH)
+            if provider_type is None:
+                provider_type = get_provider_type(path)
             options = {
                 "location": path,
                 "encoding": "utf8",
             }
-            provider.set_options(options)
-            config = provider.load()
-            self.update(config)
+            self._load(partial(load_from_provider, provider_type, options), ConfigLayer.FILE)
+            location = path.decode("utf8") if isinstance(path, bytes) else path
+            # 只有 python 配置可能是模块字符串，模块字符串不需要监听；相对路径按当前目录转换为绝对路径
+            is_file = isinstance(location, Path) or "/" in location or "$" in location
+            if is_file or provider_type != ConfigProviderType.PATH:
+                self._watch_paths.append(os.path.abspath(resolve_location(location)))
@@ -0,0 +1,9 @@
+from x_rpc.exceptions import XRPCException
+
+
+class ConfigException(XRPCException):
+    pass
+
+
+class ConfigParseError(ConfigException):
+    pass
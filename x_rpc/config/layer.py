@@ -0,0 +1,29 @@
+from enum import IntEnum
+from typing import Any, List, Tuple
+
+
+class ConfigLayer(IntEnum):
+    """配置层，值越大优先级越高 ."""
+
+    DEFAULTS = 0
+    FILE = 1
+    ENV = 2
+    REMOTE = 3
+    RUNTIME = 4
+
+
+class ConfigOrigin:
+    """配置项的来源，由 Config.explain() 返回 ."""
+
+    __slots__ = ("key", "layer", "value", "overridden")
+
+    def __init__(self, key: str, layer: ConfigLayer, value: Any, overridden: List[Tuple[ConfigLayer, Any]]):
+        self.key = key
+        # 最终生效的配置层
+        self.layer = layer
+        self.value = value
+        # 被覆盖的配置层及其值，按优先级从高到低排列
+        self.overridden = overridden
+
+    def __repr__(self):
+        return f"<ConfigOrigin {self.key}={self.value!r} from {self.layer.name}>"
@@ -1,5 +1,35 @@
-from .base import BaseConfigProvider, ConfigProviderType
-from .env_provider import EnvConfigProvider
-from .path_provider import PathConfigProvider
+from x_rpc.config.provider.base import BaseConfigProvider, ConfigProviderType, get_provider_type
+from x_rpc.plugin.discovery import register_lazy_plugin
+from x_rpc.plugin.ptype import PluginType
+from x_rpc.utils.lazy import lazy_exports
 
-__all__ = ["BaseConfigProvider", "EnvConfigProvider", "ConfigProviderType", "PathConfigProvider"]
+# 配置提供者 -> 所在模块，配置提供者在第一次使用时才导入并注册
+PROVIDER_CLASSES = {
+    ConfigProviderType.ENV: ("x_rpc.config.provider.env_provider", "EnvConfigProvider"),
+    ConfigProviderType.PATH: ("x_rpc.config.provider.path_provider", "PathConfigProvider"),
+    ConfigProviderType.TOML: ("x_rpc.config.provider.toml_provider", "TomlConfigProvider"),
+    ConfigProviderType.JSON: ("x_rpc.config.provider.json_provider", "JsonConfigProvider"),
+    ConfigProviderType.YAML: ("x_rpc.config.provider.yaml_provider", "YamlConfigProvider"),
+    ConfigProviderType.INI: ("x_rpc.config.provider.ini_provider", "IniConfigProvider"),
+}
+
+for _provider_type, (_module_name, _class_name) in PROVIDER_CLASSES.items():
+    register_lazy_plugin(PluginType.CONFIG_PROVIDER, _provider_type, f"{_module_name}:{_class_name}")
+
+_EXPORTS = {class_name: module_name for module_name, class_name in PROVIDER_CLASSES.values()}
+_EXPORTS["FileConfigProvider"] = "x_rpc.config.provider.file_provider"
+
+__all__ = [
+    "BaseConfigProvider",
+    "EnvConfigProvider",
+    "ConfigProviderType",
+    "FileConfigProvider",
+    "IniConfigProvider",
+    "JsonConfigProvider",
+    "PathConfigProvider",
+    "TomlConfigProvider",
+    "YamlConfigProvider",
+    "get_provider_type",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,12 +1,38 @@
 from abc import ABCMeta, abstractmethod
 from enum import IntEnum, unique
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Union
 
 
 @unique
 class ConfigProviderType(IntEnum):
     ENV = 1
     PATH = 2
+    TOML = 3
+    JSON = 4
+    YAML = 5
+    INI = 6
+
+
+# 文件后缀 -> 配置提供者类型
+SUFFIX_PROVIDER_TYPES = {
+    ".toml": ConfigProviderType.TOML,
+    ".json": ConfigProviderType.JSON,
+    ".yaml": ConfigProviderType.YAML,
+    ".yml": ConfigProviderType.YAML,
+    ".ini": ConfigProviderType.INI,
+    ".cfg": ConfigProviderType.INI,
+}
+
+
+def get_provider_type(location: Union[bytes, str, Path]) -> ConfigProviderType:
+    """根据文件后缀获得配置提供者类型，其他文件和模块字符串作为python配置加载 ."""
+    if isinstance(location, bytes):
+        location = location.decode("utf8")
+    # 与 load_module_from_file_location 保持一致，不包含路径分隔符和环境变量的字符串是模块字符串
+    if isinstance(location, str) and "/" not in location and "$" not in location:
+        return ConfigProviderType.PATH
+    return SUFFIX_PROVIDER_TYPES.get(Path(location).suffix.lower(), ConfigProviderType.PATH)
 
 
 class BaseConfigProvider(metaclass=ABCMeta):
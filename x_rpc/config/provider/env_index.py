@@ -0,0 +1,98 @@
+import threading
+from bisect import bisect_left
+from os import environ
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from x_rpc.config.utils import copy_config
+from x_rpc.utils.format import guess_value
+
+# 比任何字符都大的字符，用于计算前缀扫描的结束位置
+MAX_CHAR = "\U0010ffff"
+
+# os.environ 内部保存的编码后的环境变量字典，直接比较比解码所有环境变量快得多
+_environ_data = getattr(environ, "_data", environ)
+
+
+class EnvironIndex:
+    """环境变量的有序索引
+
+    环境变量按名称排序后使用二分查找扫描前缀，解析结果按前缀缓存；
+    每次加载前将 os.environ 与建立索引时的副本比较，环境变量没有变化时不重建索引，
+    通过 os.environ 增删和修改环境变量后重建索引和清空缓存。
+    绕过 os.environ 修改的环境变量（例如C扩展调用 putenv）需要调用 invalidate()，Config 重新加载环境变量层时会自动调用。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 建立索引时的环境变量副本，None 表示需要重建索引
+        self._snapshot: Optional[Dict] = None
+        self._keys: List[str] = []
+        self._values: List[str] = []
+        self._cache: Dict[Tuple, Dict] = {}
+        # 索引重建的次数
+        self.version = 0
+
+    def invalidate(self) -> None:
+        """标记索引失效，下次加载时重新读取环境变量 ."""
+        self._snapshot = None
+
+    def refresh(self) -> bool:
+        """环境变量发生变化或索引失效时重建索引，返回是否重建 ."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot == _environ_data:
+            return False
+        snapshot = dict(_environ_data)
+        items = sorted(environ.items())
+        self._keys = [key for key, _ in items]
+        self._values = [value for _, value in items]
+        self._snapshot = snapshot
+        self._cache.clear()
+        self.version += 1
+        return True
+
+    def scan(self, prefix: str) -> List[Tuple[str, str]]:
+        """获得指定前缀的所有环境变量 ."""
+        keys = self._keys
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + MAX_CHAR, start)
+        return list(zip(keys[start:end], self._values[start:end]))
+
+    def load(self, prefixes: Sequence[str], nested_delimiter: Optional[str] = None) -> Dict:
+        """按前缀加载环境变量，后面的前缀覆盖前面的前缀
+
+        :param nested_delimiter: 嵌套分隔符，例如 "__" 时 XRPC_DB__POOL_SIZE 转换为 {"DB": {"POOL_SIZE": ...}}
+        """
+        key = (tuple(prefixes), nested_delimiter)
+        with self._lock:
+            self.refresh()
+            config = self._cache.get(key)
+            if config is None:
+                config = self._cache[key] = self._parse(prefixes, nested_delimiter)
+        # 返回可以安全修改的副本，不影响缓存的解析结果
+        return copy_config(config)
+
+    def _parse(self, prefixes: Sequence[str], nested_delimiter: Optional[str]) -> Dict:
+        config: Dict = {}
+        for prefix in prefixes:
+            prefix_size = len(prefix)
+            for env_key, value in self.scan(prefix):
+                config_key = env_key[prefix_size:]
+                if not config_key:
+                    continue
+                value = guess_value(value)
+                if nested_delimiter and nested_delimiter in config_key:
+                    *parents, name = config_key.split(nested_delimiter)
+                    node = config
+                    for parent in parents:
+                        child = node.get(parent)
+                        # 嵌套配置覆盖同名的非嵌套配置
+                        if not isinstance(child, dict):
+                            child = node[parent] = {}
+                        node = child
+                    node[name] = value
+                elif not isinstance(config.get(config_key), dict):
+                    config[config_key] = value
+        return config
+
+
+DefaultEnvironIndex = EnvironIndex()
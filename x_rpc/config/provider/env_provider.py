@@ -1,21 +1,28 @@
-from os import environ
 from typing import Dict
 
 from x_rpc.config.constants import XRPC_PREFIX
 from x_rpc.config.provider import BaseConfigProvider, ConfigProviderType
+from x_rpc.config.provider.env_index import DefaultEnvironIndex
 from x_rpc.plugin import PluginType, register_plugin
-from x_rpc.utils.format import str_to_bool
 
 
 @register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.ENV)
 class EnvConfigProvider(BaseConfigProvider):
     def __init__(self, *args, **kwargs):
         self.options = None
-        self.prefix = XRPC_PREFIX
+        self.prefixes = (XRPC_PREFIX,)
+        self.nested_delimiter = None
 
     def set_options(self, options: Dict) -> None:
         self.options = options
-        self.prefix = self.options.get("prefix", XRPC_PREFIX)
+        prefix = self.options.get("prefix", XRPC_PREFIX)
+        # 支持多个前缀，后面的前缀覆盖前面的前缀
+        self.prefixes = (prefix,) if isinstance(prefix, str) else tuple(prefix)
+        self.nested_delimiter = self.options.get("nested_delimiter")
+
+    @property
+    def prefix(self) -> str:
+        return self.prefixes[-1]
 
     def load(self):
         """
@@ -30,20 +37,8 @@ class EnvConfigProvider(BaseConfigProvider):
         - ``bool``
 
         Anything else will be imported as a ``str``.
+
+        Environment variables are scanned through a sorted index and the
+        parsed result is cached until the environment changes.
         """
-        config = {}
-        converters = (int, float, str_to_bool, str)
-        for key, value in environ.items():
-            # 过滤前缀
-            if not key.startswith(self.prefix):
-                continue
-            # 获得配置key
-            _, config_key = key.split(self.prefix, 1)
-            # 将配置值转换为指定类型，注意类型转换顺序
-            for converter in converters:
-                try:
-                    config[config_key] = converter(value)
-                    break
-                except ValueError:
-                    pass
-        return config
+        return DefaultEnvironIndex.load(self.prefixes, self.nested_delimiter)
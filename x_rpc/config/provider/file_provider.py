@@ -0,0 +1,57 @@
+from abc import abstractmethod
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+from x_rpc.config.provider.base import BaseConfigProvider
+from x_rpc.config.utils import copy_config
+from x_rpc.utils.module import get_file_signature, resolve_location
+
+# 文件路径 -> (文件签名, 配置)
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+
+
+def clear_config_cache() -> None:
+    _config_cache.clear()
+
+
+class FileConfigProvider(BaseConfigProvider):
+    """从文件加载配置，文件的修改时间和大小没有变化时使用缓存的配置
+
+    每次加载返回缓存的配置的副本，嵌套的 dict/list/set 也会被复制，原地修改不会影响之后的加载
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.options = None
+        self.location = None
+        self.encoding = None
+
+    def set_options(self, options: Dict) -> None:
+        self.options = options
+        self.location = self.options.get("location", None)
+        self.encoding = self.options.get("encoding", "utf8")
+
+    def load(self, *args, **kwargs):
+        if self.location is None:
+            return {}
+        return self.load_file(resolve_location(self.location, self.encoding))
+
+    def load_file(self, location: str) -> Dict:
+        try:
+            signature = get_file_signature(location)
+        except OSError:
+            signature = None
+        else:
+            cached = _config_cache.get(location)
+            if cached is not None and cached[0] == signature:
+                return copy_config(cached[1])
+
+        config = self.parse(location)
+        if signature is not None:
+            _config_cache[location] = (signature, config)
+            return copy_config(config)
+        return config
+
+    @abstractmethod
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """解析配置文件 ."""
+        raise NotImplementedError
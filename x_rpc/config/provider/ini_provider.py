@@ -0,0 +1,31 @@
+from configparser import ConfigParser
+from configparser import Error as ConfigParserError
+from pathlib import Path
+from typing import Dict, Union
+
+from x_rpc.config.exceptions import ConfigParseError
+from x_rpc.config.provider.base import ConfigProviderType
+from x_rpc.config.provider.file_provider import FileConfigProvider
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.INI)
+class IniConfigProvider(FileConfigProvider):
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """解析INI配置文件，每个段落转换为一个字典，值都是字符串
+
+        INI 的段落名通常是小写的，段落名统一转换为大写作为配置项名称，例如 [server] 加载为 SERVER，
+        大小写不同的同名段落会合并；段落中的键保留原来的大小写。
+        """
+        parser = ConfigParser(interpolation=None)
+        # 保留键的大小写
+        parser.optionxform = str
+        with open(location, encoding=self.encoding) as config_file:
+            try:
+                parser.read_file(config_file)
+            except ConfigParserError as exc:
+                raise ConfigParseError(f"could not parse ini config file {location}") from exc
+        config: Dict[str, Dict[str, str]] = {}
+        for section in parser.sections():
+            config.setdefault(section.upper(), {}).update(parser.items(section, raw=True))
+        return config
@@ -0,0 +1,23 @@
+import json
+from pathlib import Path
+from typing import Dict, Union
+
+from x_rpc.config.exceptions import ConfigParseError
+from x_rpc.config.provider.base import ConfigProviderType
+from x_rpc.config.provider.file_provider import FileConfigProvider
+from x_rpc.config.utils import parse_config_from_object
+from x_rpc.plugin import PluginType, register_plugin
+
+
+@register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.JSON)
+class JsonConfigProvider(FileConfigProvider):
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """解析JSON配置文件，顶层必须是一个对象 ."""
+        with open(location, encoding=self.encoding) as config_file:
+            try:
+                config = json.load(config_file)
+            except ValueError as exc:
+                raise ConfigParseError(f"could not parse json config file {location}") from exc
+        if not isinstance(config, dict):
+            raise ConfigParseError(f"json config file {location} must contain an object")
+        return parse_config_from_object(config)
@@ -1,27 +1,29 @@
-from typing import Dict
+from pathlib import Path
+from typing import Dict, Union
 
-from x_rpc.config.provider import BaseConfigProvider, ConfigProviderType
+from x_rpc.config.provider.base import ConfigProviderType
+from x_rpc.config.provider.file_provider import FileConfigProvider
 from x_rpc.config.utils import parse_config_from_object
 from x_rpc.plugin import PluginType, register_plugin
-from x_rpc.utils.module import load_module_from_file_location
+from x_rpc.utils.module import load_module_from_file_location, resolve_location
 
 
 @register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.PATH)
-class PathConfigProvider(BaseConfigProvider):
-    def __init__(self, *args, **kwargs):
-        self.options = None
-        self.location = None
-        self.encoding = None
-
-    def set_options(self, options: Dict) -> None:
-        self.options = options
-        self.location = self.options.get("location", None)
-        self.encoding = self.options.get("encoding", "utf8")
-
+class PathConfigProvider(FileConfigProvider):
     def load(self, *args, **kwargs):
-        """从文件路径加载配置 ."""
+        """从文件路径或模块字符串加载配置 ."""
         if self.location is None:
             return {}
-        config = load_module_from_file_location(self.location, self.encoding, *args, **kwargs)
-        config = parse_config_from_object(config)
-        return config
+        location = self.location
+        if isinstance(location, bytes):
+            location = location.decode(self.encoding)
+        # 模块字符串由 import 机制缓存，只缓存文件路径
+        if args or kwargs or not (isinstance(location, Path) or "/" in location or "$" in location):
+            config = load_module_from_file_location(location, self.encoding, *args, **kwargs)
+            return parse_config_from_object(config)
+        return self.load_file(resolve_location(location, self.encoding))
+
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """执行python配置文件 ."""
+        config = load_module_from_file_location(Path(location), self.encoding)
+        return parse_config_from_object(config)
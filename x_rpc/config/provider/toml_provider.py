@@ -0,0 +1,30 @@
+from pathlib import Path
+from typing import Dict, Union
+
+from x_rpc.config.exceptions import ConfigException, ConfigParseError
+from x_rpc.config.provider.base import ConfigProviderType
+from x_rpc.config.provider.file_provider import FileConfigProvider
+from x_rpc.config.utils import parse_config_from_object
+from x_rpc.plugin import PluginType, register_plugin
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+@register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.TOML)
+class TomlConfigProvider(FileConfigProvider):
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """解析TOML配置文件，python 3.11 之前需要安装 tomli ."""
+        if tomllib is None:
+            raise ConfigException("toml config requires python 3.11+ or the tomli package")
+        with open(location, "rb") as config_file:
+            try:
+                config = tomllib.load(config_file)
+            except tomllib.TOMLDecodeError as exc:
+                raise ConfigParseError(f"could not parse toml config file {location}") from exc
+        return parse_config_from_object(config)
@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Dict, Union
+
+from x_rpc.config.exceptions import ConfigException, ConfigParseError
+from x_rpc.config.provider.base import ConfigProviderType
+from x_rpc.config.provider.file_provider import FileConfigProvider
+from x_rpc.config.utils import parse_config_from_object
+from x_rpc.plugin import PluginType, register_plugin
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+
+@register_plugin(PluginType.CONFIG_PROVIDER, ConfigProviderType.YAML)
+class YamlConfigProvider(FileConfigProvider):
+    def parse(self, location: Union[str, Path]) -> Dict:
+        """解析YAML配置文件，需要安装 PyYAML，优先使用 libyaml 实现的 CSafeLoader ."""
+        if yaml is None:
+            raise ConfigException("yaml config requires the PyYAML package")
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(location, encoding=self.encoding) as config_file:
+            try:
+                config = yaml.load(config_file, Loader=loader)  # nosec
+            except yaml.YAMLError as exc:
+                raise ConfigParseError(f"could not parse yaml config file {location}") from exc
+        if config is None:
+            return {}
+        if not isinstance(config, dict):
+            raise ConfigParseError(f"yaml config file {location} must contain a mapping")
+        return parse_config_from_object(config)
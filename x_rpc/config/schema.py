@@ -0,0 +1,136 @@
+"""声明式的类型化配置
+
+使用类属性注解声明配置项的类型和默认值，类创建时编译为 __slots__ 类，
+并预先为每个配置项选择类型转换函数，读取配置就是普通的属性访问::
+
+    class ServerSchema(ConfigSchema):
+        SERVER_HOST: str = "127.0.0.1"
+        SERVER_PORT: int = 8000
+        SERVER_DEBUG: bool = False
+
+    server_config = config.bind(ServerSchema)
+    server_config.SERVER_PORT
+"""
+import types
+from typing import Any, Callable, Dict, List, Mapping, Tuple, Union, get_type_hints
+
+from x_rpc.config.exceptions import ConfigException
+from x_rpc.utils.format import str_to_bool
+
+# 没有默认值的配置项
+MISSING = object()
+# Python 3.10 开始支持 X | None 写法的联合类型
+UnionType = getattr(types, "UnionType", None)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return str_to_bool(value)
+    return bool(value)
+
+
+def _to_list(item_converter: Callable) -> Callable:
+    def converter(value: Any) -> List:
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(",") if item.strip()]
+        return [item_converter(item) for item in value]
+
+    return converter
+
+
+def _optional(converter: Callable) -> Callable:
+    def optional_converter(value: Any) -> Any:
+        return None if value is None else converter(value)
+
+    return optional_converter
+
+
+def _exact(cls: type) -> Callable:
+    """值已经是指定类型时直接返回，否则进行类型转换 ."""
+
+    def converter(value: Any) -> Any:
+        return value if type(value) is cls else cls(value)
+
+    return converter
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def get_converter(annotation: Any) -> Callable:
+    """根据类型注解选择类型转换函数 ."""
+    if annotation is bool:
+        return _to_bool
+    if annotation in (int, float, str):
+        return _exact(annotation)
+    if isinstance(annotation, str):
+        raise ConfigException(f"unresolved config annotation {annotation!r}")
+    origin = getattr(annotation, "__origin__", None)
+    if UnionType is not None and isinstance(annotation, UnionType):
+        origin = Union
+    args = getattr(annotation, "__args__", ())
+    if origin is Union and type(None) in args:
+        # Optional[X]
+        non_none_args = [arg for arg in args if arg is not type(None)]  # noqa: E721
+        if len(non_none_args) == 1:
+            return _optional(get_converter(non_none_args[0]))
+        return _identity
+    if annotation is list or origin is list:
+        return _to_list(get_converter(args[0]) if args else _identity)
+    return _identity
+
+
+class SchemaMeta(type):
+    """将配置项编译为 __slots__ 和预先选择的类型转换函数 ."""
+
+    def __new__(mcs, name, bases, attrs):
+        annotations = attrs.get("__annotations__", {})
+        defaults = {field_name: attrs.pop(field_name, MISSING) for field_name in annotations}
+        # 父类已经定义的 slots 不能重复定义
+        parent_fields = set()
+        for base in bases:
+            parent_fields.update(getattr(base, "__fields__", {}))
+        attrs["__slots__"] = tuple(field_name for field_name in annotations if field_name not in parent_fields)
+        cls = super().__new__(mcs, name, bases, attrs)
+        # 字符串形式的注解（from __future__ import annotations）需要在类创建后解析
+        try:
+            hints = get_type_hints(cls) if annotations else {}
+        except Exception as exc:
+            raise ConfigException(f"can not resolve config annotations of {name}: {exc}") from exc
+        fields: Dict[str, Tuple[Callable, Any]] = {}
+        for base in reversed(bases):
+            fields.update(getattr(base, "__fields__", {}))
+        for field_name, default in defaults.items():
+            fields[field_name] = (get_converter(hints[field_name]), default)
+        cls.__fields__ = fields
+        return cls
+
+
+class ConfigSchema(metaclass=SchemaMeta):
+    __slots__ = ()
+
+    def __init__(self, values: Mapping[str, Any] = None, **kwargs):
+        values = dict(values or {}, **kwargs)
+        for field_name, (converter, default) in self.__fields__.items():
+            value = values.get(field_name, default)
+            if value is MISSING:
+                raise ConfigException(f"config {field_name} is required")
+            try:
+                value = converter(value)
+            except (TypeError, ValueError) as exc:
+                raise ConfigException(f"invalid value for config {field_name}: {value!r}") from exc
+            object.__setattr__(self, field_name, value)
+
+    def __setattr__(self, attr, value) -> None:
+        raise ConfigException("config schema is read-only")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {field_name: getattr(self, field_name) for field_name in self.__fields__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        values = ", ".join(f"{key}={value!r}" for key, value in self.as_dict().items())
+        return f"{self.__class__.__name__}({values})"
@@ -0,0 +1,122 @@
+import mmap
+import os
+import pickle
+from struct import Struct
+from typing import Any, Dict, Tuple, Union
+
+from x_rpc.config.exceptions import ConfigException
+
+# 魔数 + 序号 + 配置数据长度
+HEADER = Struct("!4sQQ")
+MAGIC = b"XRCF"
+# 读取时遇到写入中的配置的最大重试次数
+MAX_READ_RETRIES = 1000
+
+
+class SharedConfigWriter:
+    """将配置写入内存映射文件，由主进程使用
+
+    序号为奇数表示正在写入，写入完成后序号变为偶数，代数 = 序号 // 2；
+    文件只会变大不会变小，避免工作进程读取已映射的内存时出现 SIGBUS。
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self.fd).st_size
+        self.sequence = 0
+        if size >= HEADER.size:
+            with mmap.mmap(self.fd, HEADER.size, access=mmap.ACCESS_READ) as buffer:
+                magic, sequence, _ = HEADER.unpack_from(buffer)
+            # 沿用上一个主进程的序号，保证工作进程看到的代数是递增的
+            if magic == MAGIC:
+                self.sequence = sequence + (sequence & 1)
+        self.buffer = None
+        self._map(max(size, mmap.PAGESIZE))
+
+    @property
+    def generation(self) -> int:
+        return self.sequence // 2
+
+    def _map(self, size: int) -> None:
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)
+        if self.buffer is not None:
+            self.buffer.close()
+        self.buffer = mmap.mmap(self.fd, size)
+
+    def write(self, values: Dict[str, Any]) -> int:
+        """写入配置，返回新的代数 ."""
+        try:
+            data = pickle.dumps(dict(values), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as exc:
+            raise ConfigException(f"config can not be shared: {exc}")
+        size = HEADER.size + len(data)
+        if size > len(self.buffer):
+            # 按页对齐扩容，减少扩容次数
+            self._map((max(size, len(self.buffer) * 2) + mmap.PAGESIZE - 1) & ~(mmap.PAGESIZE - 1))
+        buffer = self.buffer
+        self.sequence += 1
+        HEADER.pack_into(buffer, 0, MAGIC, self.sequence, 0)
+        buffer[HEADER.size:size] = data
+        self.sequence += 1
+        HEADER.pack_into(buffer, 0, MAGIC, self.sequence, len(data))
+        return self.generation
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+            os.close(self.fd)
+
+
+class SharedConfigReader:
+    """以只读方式映射主进程写入的配置文件，由工作进程使用 ."""
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        try:
+            self.fd = os.open(self.path, os.O_RDONLY)
+        except OSError as exc:
+            raise ConfigException(f"can not open shared config {self.path}: {exc.strerror}")
+        self.buffer = None
+        # 主进程还没有写入配置
+        if os.fstat(self.fd).st_size < HEADER.size:
+            os.close(self.fd)
+            raise ConfigException(f"{self.path} is not a shared config file")
+        self._map()
+        if HEADER.unpack_from(self.buffer)[0] != MAGIC:
+            self.close()
+            raise ConfigException(f"{self.path} is not a shared config file")
+
+    def _map(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+        self.buffer = mmap.mmap(self.fd, os.fstat(self.fd).st_size, access=mmap.ACCESS_READ)
+
+    @property
+    def generation(self) -> int:
+        """只读取文件头，开销很小，可以在每次访问配置时检查 ."""
+        return HEADER.unpack_from(self.buffer)[1] // 2
+
+    def read(self) -> Tuple[int, Dict[str, Any]]:
+        """读取一份完整的配置，返回代数和配置 ."""
+        for _ in range(MAX_READ_RETRIES):
+            _, sequence, length = HEADER.unpack_from(self.buffer)
+            if sequence & 1:
+                os.sched_yield()
+                continue
+            if HEADER.size + length > len(self.buffer):
+                # 主进程扩容了文件，重新映射
+                self._map()
+            data = self.buffer[HEADER.size:HEADER.size + length]
+            # 读取过程中配置没有被修改
+            if HEADER.unpack_from(self.buffer)[1] == sequence:
+                return sequence // 2, pickle.loads(data)
+        raise ConfigException(f"shared config {self.path} is being written")
+
+    def close(self) -> None:
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+            os.close(self.fd)
@@ -0,0 +1,43 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+from x_rpc.config.exceptions import ConfigException
+
+
+class ConfigSnapshot(Mapping):
+    """不可变的配置快照
+
+    配置值保存在实例的 __dict__ 中，通过属性读取配置就是一次普通的属性访问；
+    配置重新加载时创建新的快照并整体替换，读取者不会看到更新了一半的配置。
+    快照只保证顶层不可变，不应该原地修改可变的配置值。
+    """
+
+    __slots__ = ("version", "__dict__")
+
+    def __init__(self, values: Dict[str, Any], version: int):
+        object.__setattr__(self, "version", version)
+        object.__getattribute__(self, "__dict__").update(values)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.__dict__[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dict__)
+
+    def __len__(self) -> int:
+        return len(self.__dict__)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__dict__
+
+    def __getattr__(self, attr):
+        raise AttributeError(f"Config has no '{attr}'")
+
+    def __setattr__(self, attr, value) -> None:
+        raise ConfigException("config snapshot is read-only")
+
+    def __delattr__(self, attr) -> None:
+        raise ConfigException("config snapshot is read-only")
+
+    def __repr__(self):
+        return f"<ConfigSnapshot version={self.version} {self.__dict__!r}>"
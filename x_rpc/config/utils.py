@@ -1,22 +1,86 @@
-from inspect import isclass
-
-
-def parse_config_from_object(config):
-    if not isinstance(config, dict):
-        cfg = {}
-        if not isclass(config):
-            # 获得对象/模块的所有属性
-            cfg.update(
-                {
-                    key: getattr(config, key)
-                    for key in config.__class__.__dict__.keys()
-                }
-            )
-
-        # 获得类中的所有属性
-        config = dict(config.__dict__)
-        config.update(cfg)
-
-    # 只保留大写的属性
-    config = dict(filter(lambda i: i[0].isupper(), config.items()))
-    return config
+from operator import is_
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+_MISSING = object()
+
+# 模块 -> (属性名列表, 属性值列表, 解析结果)
+_module_cache: "WeakKeyDictionary[ModuleType, Tuple[List[str], List[Any], Dict[str, Any]]]" = WeakKeyDictionary()
+
+
+def _parse_names(config, names: Iterable[str]) -> Dict[str, Any]:
+    """只解析允许列表中的属性 ."""
+    result = {}
+    for key in names:
+        if key.isupper():
+            value = getattr(config, key, _MISSING)
+            if value is not _MISSING:
+                result[key] = value
+    return result
+
+
+def _parse_namespace(config) -> Dict[str, Any]:
+    """一次遍历获得对象的所有大写属性 ."""
+    result = {key: value for key, value in vars(config).items() if key.isupper()}
+    if not isinstance(config, type):
+        # 对象/模块还需要获得类中定义的属性
+        for key in type(config).__dict__:
+            if key.isupper():
+                result[key] = getattr(config, key)
+    return result
+
+
+def _parse_module(module: ModuleType) -> Dict[str, Any]:
+    """模块的属性没有变化时复用上次的解析结果
+
+    按顺序比较属性名和属性值的标识，属性被修改、替换或删除后重新解析；
+    缓存持有所有属性值，属性值不会被回收，也就不会出现标识被新对象复用的情况。
+    """
+    namespace = vars(module)
+    cached = _module_cache.get(module)
+    if cached is not None:
+        keys, values, result = cached
+        if keys == list(namespace) and all(map(is_, values, namespace.values())):
+            return dict(result)
+    # 先保存属性再解析，解析期间属性被修改时下次调用会重新解析
+    keys, values = list(namespace), list(namespace.values())
+    result = _parse_namespace(module)
+    _module_cache[module] = (keys, values, result)
+    return dict(result)
+
+
+def parse_config_from_object(config, allow: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """获得对象/模块/类/字典中的所有大写属性
+
+    :param allow: 只解析允许列表中的属性（例如模块的 __all__），默认解析所有大写属性
+    对象/类的属性可以随时被修改，每次调用都会重新解析；模块的解析结果按模块缓存，属性没有变化时直接复用。
+    """
+    if isinstance(config, dict):
+        if allow is not None:
+            return {key: config[key] for key in allow if key.isupper() and key in config}
+        return {key: value for key, value in config.items() if key.isupper()}
+    if allow is not None:
+        return _parse_names(config, allow)
+    if type(config) is ModuleType:
+        return _parse_module(config)
+    return _parse_namespace(config)
+
+
+def _copy_value(value):
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _copy_value(item) for key, item in value.items()}
+    if value_type is list:
+        return [_copy_value(item) for item in value]
+    if value_type is set:
+        return set(value)
+    return value
+
+
+def copy_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """复制缓存的配置，嵌套的 dict/list/set 也会被复制，调用方可以安全地原地修改
+
+    只复制内置的容器类型，其他对象（模块、函数、自定义对象等）仍然共享。
+    """
+    return {key: _copy_value(value) for key, value in config.items()}
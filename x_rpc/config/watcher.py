@@ -0,0 +1,134 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from x_rpc.utils.module import get_file_signature
+
+logger = logging.getLogger(__name__)
+
+# inotify 事件
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+# 文件变化后等待写入完成的时间
+DEBOUNCE_INTERVAL = 0.05
+
+
+class Inotify:
+    """基于 ctypes 的 inotify 封装，监听目录中文件的变化 ."""
+
+    def __init__(self, fd: int, libc):
+        self.fd = fd
+        self._libc = libc
+
+    @classmethod
+    def create(cls) -> Optional["Inotify"]:
+        """创建 inotify 实例，非 Linux 系统或不支持时返回 None ."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(fd, libc)
+
+    def add_watch(self, directory: str) -> bool:
+        return self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) >= 0
+
+    def wait(self, timeout: float) -> Set[str]:
+        """等待文件变化事件，返回发生变化的文件名 ."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return set()
+        names = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, _, _, name_size = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            names.add(os.fsdecode(data[offset:offset + name_size].rstrip(b"\0")))
+            offset += name_size
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ConfigWatcher(threading.Thread):
+    """在后台线程中监听配置文件，文件变化后调用回调函数重新加载配置
+
+    Linux 上使用 inotify 监听文件所在目录，其他系统按间隔轮询文件的修改时间和大小。
+    """
+
+    def __init__(self, paths: Iterable[str], callback: Callable[[], None], interval: float = 1.0):
+        super().__init__(name="config-watcher", daemon=True)
+        self.paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+        self.callback = callback
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._signatures = self._get_signatures()
+
+    def _get_signatures(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        signatures = {}
+        for path in self.paths:
+            try:
+                signatures[path] = get_file_signature(path)
+            except OSError:
+                signatures[path] = None
+        return signatures
+
+    def check(self) -> bool:
+        """检查文件是否发生变化，变化后调用回调函数 ."""
+        signatures = self._get_signatures()
+        if signatures == self._signatures:
+            return False
+        self._signatures = signatures
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("reload config failed")
+        return True
+
+    def run(self) -> None:
+        inotify = Inotify.create()
+        if inotify is not None and not all(inotify.add_watch(os.path.dirname(path)) for path in self.paths):
+            inotify.close()
+            inotify = None
+        names = {os.path.basename(path) for path in self.paths}
+        try:
+            while not self._stopped.is_set():
+                if inotify is None:
+                    self._stopped.wait(self.interval)
+                elif not names.intersection(inotify.wait(self.interval)):
+                    continue
+                else:
+                    # 合并写文件过程中连续产生的事件
+                    while inotify.wait(DEBOUNCE_INTERVAL):
+                        pass
+                if not self._stopped.is_set():
+                    self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
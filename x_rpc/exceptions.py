@@ -1,8 +1,9 @@
 from enum import IntEnum, unique
-from typing import Any, Dict, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type, Union
 
 from x_rpc.standard import status
-from x_rpc.standard.http import STATUS_CODES
+from x_rpc.standard.http import STATUS_MESSAGES
 
 
 @unique
@@ -57,6 +58,7 @@ class BusinessException(XRPCBaseException):
 
 class HttpException(XRPCBaseException):
     message: str = ""
+    status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
 
     def __init__(self,
                  message: Optional[Union[str, bytes]] = None,
@@ -72,8 +74,7 @@ class HttpException(XRPCBaseException):
                 message = self.message
             elif status_code is not None:
                 # HTTP错误标准信息
-                msg: bytes = STATUS_CODES.get(status_code, b"")
-                message = msg.decode("utf8")
+                message = STATUS_MESSAGES.get(status_code, "")
         # HTTP状态码
         if status_code is not None:
             self.status_code = status_code
@@ -106,7 +107,9 @@ class MethodNotSupported(HttpException):
     def __init__(self, message, method, allowed_methods):
         super().__init__(message)
         self.method = method
-        self.headers = {"Allow": ", ".join(allowed_methods)}
+        # 可以直接传入预先生成的 Allow 响应头
+        allow = allowed_methods if isinstance(allowed_methods, str) else ", ".join(allowed_methods)
+        self.headers = {"Allow": allow}
 
 
 class ServerError(HttpException):
@@ -147,6 +150,14 @@ class FileNotFound(NotFound):
         self.relative_url = relative_url
 
 
+class TooManyRequests(HttpException):
+    """
+    **Status**: 429 Too Many Requests
+    """
+
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+
+
 class RequestTimeout(HttpException):
     """The Web server (running the Web site) thinks that there has been too
     long an interval of time between 1) the establishment of an IP
@@ -257,14 +268,28 @@ class Unauthorized(HttpException):
 
         # if auth-scheme is specified, set "WWW-Authenticate" header
         if scheme is not None:
-            values = ['{!s}="{!s}"'.format(k, v) for k, v in kwargs.items()]
-            challenge = ", ".join(values)
-
             self.headers = {
-                "WWW-Authenticate": f"{scheme} {challenge}".rstrip()
+                "WWW-Authenticate": _get_authenticate_header(scheme, tuple(kwargs.items()))
             }
 
 
+def _format_authenticate_header(scheme: str, params: Tuple[Tuple[str, Any], ...]) -> str:
+    """生成 WWW-Authenticate 响应头 ."""
+    challenge = ", ".join('{!s}="{!s}"'.format(k, v) for k, v in params)
+    return f"{scheme} {challenge}".rstrip()
+
+
+_cached_authenticate_header = lru_cache(maxsize=128)(_format_authenticate_header)
+
+
+def _get_authenticate_header(scheme: str, params: Tuple[Tuple[str, Any], ...]) -> str:
+    """相同的参数只格式化一次，参数值不可哈希时不缓存 ."""
+    try:
+        return _cached_authenticate_header(scheme, params)
+    except TypeError:
+        return _format_authenticate_header(scheme, params)
+
+
 class LoadFileException(HttpException):
     pass
 
@@ -275,3 +300,50 @@ class InvalidSignal(HttpException):
 
 class WebsocketClosed(HttpException):
     message = "Client has closed the websocket connection"
+
+
+class ErrorResponse:
+    """预先编码的错误响应 ."""
+
+    __slots__ = ("exception", "exception_type", "code", "body")
+
+    def __init__(self, exception: XRPCBaseException):
+        # 预先创建的异常实例，只用于生成响应，不能修改也不应该被抛出
+        self.exception = exception
+        self.exception_type = exception.exception_type
+        self.code = exception.code
+        # 没有错误信息时使用HTTP状态码的标准描述
+        self.body = (exception.message or STATUS_MESSAGES.get(exception.code, "")).encode("utf8")
+
+
+# 异常类 -> 错误响应
+_error_responses: Dict[Type[XRPCBaseException], ErrorResponse] = {}
+# (ErrorType, code) -> 错误响应
+_error_responses_by_code: Dict[Tuple[int, int], ErrorResponse] = {}
+
+
+def get_error_response(exc_class: Type[XRPCBaseException]) -> ErrorResponse:
+    """获得异常类对应的预先编码的错误响应
+
+    过载保护等预期内的控制流错误不需要抛出异常，直接写入预先编码的错误响应，
+    避免每次创建异常对象、捕获调用栈和编码错误信息；相同 (ErrorType, code) 的异常类共享一个错误响应。
+    异常类必须可以不带参数创建。
+    """
+    response = _error_responses.get(exc_class)
+    if response is None:
+        exception = exc_class()
+        key = (exception.exception_type, exception.code)
+        response = _error_responses_by_code.setdefault(key, ErrorResponse(exception))
+        _error_responses[exc_class] = response
+    return response
+
+
+def find_error_response(exc: XRPCBaseException) -> Optional[ErrorResponse]:
+    """获得与已抛出的异常内容相同的预先编码的错误响应
+
+    只查找已经通过 get_error_response 预先创建过错误响应的异常类，错误码和错误信息都相同时才返回。
+    """
+    response = _error_responses.get(type(exc))
+    if response is not None and response.code == exc.code and response.exception.message == exc.message:
+        return response
+    return None
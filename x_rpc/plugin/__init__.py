@@ -1,6 +1,29 @@
-from x_rpc.plugin.exceptions import PluginException, PluginTypeNotFound  # noqa: F401
-from x_rpc.plugin.helper import register_plugin_instance  # noqa: F401
-from x_rpc.plugin.helper import get_plugin_instance, load_plugins, register_plugin  # noqa: F401
-from x_rpc.plugin.metaclass import PluginMeta, PluginRegister  # noqa: F401
-from x_rpc.plugin.plugin import Plugin  # noqa: F401
-from x_rpc.plugin.ptype import PluginType  # noqa: F401
+from x_rpc.utils.lazy import lazy_exports
+
+# 导出名称 -> 所在模块，第一次访问时才导入模块
+_EXPORTS = {
+    "discover_entry_points": "x_rpc.plugin.discovery",
+    "load_plugin_manifest": "x_rpc.plugin.discovery",
+    "register_lazy_plugin": "x_rpc.plugin.discovery",
+    "PluginException": "x_rpc.plugin.exceptions",
+    "PluginStoreFrozen": "x_rpc.plugin.exceptions",
+    "PluginTypeNotFound": "x_rpc.plugin.exceptions",
+    "freeze_plugins": "x_rpc.plugin.helper",
+    "get_plugin": "x_rpc.plugin.helper",
+    "get_plugin_handle": "x_rpc.plugin.helper",
+    "get_plugin_instance": "x_rpc.plugin.helper",
+    "get_plugin_instance_async": "x_rpc.plugin.helper",
+    "load_plugins": "x_rpc.plugin.helper",
+    "register_plugin": "x_rpc.plugin.helper",
+    "register_plugin_instance": "x_rpc.plugin.helper",
+    "PluginMeta": "x_rpc.plugin.metaclass",
+    "PluginRegister": "x_rpc.plugin.metaclass",
+    "Plugin": "x_rpc.plugin.plugin",
+    "PluginType": "x_rpc.plugin.ptype",
+    "PluginHandle": "x_rpc.plugin.store",
+    "PluginStore": "x_rpc.plugin.store",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,89 @@
+"""插件发现，从清单文件或 entry points 中读取插件路径，在第一次获取插件时才导入插件模块
+
+清单文件是一个 JSON 文件，格式为::
+
+    {
+        "CONFIG_PROVIDER": {
+            "1": "x_rpc.config.provider.env_provider:EnvConfigProvider"
+        }
+    }
+
+entry point 的名称格式为 plugin_type.plugin_name，值为 module:attr 。
+数字格式的插件名称会转换为整数，以匹配使用 IntEnum 作为名称的插件。
+"""
+from importlib import import_module
+from pathlib import Path
+from typing import Union
+
+from .exceptions import PluginException
+from .plugin import Plugin
+from .store import DefaultPluginStore
+
+# entry points 分组名
+ENTRY_POINT_GROUP = "x_rpc.plugins"
+
+
+def parse_plugin_name(plugin_name: str) -> Union[str, int]:
+    """数字格式的插件名称转换为整数 ."""
+    return int(plugin_name) if plugin_name.isdigit() else plugin_name
+
+
+def register_lazy_plugin(plugin_type: str, plugin_name: Union[str, int], target: str) -> None:
+    """注册延迟导入的插件 ."""
+    if ":" not in target:
+        raise PluginException(f"invalid plugin target {target}, expected module:attr")
+    # 已经导入的插件不需要延迟导入
+    if DefaultPluginStore.get_plugin(plugin_type, plugin_name) is None:
+        DefaultPluginStore.add_lazy_plugin(plugin_type, plugin_name, target)
+
+
+def load_plugin_manifest(path: Union[str, Path]) -> int:
+    """从清单文件中读取插件路径，返回注册的插件数量 ."""
+    import json
+
+    with open(path, encoding="utf8") as manifest_file:
+        manifest = json.load(manifest_file)
+    count = 0
+    for plugin_type, plugins in manifest.items():
+        for plugin_name, target in plugins.items():
+            register_lazy_plugin(plugin_type, parse_plugin_name(plugin_name), target)
+            count += 1
+    return count
+
+
+def discover_entry_points(group: str = ENTRY_POINT_GROUP) -> int:
+    """从已安装包的 entry points 中读取插件路径，返回注册的插件数量 ."""
+    # importlib.metadata 导入较慢，只在需要时导入
+    from importlib.metadata import entry_points
+
+    eps = entry_points()
+    # python 3.10 之前 entry_points() 返回字典
+    eps = eps.select(group=group) if hasattr(eps, "select") else eps.get(group, ())
+    count = 0
+    for ep in eps:
+        plugin_type, _, plugin_name = ep.name.partition(".")
+        if not plugin_name:
+            raise PluginException(f"invalid entry point name {ep.name}, expected plugin_type.plugin_name")
+        register_lazy_plugin(plugin_type, parse_plugin_name(plugin_name), ep.value)
+        count += 1
+    return count
+
+
+def import_lazy_plugin(plugin_type: str, plugin_name: Union[str, int]):
+    """导入延迟注册的插件模块，返回插件
+
+    模块导入时通过 register_plugin 或 PluginMeta 注册插件；
+    如果模块中的对象没有注册，则使用默认参数将其注册为插件。
+    """
+    target = DefaultPluginStore.get_lazy_plugin(plugin_type, plugin_name)
+    if target is None:
+        return None
+    module_name, _, attr = target.partition(":")
+    obj = import_module(module_name)
+    for name in attr.split("."):
+        obj = getattr(obj, name)
+    plugin = DefaultPluginStore.get_plugin(plugin_type, plugin_name)
+    if plugin is None:
+        plugin = Plugin(obj, plugin_type, plugin_name)
+        DefaultPluginStore.add_plugin(plugin_type, plugin_name, plugin)
+    return plugin
@@ -7,3 +7,7 @@ class PluginException(XRPCException):
 
 class PluginTypeNotFound(PluginException):
     pass
+
+
+class PluginStoreFrozen(PluginException):
+    pass
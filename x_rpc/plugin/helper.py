@@ -1,7 +1,20 @@
-from typing import Callable
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .discovery import import_lazy_plugin
+from .exceptions import PluginException
 from .plugin import Plugin
-from .store import DefaultPluginStore
+from .report import PluginInitReport
+from .store import DefaultPluginStore, PluginHandle
+
+# 插件实例创建锁
+_instance_locks: Dict[Tuple, threading.Lock] = {}
+_instance_locks_lock = threading.Lock()
+# 正在异步创建的插件实例，值为 asyncio.Future
+_pending_instances: Dict[Tuple, Any] = {}
+# 创建实例的协程被取消，等待者需要重新创建
+_RETRY = object()
 
 
 def register_plugin(
@@ -11,16 +24,18 @@ def register_plugin(
     *args,
     **kwargs
 ):
-    """将类/函数注册为一个插件 ."""
+    """将类/函数注册为一个插件
+
+    其余参数在创建插件实例时传给类/函数；插件的依赖和是否是IO密集型的
+    通过类/函数的 plugin_depends 和 plugin_io_bound 属性声明。
+    """
 
     def wrapper(obj: Callable) -> Callable:
         nonlocal plugin_name
         if not plugin_name:
             plugin_name = obj.__name__
         # 将类/函数包装为一个插件
-        plugin = Plugin(
-            obj, plugin_type, plugin_name, can_init_instance, *args, **kwargs
-        )
+        plugin = Plugin(obj, plugin_type, plugin_name, can_init_instance, *args, **kwargs)
         # 将插件添加到仓库
         DefaultPluginStore.add_plugin(plugin_type, plugin_name, plugin)
         return obj
@@ -29,8 +44,11 @@ def register_plugin(
 
 
 def get_plugin(plugin_type: str, plugin_name: str):
-    """从仓库中获取插件 ."""
-    return DefaultPluginStore.get_plugin(plugin_type, plugin_name)
+    """从仓库中获取插件，延迟注册的插件在第一次获取时导入 ."""
+    plugin = DefaultPluginStore.get_plugin(plugin_type, plugin_name)
+    if plugin is None and DefaultPluginStore.lazy_plugins:
+        plugin = import_lazy_plugin(plugin_type, plugin_name)
+    return plugin
 
 
 def register_plugin_instance(
@@ -39,32 +57,223 @@ def register_plugin_instance(
     DefaultPluginStore.add_plugin_instance(plugin_type, plugin_name, plugin_instance)
 
 
+def _get_instance_lock(plugin_type: str, plugin_name: str) -> threading.Lock:
+    """获得插件实例创建锁，每个插件一把锁 ."""
+    key = (plugin_type, plugin_name)
+    lock = _instance_locks.get(key)
+    if lock is None:
+        with _instance_locks_lock:
+            lock = _instance_locks.setdefault(key, threading.Lock())
+    return lock
+
+
+def _cache_plugin_instance(plugin_type: str, plugin_name: str, plugin_instance):
+    """缓存插件实例，如果其他线程已经创建了实例则使用已有的实例 ."""
+    with _get_instance_lock(plugin_type, plugin_name):
+        cached_instance = DefaultPluginStore.get_plugin_instance(plugin_type, plugin_name)
+        if cached_instance is not None:
+            return cached_instance
+        DefaultPluginStore.add_plugin_instance(plugin_type, plugin_name, plugin_instance)
+    return plugin_instance
+
+
 def get_plugin_instance(plugin_type: str, plugin_name: str):
     """懒加载的方式获得插件，如果没有则创建，是一个单例模式 ."""
-    # 从缓存中获取插件实例
+    # 从缓存中获取插件实例，已创建的实例不需要加锁
     plugin_instance = DefaultPluginStore.get_plugin_instance(plugin_type, plugin_name)
-    if not plugin_instance:
-        # 从缓存中获取插件类
-        plugin = get_plugin(plugin_type, plugin_name)
-        if not plugin:
-            return None
-        # 创建插件实例
-        plugin_instance = plugin.create_instance()
-        # 缓存插件实例
-        DefaultPluginStore.add_plugin_instance(
-            plugin_type, plugin_name, plugin_instance
+    if plugin_instance is not None:
+        return plugin_instance
+    # 从缓存中获取插件类
+    plugin = get_plugin(plugin_type, plugin_name)
+    if not plugin:
+        return None
+    if plugin.is_async:
+        raise PluginException(
+            f"plugin {plugin_type}:{plugin_name} has an async factory, use get_plugin_instance_async"
         )
+    # 双重检查，保证多个线程同时获取时只创建一次插件实例
+    with _get_instance_lock(plugin_type, plugin_name):
+        plugin_instance = DefaultPluginStore.get_plugin_instance(plugin_type, plugin_name)
+        if plugin_instance is None:
+            # 创建插件实例
+            plugin_instance = plugin.create_instance()
+            # 缓存插件实例
+            DefaultPluginStore.add_plugin_instance(plugin_type, plugin_name, plugin_instance)
     return plugin_instance
 
 
-def load_plugins():
+async def get_plugin_instance_async(plugin_type: str, plugin_name: str):
+    """get_plugin_instance 的协程版本，支持异步创建插件实例，并发获取时只创建一次
+
+    同步创建的插件直接使用 get_plugin_instance，与同步调用方共用同一把线程锁；
+    创建实例的协程被取消后，等待的协程重新尝试创建，不会收到取消异常。
+    """
+    # 延迟导入，减少 x_rpc.plugin 的导入耗时
+    import asyncio
+    import inspect
+
+    plugin_instance = DefaultPluginStore.get_plugin_instance(plugin_type, plugin_name)
+    if plugin_instance is not None:
+        return plugin_instance
+    plugin = get_plugin(plugin_type, plugin_name)
+    if not plugin:
+        return None
+    if not plugin.is_async:
+        return get_plugin_instance(plugin_type, plugin_name)
+    key = (plugin_type, plugin_name)
+    pending = _pending_instances.get(key)
+    while pending is not None:
+        # 其他协程正在创建插件实例，创建成功时实例在唤醒等待者之前已经缓存
+        plugin_instance = await asyncio.shield(pending)
+        if plugin_instance is not _RETRY:
+            return plugin_instance
+        # 创建的协程被取消，第一个醒来的等待者重新创建
+        pending = _pending_instances.get(key)
+
+    pending = _pending_instances[key] = asyncio.get_running_loop().create_future()
+    try:
+        plugin_instance = plugin.create_instance()
+        if inspect.isawaitable(plugin_instance):
+            plugin_instance = await plugin_instance
+        plugin_instance = _cache_plugin_instance(plugin_type, plugin_name, plugin_instance)
+    except asyncio.CancelledError:
+        # 只取消当前协程，通知等待者重新创建
+        pending.set_result(_RETRY)
+        raise
+    except BaseException as exc:
+        pending.set_exception(exc)
+        # 避免没有其他等待者时出现未获取异常的警告
+        pending.exception()
+        raise
+    else:
+        pending.set_result(plugin_instance)
+    finally:
+        del _pending_instances[key]
+    return plugin_instance
+
+
+def get_plugin_handle(plugin_type: str, plugin_name: str) -> PluginHandle:
+    """获得插件实例句柄，在启动时解析一次，之后通过 handle.instance 获取插件实例 ."""
+    get_plugin_instance(plugin_type, plugin_name)
+    return DefaultPluginStore.get_plugin_handle(plugin_type, plugin_name)
+
+
+def freeze_plugins() -> None:
+    """启动完成后冻结插件仓库，冻结前创建所有可以实例化的插件实例 ."""
+    load_plugins()
+    DefaultPluginStore.freeze()
+
+
+def _check_depend(key: Tuple, depend: Tuple) -> None:
+    """检查不需要由 load_plugins 初始化的依赖 ."""
+    if DefaultPluginStore.get_plugin_instance(*depend) is not None:
+        return
+    plugin = get_plugin(*depend)
+    if plugin is None:
+        raise PluginException(f"plugin {key[0]}:{key[1]} depends on unknown plugin {depend[0]}:{depend[1]}")
+    if plugin.is_async:
+        raise PluginException(
+            f"plugin {key[0]}:{key[1]} depends on async plugin {depend[0]}:{depend[1]}, "
+            "create it with get_plugin_instance_async before load_plugins"
+        )
+    # 不需要实例化的插件只要已经注册即可
+
+
+def _sort_plugins(plugins: Dict[Tuple, Plugin]) -> Tuple[Dict[Tuple, List[Tuple]], Dict[Tuple, int]]:
+    """根据插件依赖构建有向无环图，返回每个插件的下游插件和未完成的依赖数 ."""
+    dependents: Dict[Tuple, List[Tuple]] = {key: [] for key in plugins}
+    indegrees: Dict[Tuple, int] = {}
+    for key, plugin in plugins.items():
+        indegree = 0
+        for depend in plugin.depends:
+            if depend in plugins:
+                dependents[depend].append(key)
+                indegree += 1
+            else:
+                _check_depend(key, depend)
+        indegrees[key] = indegree
+
+    # 检查循环依赖
+    remaining = dict(indegrees)
+    ready = [key for key, indegree in remaining.items() if not indegree]
+    visited = 0
+    while ready:
+        key = ready.pop()
+        visited += 1
+        for dependent in dependents[key]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                ready.append(dependent)
+    if visited != len(plugins):
+        cycle = ", ".join(f"{key[0]}:{key[1]}" for key, indegree in remaining.items() if indegree)
+        raise PluginException(f"plugins have circular dependencies: {cycle}")
+    return dependents, indegrees
+
+
+def _init_plugin(plugin: Plugin) -> float:
+    """创建并缓存插件实例，返回初始化耗时 ."""
+    start = perf_counter()
+    plugin_instance = plugin.create_instance()
+    _cache_plugin_instance(plugin.type, plugin.name, plugin_instance)
+    return perf_counter() - start
+
+
+def _get_init_plugins() -> Dict[Tuple, Plugin]:
+    """获得所有需要初始化的插件 ."""
+    plugins: Dict[Tuple, Plugin] = {}
     # 遍历所有插件类型
-    for plugin_type, plugins in DefaultPluginStore.get_all_plugin().items():
+    for plugin_type, type_plugins in DefaultPluginStore.get_all_plugin().items():
         # 遍历所有的插件类
-        for plugin_name, plugin_cls in plugins.items():
+        for plugin_name, plugin in type_plugins.items():
             # 判断插件类是否可以实例化
-            if plugin_cls.can_init_instance:
-                # 创建插件实例
-                plugin_instance = plugin_cls.cls()
-                # 缓冲插件实例
-                register_plugin_instance(plugin_type, plugin_name, plugin_instance)
+            if not plugin.can_init_instance or plugin.is_async:
+                continue
+            # 已经创建的实例不再重复创建
+            if DefaultPluginStore.get_plugin_instance(plugin_type, plugin_name) is None:
+                plugins[(plugin_type, plugin_name)] = plugin
+    return plugins
+
+
+def load_plugins(max_workers: Optional[int] = None) -> PluginInitReport:
+    """按依赖顺序初始化所有可以实例化的插件
+
+    没有依赖关系的IO密集型插件在线程池中并发初始化，其余插件在当前线程中初始化；
+    异步创建的插件需要使用 get_plugin_instance_async 获取，这里不做初始化。
+
+    :return: 每个插件的初始化耗时报告
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    plugins = _get_init_plugins()
+    report = PluginInitReport()
+    dependents, indegrees = _sort_plugins(plugins)
+    ready = [key for key, indegree in indegrees.items() if not indegree]
+    start = perf_counter()
+
+    def on_done(key):
+        for dependent in dependents[key]:
+            indegrees[dependent] -= 1
+            if not indegrees[dependent]:
+                ready.append(dependent)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="load_plugins") as executor:
+        running = {}
+        while ready or running:
+            while ready:
+                key = ready.pop()
+                plugin = plugins[key]
+                if plugin.io_bound:
+                    running[executor.submit(_init_plugin, plugin)] = key
+                else:
+                    report.add(plugin.type, plugin.name, _init_plugin(plugin), plugin.io_bound)
+                    on_done(key)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                plugin = plugins[key]
+                report.add(plugin.type, plugin.name, future.result(), plugin.io_bound)
+                on_done(key)
+    report.total = perf_counter() - start
+    return report
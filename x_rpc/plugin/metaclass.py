@@ -28,7 +28,7 @@ class PluginMeta(type):
         register_ignore = getattr(new_class, "register_ignore", False)
         # 创建插件类
         if not register_ignore:
-            # 将类包装为一个插件
+            # 将类包装为一个插件，依赖和是否是IO密集型的从类属性 plugin_depends 和 plugin_io_bound 获得
             plugin = Plugin(new_class, plugin_type, plugin_name)
             # 将插件添加到仓库
             DefaultPluginStore.add_plugin(plugin_type, plugin_name, plugin)
@@ -16,9 +16,25 @@ class Plugin:
         self.type = plugin_type
         # 对象可以初始化
         self.can_init_instance = can_init_instance
+        # 依赖的插件 (plugin_type, plugin_name)，加载插件时先初始化依赖的插件，通过类/函数的 plugin_depends 属性声明
+        self.depends = tuple(tuple(depend) for depend in getattr(cls, "plugin_depends", ()))
+        # 初始化是否是IO密集型的，加载插件时在线程池中并发初始化，通过类/函数的 plugin_io_bound 属性声明
+        self.io_bound = bool(getattr(cls, "plugin_io_bound", False))
         self.args = args
         self.kwargs = kwargs
 
-    def create_instance(self):
-        """创建插件实例 ."""
+    @property
+    def is_async(self) -> bool:
+        """是否是异步创建插件实例 ."""
+        # 大部分插件是类，不需要导入 inspect 模块
+        if isinstance(self._cls, type):
+            return False
+        import inspect
+
+        return inspect.iscoroutinefunction(self._cls)
+
+    def create_instance(self, *args, **kwargs):
+        """创建插件实例，额外的参数追加到注册插件时的参数之后 ."""
+        if args or kwargs:
+            return self._cls(*self.args, *args, **{**self.kwargs, **kwargs})
         return self._cls(*self.args, **self.kwargs)
@@ -0,0 +1,38 @@
+from typing import List
+
+
+class PluginInitRecord:
+    __slots__ = ("plugin_type", "plugin_name", "elapsed", "io_bound")
+
+    def __init__(self, plugin_type, plugin_name, elapsed: float, io_bound: bool):
+        self.plugin_type = plugin_type
+        self.plugin_name = plugin_name
+        # 初始化耗时（秒）
+        self.elapsed = elapsed
+        self.io_bound = io_bound
+
+
+class PluginInitReport:
+    """插件初始化耗时报告 ."""
+
+    def __init__(self):
+        self.records: List[PluginInitRecord] = []
+        # 加载所有插件的总耗时（秒）
+        self.total = 0.0
+
+    def add(self, plugin_type, plugin_name, elapsed: float, io_bound: bool = False) -> None:
+        self.records.append(PluginInitRecord(plugin_type, plugin_name, elapsed, io_bound))
+
+    def get_slowest(self, count: int = 10) -> List[PluginInitRecord]:
+        """获得初始化最慢的插件 ."""
+        return sorted(self.records, key=lambda record: record.elapsed, reverse=True)[:count]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __str__(self):
+        lines = [f"loaded {len(self.records)} plugins in {self.total * 1000:.2f}ms"]
+        for record in self.get_slowest(len(self.records)):
+            mode = "io" if record.io_bound else "cpu"
+            lines.append(f"{record.elapsed * 1000:10.2f}ms  {mode:<3}  {record.plugin_type}:{record.plugin_name}")
+        return "\n".join(lines)
@@ -1,31 +1,117 @@
+from types import MappingProxyType
 from typing import Dict
 
+from .exceptions import PluginStoreFrozen
+
+
+class PluginHandle:
+    """预先解析的插件实例句柄，通过 handle.instance 直接获得插件实例 ."""
+
+    __slots__ = ("plugin_type", "plugin_name", "instance")
+
+    def __init__(self, plugin_type, plugin_name, instance=None):
+        self.plugin_type = plugin_type
+        self.plugin_name = plugin_name
+        self.instance = instance
+
+    def __repr__(self):
+        return f"<PluginHandle {self.plugin_type}:{self.plugin_name} instance={self.instance!r}>"
+
 
 class PluginStore:
-    __slots__ = ("plugins", "plugin_instances")
+    __slots__ = ("plugins", "plugin_instances", "handles", "lazy_plugins", "frozen")
 
     def __init__(self):
         self.plugins = {}  # 存放所有的插件
+        self.lazy_plugins = {}  # 存放还未导入的插件，(plugin_type, plugin_name) -> "module:attr"
         self.plugin_instances = {}  # 存放所有的插件实例化对象，一个插件只有一个实例化对象
+        self.handles = {}  # 存放所有的插件实例句柄
+        # 冻结后不允许注册新的插件和替换已有的插件实例，只允许导入延迟注册的插件和第一次创建插件实例
+        self.frozen = False
 
     def add_plugin(self, plugin_type, plugin_name, plugin_class) -> None:
         """注册插件类 ."""
+        if self.frozen and (plugin_type, plugin_name) not in self.lazy_plugins:
+            raise PluginStoreFrozen(f"plugin store is frozen, can not register plugin {plugin_type}:{plugin_name}")
         self.plugins.setdefault(plugin_type, {})[plugin_name] = plugin_class
 
     def get_plugin(self, plugin_type, plugin_name):
         """获得已注册的插件类 ."""
-        return self.plugins.get(plugin_type, {}).get(plugin_name)
+        plugins = self.plugins.get(plugin_type)
+        if plugins is None:
+            return None
+        return plugins.get(plugin_name)
+
+    def add_lazy_plugin(self, plugin_type, plugin_name, target: str) -> None:
+        """注册延迟导入的插件，target 的格式为 module:attr ."""
+        if self.frozen:
+            raise PluginStoreFrozen(f"plugin store is frozen, can not register plugin {plugin_type}:{plugin_name}")
+        self.lazy_plugins[(plugin_type, plugin_name)] = target
+
+    def get_lazy_plugin(self, plugin_type, plugin_name):
+        """获得延迟导入的插件路径 ."""
+        return self.lazy_plugins.get((plugin_type, plugin_name))
+
+    def _can_create_instance(self, plugin_type, plugin_name) -> bool:
+        """冻结后只允许为已注册的插件第一次创建实例 ."""
+        if self.get_plugin_instance(plugin_type, plugin_name) is not None:
+            return False
+        return self.get_plugin(plugin_type, plugin_name) is not None
 
     def add_plugin_instance(self, plugin_type, plugin_name, plugin_instance):
         """注册插件实例 ."""
+        if self.frozen and not self._can_create_instance(plugin_type, plugin_name):
+            raise PluginStoreFrozen(
+                f"plugin store is frozen, can not add plugin instance {plugin_type}:{plugin_name}"
+            )
         self.plugin_instances.setdefault(plugin_type, {})[plugin_name] = plugin_instance
+        # 更新已解析的句柄
+        handle = self.handles.get((plugin_type, plugin_name))
+        if handle is not None:
+            handle.instance = plugin_instance
 
     def get_plugin_instance(self, plugin_type, plugin_name):
         """获得插件实例 ."""
-        return self.plugin_instances.get(plugin_type, {}).get(plugin_name)
+        plugin_instances = self.plugin_instances.get(plugin_type)
+        if plugin_instances is None:
+            return None
+        return plugin_instances.get(plugin_name)
+
+    def get_plugin_handle(self, plugin_type, plugin_name) -> PluginHandle:
+        """获得插件实例句柄，插件实例注册后句柄会自动更新
+
+        冻结时已经为所有插件创建了句柄，冻结后获取未知插件的句柄不会被缓存。
+        """
+        key = (plugin_type, plugin_name)
+        handle = self.handles.get(key)
+        if handle is None:
+            handle = PluginHandle(plugin_type, plugin_name, self.get_plugin_instance(plugin_type, plugin_name))
+            if not self.frozen:
+                self.handles[key] = handle
+        return handle
 
     def get_all_plugin(self) -> Dict:
-        return self.plugins
+        """冻结后返回只读的视图 ."""
+        if not self.frozen:
+            return self.plugins
+        return MappingProxyType(
+            {plugin_type: MappingProxyType(plugins) for plugin_type, plugins in self.plugins.items()}
+        )
+
+    def freeze(self) -> None:
+        """冻结仓库，之后不能注册新的插件，也不能替换已有的插件实例
+
+        冻结前为所有已注册和延迟注册的插件创建句柄，冻结后不再修改句柄表；
+        延迟注册的插件仍然可以在第一次使用时导入，还没有创建的插件实例仍然可以在第一次获取时创建。
+        """
+        if self.frozen:
+            return
+        for plugin_type, plugins in self.plugins.items():
+            for plugin_name in plugins:
+                self.get_plugin_handle(plugin_type, plugin_name)
+        for plugin_type, plugin_name in self.lazy_plugins:
+            self.get_plugin_handle(plugin_type, plugin_name)
+        self.frozen = True
 
 
 DefaultPluginStore = PluginStore()
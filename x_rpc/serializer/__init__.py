@@ -0,0 +1,15 @@
+from .base import BaseSerializer, SerializerType
+from .binary_serializer import BinarySerializer
+from .helper import get_serializer, get_service_name
+from .json_serializer import JsonSerializer
+from .msgpack_serializer import MsgpackSerializer
+
+__all__ = [
+    "BaseSerializer",
+    "BinarySerializer",
+    "JsonSerializer",
+    "MsgpackSerializer",
+    "SerializerType",
+    "get_serializer",
+    "get_service_name",
+]
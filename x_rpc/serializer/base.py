@@ -0,0 +1,30 @@
+from abc import ABCMeta, abstractmethod
+from enum import IntEnum, unique
+from typing import Any, Iterable, List
+
+
+@unique
+class SerializerType(IntEnum):
+    JSON = 1
+    MSGPACK = 2
+    BINARY = 3
+
+
+class BaseSerializer(metaclass=ABCMeta):
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def encode_batch(self, objs: Iterable[Any]) -> List[bytes]:
+        """批量序列化 ."""
+        encode = self.encode
+        return [encode(obj) for obj in objs]
+
+    def decode_batch(self, datas: Iterable[bytes]) -> List[Any]:
+        """批量反序列化 ."""
+        decode = self.decode
+        return [decode(data) for data in datas]
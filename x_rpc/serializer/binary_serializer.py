@@ -0,0 +1,120 @@
+from struct import Struct, error as struct_error
+from typing import Any, Tuple
+
+from x_rpc.plugin import PluginType, register_plugin
+from x_rpc.serializer.base import BaseSerializer, SerializerType
+from x_rpc.serializer.exceptions import SerializerDecodeError, SerializerException
+
+# 类型标记
+TAG_NONE = 0x00
+TAG_TRUE = 0x01
+TAG_FALSE = 0x02
+TAG_INT = 0x03
+TAG_BIG_INT = 0x04
+TAG_FLOAT = 0x05
+TAG_STR = 0x06
+TAG_BYTES = 0x07
+TAG_LIST = 0x08
+TAG_DICT = 0x09
+
+INT64 = Struct("!q")
+FLOAT64 = Struct("!d")
+UINT32 = Struct("!I")
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+# 常量值的类型标记
+_CONSTANT_TAGS = {None: TAG_NONE, True: TAG_TRUE, False: TAG_FALSE}
+_CONSTANT_VALUES = {TAG_NONE: None, TAG_TRUE: True, TAG_FALSE: False}
+
+
+def _encode_sized(tag: int, data: bytes, out: bytearray) -> None:
+    out.append(tag)
+    out += UINT32.pack(len(data))
+    out += data
+
+
+def _encode(obj: Any, out: bytearray) -> None:
+    # 按类型出现频率排序判断
+    obj_type = type(obj)
+    if obj_type is str:
+        _encode_sized(TAG_STR, obj.encode("utf8"), out)
+    elif obj_type is int:
+        if INT64_MIN <= obj <= INT64_MAX:
+            out.append(TAG_INT)
+            out += INT64.pack(obj)
+        else:
+            _encode_sized(TAG_BIG_INT, obj.to_bytes((obj.bit_length() + 8) // 8, "big", signed=True), out)
+    elif obj is None or obj_type is bool:
+        out.append(_CONSTANT_TAGS[obj])
+    elif obj_type is float:
+        out.append(TAG_FLOAT)
+        out += FLOAT64.pack(obj)
+    elif obj_type is dict:
+        out.append(TAG_DICT)
+        out += UINT32.pack(len(obj))
+        for key, value in obj.items():
+            _encode(key, out)
+            _encode(value, out)
+    elif obj_type is list or obj_type is tuple:
+        out.append(TAG_LIST)
+        out += UINT32.pack(len(obj))
+        for item in obj:
+            _encode(item, out)
+    elif obj_type is bytes or obj_type is bytearray:
+        _encode_sized(TAG_BYTES, obj, out)
+    else:
+        raise SerializerException(f"unsupported type {obj_type.__name__}")
+
+
+def _decode(data: bytes, offset: int) -> Tuple[Any, int]:
+    tag = data[offset]
+    offset += 1
+    if tag in _CONSTANT_VALUES:
+        return _CONSTANT_VALUES[tag], offset
+    if tag == TAG_INT:
+        return INT64.unpack_from(data, offset)[0], offset + 8
+    if tag == TAG_FLOAT:
+        return FLOAT64.unpack_from(data, offset)[0], offset + 8
+    if tag > TAG_DICT:
+        raise SerializerDecodeError(f"unknown type tag {tag:#x}")
+    # 其余类型都以长度或元素个数开头
+    (size,) = UINT32.unpack_from(data, offset)
+    offset += 4
+    if tag == TAG_STR:
+        return str(data[offset:offset + size], "utf8"), offset + size
+    if tag == TAG_DICT:
+        result = {}
+        for _ in range(size):
+            key, offset = _decode(data, offset)
+            result[key], offset = _decode(data, offset)
+        return result, offset
+    if tag == TAG_LIST:
+        items = []
+        for _ in range(size):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == TAG_BYTES:
+        return bytes(data[offset:offset + size]), offset + size
+    return int.from_bytes(data[offset:offset + size], "big", signed=True), offset + size
+
+
+@register_plugin(PluginType.SERIALIZER, SerializerType.BINARY)
+class BinarySerializer(BaseSerializer):
+    """带类型标记的二进制序列化，不使用 pickle，支持 bytes 类型 ."""
+
+    def encode(self, obj: Any) -> bytes:
+        out = bytearray()
+        _encode(obj, out)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            obj, offset = _decode(data, 0)
+        except (IndexError, ValueError, struct_error) as exc:
+            raise SerializerDecodeError("truncated binary data") from exc
+        if offset != len(data):
+            raise SerializerDecodeError("trailing data after binary object")
+        return obj
@@ -0,0 +1,13 @@
+from x_rpc.exceptions import InvalidUsage, XRPCException
+
+
+class SerializerException(XRPCException):
+    pass
+
+
+class SerializerNotFound(SerializerException):
+    pass
+
+
+class SerializerDecodeError(SerializerException, InvalidUsage):
+    """请求体无法反序列化，返回 400 Bad Request ."""
@@ -0,0 +1,40 @@
+from typing import Optional, Union
+
+from x_rpc.plugin import PluginType, get_plugin_instance
+from x_rpc.serializer.base import BaseSerializer, SerializerType
+from x_rpc.serializer.exceptions import SerializerNotFound
+
+
+def get_service_name(method: str) -> str:
+    """获得方法所属的服务名，方法名的格式为 service.method ."""
+    return method.split(".", 1)[0] if "." in method else ""
+
+
+def get_serializer_type(name: Union[str, int, SerializerType]) -> SerializerType:
+    """将配置中的序列化名称或编号转换为序列化类型 ."""
+    if isinstance(name, str):
+        try:
+            return SerializerType[name.upper()]
+        except KeyError:
+            raise SerializerNotFound(f"serializer {name} not found")
+    try:
+        return SerializerType(name)
+    except ValueError:
+        raise SerializerNotFound(f"serializer {name} not found")
+
+
+def get_serializer(config, service: Optional[str] = None) -> BaseSerializer:
+    """根据配置获得服务的序列化插件
+
+    优先使用服务级别的配置 <SERVICE>_SERIALIZER，其次使用全局配置 SERIALIZER，默认使用JSON
+    """
+    name = None
+    if service:
+        name = config.get(f"{service.upper()}_SERIALIZER")
+    if name is None:
+        name = config.get("SERIALIZER", SerializerType.JSON)
+    serializer_type = get_serializer_type(name)
+    serializer = get_plugin_instance(PluginType.SERIALIZER, serializer_type)
+    if serializer is None:
+        raise SerializerNotFound(f"serializer {serializer_type.name} not registered")
+    return serializer
@@ -0,0 +1,30 @@
+import json
+from typing import Any, Iterable, List
+
+from x_rpc.plugin import PluginType, register_plugin
+from x_rpc.serializer.base import BaseSerializer, SerializerType
+from x_rpc.serializer.exceptions import SerializerDecodeError
+
+
+@register_plugin(PluginType.SERIALIZER, SerializerType.JSON)
+class JsonSerializer(BaseSerializer):
+    """JSON序列化，默认的序列化方式 ."""
+
+    def __init__(self, *args, **kwargs):
+        # 预先创建编解码器，避免 json.dumps 每次调用时检查参数
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._decode = json.JSONDecoder().decode
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encode(obj).encode("utf8")
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return self._decode(data.decode("utf8"))
+        except ValueError as exc:
+            # 包括 JSONDecodeError 和 UnicodeDecodeError
+            raise SerializerDecodeError(f"invalid json payload: {exc}") from exc
+
+    def encode_batch(self, objs: Iterable[Any]) -> List[bytes]:
+        encode = self._encode
+        return [encode(obj).encode("utf8") for obj in objs]
@@ -0,0 +1,38 @@
+from typing import Any, Iterable, List
+
+from x_rpc.plugin import PluginType, register_plugin
+from x_rpc.serializer.base import BaseSerializer, SerializerType
+from x_rpc.serializer.exceptions import SerializerDecodeError, SerializerException
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+class MsgpackSerializer(BaseSerializer):
+    """msgpack序列化，需要安装 msgpack ."""
+
+    def __init__(self, *args, **kwargs):
+        if msgpack is None:
+            raise SerializerException("msgpack serializer requires the msgpack package")
+        self._packer = msgpack.Packer(use_bin_type=True)
+
+    def encode(self, obj: Any) -> bytes:
+        return self._packer.pack(obj)
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except (msgpack.UnpackException, ValueError, TypeError) as exc:
+            # 不完整的数据、多余的数据、非法的 UTF-8 字符串和不可哈希的键
+            raise SerializerDecodeError(f"invalid msgpack payload: {exc}") from exc
+
+    def encode_batch(self, objs: Iterable[Any]) -> List[bytes]:
+        pack = self._packer.pack
+        return [pack(obj) for obj in objs]
+
+
+# 只有安装了 msgpack 才注册插件
+if msgpack is not None:
+    register_plugin(PluginType.SERIALIZER, SerializerType.MSGPACK)(MsgpackSerializer)
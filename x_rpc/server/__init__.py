@@ -0,0 +1,3 @@
+from x_rpc.server.server import Server
+
+__all__ = ["Server"]
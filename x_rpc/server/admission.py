@@ -0,0 +1,174 @@
+"""准入控制和自适应过载保护
+
+- 全局和每个处理函数分别限制正在处理的请求数，超过全局限制返回 503，超过处理函数的限制返回 429
+- 并发限制使用 AIMD 算法根据请求耗时自适应调整：耗时超过基线耗时的一定倍数时乘性减小，并发被充分利用时加性增大；
+  基线耗时是观测到的请求耗时的指数加权移动平均，处理本身就比较慢的函数不会因为耗时长而被一直限流
+- 定期测量事件循环的调度延迟作为排队延迟，排队延迟过大时直接拒绝新的请求
+
+准入判断在反序列化和执行处理函数之前完成，拒绝请求时写入预先编码的错误响应。
+"""
+import asyncio
+from typing import Callable, Dict, Optional, Type
+
+from x_rpc.exceptions import ServiceUnavailable, TooManyRequests, XRPCBaseException
+from x_rpc.server.constants import (
+    DEFAULT_SERVER_LATENCY_THRESHOLD,
+    DEFAULT_SERVER_LATENCY_TOLERANCE,
+    DEFAULT_SERVER_MAX_QUEUE_DELAY,
+    DEFAULT_SERVER_METHOD_MAX_IN_FLIGHT,
+)
+
+# 测量事件循环调度延迟的间隔（秒）
+PROBE_INTERVAL = 0.05
+# 耗时低于基线时的平滑系数，基线较快地回落，接近无负载时的耗时
+BASELINE_DECREASE_SMOOTHING = 0.1
+# 耗时高于基线时的平滑系数，基线大约跟随最近一千个请求缓慢上升，
+# 逐渐变慢的过载不会被基线吸收，处理函数持续变慢后基线最终也能跟上，并发限制不会一直停留在下限
+BASELINE_INCREASE_SMOOTHING = 0.001
+
+
+class AIMDLimit:
+    """加性增、乘性减的并发限制 ."""
+
+    __slots__ = (
+        "limit", "min_limit", "max_limit", "backoff", "latency_threshold", "latency_tolerance", "baseline", "in_flight"
+    )
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+        latency_threshold: float = DEFAULT_SERVER_LATENCY_THRESHOLD,
+        latency_tolerance: float = DEFAULT_SERVER_LATENCY_TOLERANCE,
+    ):
+        # 从最大并发开始，过载后再减小
+        self.limit = float(max_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        # 耗时超过阈值时的减小比例
+        self.backoff = backoff
+        # 耗时阈值的下限，避免基线耗时很小时正常的抖动也被当作过载
+        self.latency_threshold = latency_threshold
+        # 耗时超过基线耗时的这个倍数时认为过载
+        self.latency_tolerance = latency_tolerance
+        # 基线耗时，收到第一个请求的耗时后初始化
+        self.baseline: Optional[float] = None
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def cancel(self) -> None:
+        """请求没有被处理，只归还配额，不调整并发限制 ."""
+        self.in_flight -= 1
+
+    def release(self, latency: float) -> None:
+        """请求处理完成，根据耗时调整并发限制 ."""
+        in_flight = self.in_flight
+        self.in_flight = in_flight - 1
+        baseline = self.baseline
+        if baseline is None:
+            self.baseline = latency
+            return
+        if latency < baseline:
+            self.baseline = baseline + (latency - baseline) * BASELINE_DECREASE_SMOOTHING
+        else:
+            self.baseline = baseline + (latency - baseline) * BASELINE_INCREASE_SMOOTHING
+        if latency > max(self.latency_threshold, baseline * self.latency_tolerance):
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        elif in_flight * 2 >= self.limit:
+            # 每处理完 limit 个请求并发限制加一
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionController:
+    """服务端准入控制器 ."""
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        method_max_in_flight: int = DEFAULT_SERVER_METHOD_MAX_IN_FLIGHT,
+        max_queue_delay: float = DEFAULT_SERVER_MAX_QUEUE_DELAY,
+        latency_threshold: float = DEFAULT_SERVER_LATENCY_THRESHOLD,
+        min_limit: int = 1,
+        latency_tolerance: float = DEFAULT_SERVER_LATENCY_TOLERANCE,
+    ):
+        """
+        :param max_in_flight: 全局最大并发
+        :param method_max_in_flight: 每个处理函数的最大并发，0 表示不限制
+        :param max_queue_delay: 事件循环调度延迟超过这个时间（秒）时拒绝新的请求
+        :param latency_threshold: 请求耗时超过这个时间（秒）且超过基线耗时的 latency_tolerance 倍时减小并发限制
+        :param latency_tolerance: 请求耗时与基线耗时的最大比例
+        """
+        self.limit = AIMDLimit(
+            max_in_flight, min_limit, latency_threshold=latency_threshold, latency_tolerance=latency_tolerance
+        )
+        self.method_max_in_flight = method_max_in_flight
+        self.min_limit = min_limit
+        self.latency_threshold = latency_threshold
+        self.latency_tolerance = latency_tolerance
+        # 处理函数 -> 并发限制，带参数的路由共享同一个处理函数的限制
+        self.method_limits: Dict[Callable, AIMDLimit] = {}
+        self.max_queue_delay = max_queue_delay
+        # 最近测量的事件循环调度延迟
+        self.queue_delay = 0.0
+        # 被拒绝的请求数
+        self.rejected = 0
+        self._probe_handle: Optional[asyncio.TimerHandle] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """开始测量事件循环的调度延迟 ."""
+        self.stop()
+        self._schedule_probe(loop)
+
+    def stop(self) -> None:
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+
+    def _schedule_probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        expected = loop.time() + PROBE_INTERVAL
+        self._probe_handle = loop.call_at(expected, self._probe, loop, expected)
+
+    def _probe(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        lag = max(0.0, loop.time() - expected)
+        # 延迟变大时立即生效，变小时逐渐衰减
+        self.queue_delay = max(lag, self.queue_delay * 0.5)
+        self._schedule_probe(loop)
+
+    def _get_method_limit(self, handler: Callable) -> Optional[AIMDLimit]:
+        if not self.method_max_in_flight:
+            return None
+        limit = self.method_limits.get(handler)
+        if limit is None:
+            limit = self.method_limits[handler] = AIMDLimit(
+                self.method_max_in_flight,
+                self.min_limit,
+                latency_threshold=self.latency_threshold,
+                latency_tolerance=self.latency_tolerance,
+            )
+        return limit
+
+    def admit(self, handler: Callable) -> Optional[Type[XRPCBaseException]]:
+        """判断是否处理请求，允许处理时返回 None，否则返回用于拒绝请求的异常类 ."""
+        if self.queue_delay > self.max_queue_delay or not self.limit.try_acquire():
+            self.rejected += 1
+            return ServiceUnavailable
+        method_limit = self._get_method_limit(handler)
+        if method_limit is not None and not method_limit.try_acquire():
+            # 请求没有被处理，不能当作一次快速完成的请求增大全局并发限制
+            self.limit.cancel()
+            self.rejected += 1
+            return TooManyRequests
+        return None
+
+    def release(self, handler: Callable, latency: float) -> None:
+        """请求处理完成 ."""
+        self.limit.release(latency)
+        method_limit = self.method_limits.get(handler)
+        if method_limit is not None:
+            method_limit.release(latency)
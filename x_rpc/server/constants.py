@@ -0,0 +1,32 @@
+# 监听地址
+DEFAULT_SERVER_HOST = "127.0.0.1"
+# 监听端口
+DEFAULT_SERVER_PORT = 8000
+# 等待 accept 的连接队列长度
+DEFAULT_SERVER_BACKLOG = 1024
+# 工作进程数
+DEFAULT_SERVER_WORKERS = 1
+# 优雅退出时等待处理中的请求完成的最长时间（秒）
+DEFAULT_SERVER_DRAIN_TIMEOUT = 30.0
+# 优雅退出时还没有收到过请求的新连接，等待客户端发送请求的最长时间（秒）
+DEFAULT_SERVER_DRAIN_NEW_CONNECTION_GRACE = 1.0
+# 优雅退出时检查连接状态的最大间隔（秒）
+DRAIN_POLL_INTERVAL = 0.05
+# 优雅退出信号
+DEFAULT_SERVER_STOP_SIGNAL = "SIGTERM"
+# 重新加载信号
+DEFAULT_SERVER_RELOAD_SIGNAL = "SIGHUP"
+# 全局最大并发请求数，0 表示不启用准入控制
+DEFAULT_SERVER_MAX_IN_FLIGHT = 0
+# 每个处理函数的最大并发请求数，0 表示不限制
+DEFAULT_SERVER_METHOD_MAX_IN_FLIGHT = 0
+# 事件循环调度延迟超过这个时间（秒）时拒绝新的请求
+DEFAULT_SERVER_MAX_QUEUE_DELAY = 0.1
+# 请求耗时超过这个时间（秒）且超过基线耗时的一定倍数时减小并发限制
+DEFAULT_SERVER_LATENCY_THRESHOLD = 0.2
+# 请求耗时超过基线耗时的这个倍数时认为过载
+DEFAULT_SERVER_LATENCY_TOLERANCE = 2.0
+# 工作进程启动后在这个时间（秒）内退出时，延迟重启
+MIN_WORKER_LIFETIME = 1.0
+# 工作进程的重启延迟（秒）
+WORKER_RESTART_DELAY = 1.0
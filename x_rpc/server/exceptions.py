@@ -0,0 +1,10 @@
+from x_rpc.exceptions import XRPCException
+
+
+class RouterException(XRPCException):
+    pass
+
+
+class RouteExists(RouterException):
+    """重复注册路由 ."""
+    pass
@@ -0,0 +1,24 @@
+from asyncio import iscoroutinefunction
+from typing import Callable
+
+from x_rpc.serializer import BaseSerializer
+
+
+def serialized_handler(handler: Callable, serializer: BaseSerializer) -> Callable:
+    """包装处理函数，调用前反序列化请求体，调用后序列化返回结果，路由参数原样传给处理函数 ."""
+    decode = serializer.decode
+    encode = serializer.encode
+
+    if iscoroutinefunction(handler):
+
+        async def async_wrapper(request, **params):
+            request.body = decode(request.body)
+            return encode(await handler(request, **params))
+
+        return async_wrapper
+
+    def wrapper(request, **params):
+        request.body = decode(request.body)
+        return encode(handler(request, **params))
+
+    return wrapper
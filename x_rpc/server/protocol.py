@@ -0,0 +1,179 @@
+import asyncio
+from functools import partial
+from typing import Callable, Type
+
+from x_rpc.codec.exceptions import CodecException
+from x_rpc.exceptions import ErrorCode, InvalidUsage, RequestTimeout, XRPCBaseException, find_error_response
+from x_rpc.exceptions import ErrorResponse, get_error_response
+from x_rpc.utils.deadline import reset_deadline, set_deadline
+
+
+class ServerProtocol(asyncio.Protocol):
+    """服务端连接，解析请求帧并在事件循环中直接分发给处理函数 ."""
+
+    __slots__ = (
+        "server", "codec", "router", "admission", "loop", "transport", "buffer", "in_flight", "connected_at", "served"
+    )
+
+    def __init__(self, server):
+        self.server = server
+        self.codec = server.codec
+        self.router = server.router
+        self.admission = server.admission
+        self.loop = server.loop
+        self.transport = None
+        # 接收缓冲区
+        self.buffer = bytearray()
+        # 当前连接正在处理的异步请求数
+        self.in_flight = 0
+        self.connected_at = 0.0
+        # 是否已经收到过请求
+        self.served = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.connected_at = self.loop.time()
+        self.server.connections.add(self)
+
+    @property
+    def idle(self) -> bool:
+        """没有处理中的请求，也没有收到一半的请求帧 ."""
+        return not self.in_flight and not self.buffer
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.server.connections.discard(self)
+        self.transport = None
+
+    def data_received(self, data: bytes):
+        try:
+            frames = self.codec.decode(self.buffer, data)
+        except CodecException:
+            # 无法解析的数据流，直接断开连接
+            self.transport.close()
+            return
+        if frames:
+            self.served = True
+        for frame in frames:
+            self.dispatch(frame)
+        # 优雅退出时，已经收到的请求处理完成后关闭连接
+        if self.server.draining and self.idle:
+            self.close()
+
+    def dispatch(self, frame):
+        """执行请求处理函数，同步函数直接返回结果，协程创建任务异步返回结果
+
+        启用准入控制时，在反序列化和执行处理函数之前判断是否处理请求，超过限制时直接返回预先编码的错误响应。
+        请求带有截止时间时，已经过期的请求直接返回 RequestTimeout，协程超过截止时间后被取消。
+        """
+        if frame.method is None:
+            self.write_error(frame.request_id, InvalidUsage)
+            return
+        timeout = frame.timeout
+        if timeout is not None and timeout <= 0:
+            self.write_error(frame.request_id, RequestTimeout)
+            return
+        try:
+            handler, params = self.router.get(frame.method)
+        except Exception as exc:
+            self.write_exception(frame.request_id, exc)
+            return
+        started = 0.0
+        if self.admission is not None:
+            rejected = self.admission.admit(handler)
+            if rejected is not None:
+                self.write_error(frame.request_id, rejected)
+                return
+            started = self.loop.time()
+        if timeout is None:
+            self.call_handler(frame, handler, params, started)
+            return
+        deadline = self.loop.time() + timeout
+        # 处理函数中的下游调用使用请求的剩余时间
+        token = set_deadline(deadline)
+        try:
+            self.call_handler(frame, handler, params, started, deadline)
+        finally:
+            reset_deadline(token)
+
+    def call_handler(self, frame, handler: Callable, params, started: float, deadline: float = 0.0) -> None:
+        """调用处理函数，协程超过截止时间后被取消 ."""
+        try:
+            result = handler(frame) if params is None else handler(frame, **params)
+        except Exception as exc:
+            self.release(handler, started)
+            self.write_exception(frame.request_id, exc)
+            return
+        if asyncio.iscoroutine(result):
+            task = self.loop.create_task(result)
+            task.add_done_callback(partial(self.on_task_done, frame.request_id, handler, started, deadline))
+            if deadline:
+                task.add_done_callback(partial(self.cancel_timer, self.loop.call_at(deadline, task.cancel)))
+            self.in_flight += 1
+            self.server.in_flight += 1
+        else:
+            self.release(handler, started)
+            self.write_response(frame.request_id, ErrorCode.SUCCESS, result)
+
+    def release(self, handler: Callable, started: float) -> None:
+        """释放准入控制的并发配额 ."""
+        if self.admission is not None:
+            self.admission.release(handler, self.loop.time() - started)
+
+    @staticmethod
+    def cancel_timer(handle: asyncio.TimerHandle, task: asyncio.Task):
+        handle.cancel()
+
+    def on_task_done(self, request_id: int, handler: Callable, started: float, deadline: float, task: asyncio.Task):
+        self.in_flight -= 1
+        self.server.on_request_done()
+        self.release(handler, started)
+        if task.cancelled():
+            # 超过截止时间被取消
+            if deadline and self.loop.time() >= deadline:
+                self.write_error(request_id, RequestTimeout)
+        else:
+            exc = task.exception()
+            if exc is not None:
+                self.write_exception(request_id, exc)
+            else:
+                self.write_response(request_id, ErrorCode.SUCCESS, task.result())
+        # 优雅退出时，连接上的请求都处理完成后关闭连接
+        if self.server.draining and self.idle:
+            self.close()
+
+    def write_response(self, request_id: int, status: int, body: bytes):
+        # 连接已关闭，丢弃响应
+        if self.transport is None:
+            return
+        try:
+            data = self.codec.encode_response(request_id, status, body or b"")
+        except Exception as exc:
+            # 处理函数返回了无法编码的结果，返回错误响应，不影响同一个连接上后续的请求
+            message = f"invalid response body {type(body).__name__}: {exc}".encode("utf8")
+            data = self.codec.encode_response(request_id, ErrorCode.ERR_UNKNOWN, message)
+        self.transport.write(data)
+
+    def write_error(self, request_id: int, exc_class: Type[XRPCBaseException]):
+        """写入预先编码的错误响应，不创建异常对象，用于过载保护等高频的错误路径 ."""
+        self.write_error_response(request_id, get_error_response(exc_class))
+
+    def write_error_response(self, request_id: int, response: ErrorResponse):
+        if self.transport is None:
+            return
+        self.transport.write(self.codec.encode_cached_response(request_id, response.code, response.body))
+
+    def write_exception(self, request_id: int, exc: Exception):
+        """将异常转换为错误响应，预期内的控制流错误复用预先编码的错误响应 ."""
+        if isinstance(exc, XRPCBaseException):
+            response = find_error_response(exc)
+            if response is not None:
+                self.write_error_response(request_id, response)
+                return
+            status, message = exc.code, exc.message
+        else:
+            status, message = ErrorCode.ERR_UNKNOWN, str(exc)
+        self.write_response(request_id, status, (message or "").encode("utf8"))
@@ -0,0 +1,168 @@
+"""请求路由表
+
+支持两种路由名称：
+
+- RPC 方法名 ``service.method``，使用 ``.`` 分隔
+- HTTP 路径 ``/users/<user_id>/orders``，使用 ``/`` 分隔
+
+``<name>`` 格式的片段匹配任意一个片段，匹配到的值作为关键字参数传给处理函数。
+路由在启动时编译：不带参数的路由放到哈希表中，带参数的路由编译为按片段索引的前缀树，
+匹配时只做字符串切分和字典查找，不使用正则表达式。
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from x_rpc.exceptions import MethodNotSupported, NotFound
+from x_rpc.server.exceptions import RouteExists
+
+# 不限制请求方法
+ANY_METHOD = "*"
+
+
+def split_route(path: str) -> List[str]:
+    """HTTP 路径按 / 切分，RPC 方法名按 . 切分 ."""
+    return path.split("/") if path.startswith("/") else path.split(".")
+
+
+def is_param(segment: str) -> bool:
+    return segment.startswith("<") and segment.endswith(">")
+
+
+def get_route_shape(segments: List[str]) -> Tuple[Optional[str], ...]:
+    """路由的形状，参数片段用 None 表示，形状相同的路由会匹配相同的请求 ."""
+    return tuple(None if is_param(segment) else segment for segment in segments)
+
+
+class Route:
+    """一个路由名称对应的所有处理函数 ."""
+
+    __slots__ = ("path", "handlers", "allow", "param_names")
+
+    def __init__(self, path: str, param_names: Tuple[str, ...]):
+        self.path = path
+        # 请求方法 -> 处理函数
+        self.handlers: Dict[str, Callable] = {}
+        # 预先生成的 Allow 响应头
+        self.allow = ""
+        # 路由参数名，按片段顺序排列
+        self.param_names = param_names
+
+    def get_handler(self, method: Optional[str]) -> Callable:
+        handler = self.handlers.get(method) if method is not None else None
+        if handler is None:
+            handler = self.handlers.get(ANY_METHOD)
+            if handler is None:
+                raise MethodNotSupported(f"method {method} is not allowed for {self.path}", method, self.allow)
+        return handler
+
+
+class RouteNode:
+    """前缀树节点 ."""
+
+    __slots__ = ("children", "param", "route")
+
+    def __init__(self):
+        # 静态片段 -> 子节点
+        self.children: Dict[str, "RouteNode"] = {}
+        # 参数片段的子节点
+        self.param: Optional["RouteNode"] = None
+        self.route: Optional[Route] = None
+
+
+class Router:
+    """路由表，添加路由后调用 compile() 编译，get() 时如果没有编译会自动编译 ."""
+
+    def __init__(self):
+        # 路由名称 -> 路由
+        self.routes: Dict[str, Route] = {}
+        # 路由形状 -> 路由名称
+        self.shapes: Dict[Tuple[Optional[str], ...], str] = {}
+        # 不带参数的路由
+        self.static: Dict[str, Route] = {}
+        self.root = RouteNode()
+        self.compiled = False
+
+    def add_route(self, path: str, handler: Callable, methods: Optional[Iterable[str]] = None) -> None:
+        """注册路由
+
+        :param methods: 允许的请求方法，默认不限制请求方法
+        :raises RouteExists: 路由的请求方法已经注册过，或者与已有路由只有参数名不同
+        """
+        methods = [method.upper() for method in methods or (ANY_METHOD,)]
+        route = self.routes.get(path)
+        if route is None:
+            segments = split_route(path)
+            shape = get_route_shape(segments)
+            # 参数名不同的同形状路由在前缀树中是同一个节点，后注册的会覆盖先注册的
+            exists = self.shapes.get(shape)
+            if exists is not None:
+                raise RouteExists(f"route {path} conflicts with {exists}")
+            param_names = tuple(segment[1:-1] for segment in segments if is_param(segment))
+            route = self.routes[path] = Route(path, param_names)
+            self.shapes[shape] = path
+        else:
+            for method in methods:
+                if method in route.handlers:
+                    raise RouteExists(f"route {path} already has a handler for method {method}")
+        for method in methods:
+            route.handlers[method] = handler
+        self.compiled = False
+
+    def compile(self) -> None:
+        """生成哈希表、前缀树和 Allow 响应头 ."""
+        self.static = {}
+        self.root = RouteNode()
+        for path, route in self.routes.items():
+            route.allow = ", ".join(sorted(method for method in route.handlers if method != ANY_METHOD))
+            if not route.param_names:
+                self.static[path] = route
+                continue
+            node = self.root
+            for segment in split_route(path):
+                if is_param(segment):
+                    if node.param is None:
+                        node.param = RouteNode()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, RouteNode())
+            node.route = route
+        self.compiled = True
+
+    def _match(self, node: RouteNode, segments: List[str], index: int, values: List[str]) -> Optional[Route]:
+        """优先匹配静态片段，匹配失败时回溯到参数片段 ."""
+        if index == len(segments):
+            return node.route
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            route = self._match(child, segments, index + 1, values)
+            if route is not None:
+                return route
+        if node.param is not None and segment:
+            values.append(segment)
+            route = self._match(node.param, segments, index + 1, values)
+            if route is not None:
+                return route
+            values.pop()
+        return None
+
+    def get(self, path: str, method: Optional[str] = None) -> Tuple[Callable, Optional[Dict[str, str]]]:
+        """查找处理函数，返回处理函数和路由参数，不带参数的路由返回的路由参数为 None ."""
+        if not self.compiled:
+            self.compile()
+        if method is not None:
+            # 与注册时一样，请求方法不区分大小写
+            method = method.upper()
+        route = self.static.get(path)
+        if route is not None:
+            return route.get_handler(method), None
+        values: List[str] = []
+        route = self._match(self.root, split_route(path), 0, values)
+        if route is None:
+            raise NotFound(f"method {path} not found")
+        return route.get_handler(method), dict(zip(route.param_names, values))
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.routes
+
+    def __len__(self) -> int:
+        return len(self.routes)
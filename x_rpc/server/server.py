@@ -0,0 +1,206 @@
+import asyncio
+import signal
+from typing import Callable, Optional, Set, Union
+
+from x_rpc.codec import CodecType
+from x_rpc.config import Config
+from x_rpc.exceptions import InvalidSignal
+from x_rpc.plugin import PluginType, get_plugin_instance
+from x_rpc.server.constants import (
+    DEFAULT_SERVER_BACKLOG,
+    DEFAULT_SERVER_DRAIN_NEW_CONNECTION_GRACE,
+    DEFAULT_SERVER_DRAIN_TIMEOUT,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_LATENCY_THRESHOLD,
+    DEFAULT_SERVER_LATENCY_TOLERANCE,
+    DEFAULT_SERVER_MAX_IN_FLIGHT,
+    DEFAULT_SERVER_MAX_QUEUE_DELAY,
+    DEFAULT_SERVER_METHOD_MAX_IN_FLIGHT,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_RELOAD_SIGNAL,
+    DEFAULT_SERVER_STOP_SIGNAL,
+    DEFAULT_SERVER_WORKERS,
+    DRAIN_POLL_INTERVAL,
+)
+from x_rpc.serializer import get_serializer, get_service_name
+from x_rpc.server.admission import AdmissionController
+from x_rpc.server.handler import serialized_handler
+from x_rpc.server.protocol import ServerProtocol
+from x_rpc.server.router import Router
+from x_rpc.transport import TransportType
+
+
+def get_signal(name: Union[str, int]) -> signal.Signals:
+    """根据信号名称获得信号，当前平台不支持的信号抛出 InvalidSignal ."""
+    try:
+        return signal.Signals(name) if isinstance(name, int) else signal.Signals[name.upper()]
+    except (KeyError, ValueError):
+        raise InvalidSignal(f"invalid signal {name}")
+
+
+class Server:
+    """基于 asyncio.Protocol 的RPC服务 ."""
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config if config is not None else Config()
+        self.host = self.config.get("SERVER_HOST", DEFAULT_SERVER_HOST)
+        self.port = self.config.get("SERVER_PORT", DEFAULT_SERVER_PORT)
+        self.backlog = self.config.get("SERVER_BACKLOG", DEFAULT_SERVER_BACKLOG)
+        self.workers = self.config.get("SERVER_WORKERS", DEFAULT_SERVER_WORKERS)
+        self.drain_timeout = self.config.get("SERVER_DRAIN_TIMEOUT", DEFAULT_SERVER_DRAIN_TIMEOUT)
+        self.drain_new_connection_grace = self.config.get(
+            "SERVER_DRAIN_NEW_CONNECTION_GRACE", DEFAULT_SERVER_DRAIN_NEW_CONNECTION_GRACE
+        )
+        self.stop_signal = get_signal(self.config.get("SERVER_STOP_SIGNAL", DEFAULT_SERVER_STOP_SIGNAL))
+        self.reload_signal = get_signal(self.config.get("SERVER_RELOAD_SIGNAL", DEFAULT_SERVER_RELOAD_SIGNAL))
+        # 编解码器和传输层通过插件获取
+        self.codec = get_plugin_instance(PluginType.CODEC, self.config.get("SERVER_CODEC", CodecType.XRPC))
+        self.transport = get_plugin_instance(
+            PluginType.TRANSPORT, self.config.get("SERVER_TRANSPORT", TransportType.TCP)
+        )
+        # 准入控制，没有配置最大并发时不启用
+        self.admission = self._create_admission()
+        # 方法名/路径 -> 处理函数
+        self.router = Router()
+        # 当前所有的连接
+        self.connections: Set[ServerProtocol] = set()
+        # 正在处理的异步请求数
+        self.in_flight = 0
+        # 优雅退出中，不再处理新的请求
+        self.draining = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _create_admission(self) -> Optional[AdmissionController]:
+        max_in_flight = self.config.get("SERVER_MAX_IN_FLIGHT", DEFAULT_SERVER_MAX_IN_FLIGHT)
+        if not max_in_flight:
+            return None
+        return AdmissionController(
+            max_in_flight,
+            method_max_in_flight=self.config.get("SERVER_METHOD_MAX_IN_FLIGHT", DEFAULT_SERVER_METHOD_MAX_IN_FLIGHT),
+            max_queue_delay=self.config.get("SERVER_MAX_QUEUE_DELAY", DEFAULT_SERVER_MAX_QUEUE_DELAY),
+            latency_threshold=self.config.get("SERVER_LATENCY_THRESHOLD", DEFAULT_SERVER_LATENCY_THRESHOLD),
+            latency_tolerance=self.config.get("SERVER_LATENCY_TOLERANCE", DEFAULT_SERVER_LATENCY_TOLERANCE),
+        )
+
+    def add_handler(self, method: str, handler: Callable, serialize: bool = False) -> None:
+        """注册请求处理函数，处理函数可以是普通函数或协程函数
+
+        请求帧中没有 HTTP 请求方法，注册的路由不限制请求方法。
+
+        :param method: 方法名 service.method 或者 HTTP 路径，<name> 格式的片段作为关键字参数传给处理函数
+        :param serialize: 是否使用服务配置的序列化插件处理请求体和返回值
+        """
+        if serialize:
+            serializer = get_serializer(self.config, get_service_name(method))
+            handler = serialized_handler(handler, serializer)
+        self.router.add_route(method, handler)
+
+    def handler(self, method: Optional[str] = None, serialize: bool = False) -> Callable:
+        """请求处理函数注册装饰器，默认使用函数名作为方法名 ."""
+
+        def wrapper(func: Callable) -> Callable:
+            self.add_handler(method or func.__name__, func, serialize)
+            return func
+
+        return wrapper
+
+    @property
+    def sockets(self):
+        return self._server.sockets if self._server else ()
+
+    async def start(self, **kwargs) -> None:
+        """开始监听端口 ."""
+        self.loop = asyncio.get_running_loop()
+        # 启动时编译路由表
+        self.router.compile()
+        if self.admission is not None:
+            self.admission.start(self.loop)
+        self._server = await self.transport.create_server(
+            self._protocol_factory, self.host, self.port, self.backlog, **kwargs
+        )
+
+    def _protocol_factory(self) -> ServerProtocol:
+        return ServerProtocol(self)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """停止监听并关闭所有连接 ."""
+        if self._server is None:
+            return
+        self._server.close()
+        for connection in list(self.connections):
+            if connection.transport is not None:
+                connection.transport.close()
+        await self._server.wait_closed()
+        if self.admission is not None:
+            self.admission.stop()
+        self._server = None
+        self.draining = False
+
+    def on_request_done(self) -> None:
+        """异步请求处理完成 ."""
+        self.in_flight -= 1
+
+    def _close_idle_connections(self, connected_before: float) -> None:
+        """关闭空闲的连接，还没有收到过请求的新连接在宽限期内不关闭，等待客户端发送请求 ."""
+        for connection in list(self.connections):
+            if connection.idle and (connection.served or connection.connected_at <= connected_before):
+                connection.close()
+
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        """优雅退出：停止接受新连接，关闭空闲连接，等待处理中的请求完成后关闭所有连接
+
+        退出过程中已经建立的连接上收到的请求仍然会被处理，响应后关闭连接。
+
+        :param timeout: 等待处理中的请求完成的最长时间，默认使用 SERVER_DRAIN_TIMEOUT
+        """
+        if self._server is None:
+            return
+        self.draining = True
+        self._server.close()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.drain_timeout if timeout is None else timeout)
+        delay = 0.001
+        # 根据连接状态判断是否可以关闭，不依赖事件循环调度的次数：
+        # 每次检查之前先让事件循环读取已经收到的数据，处理中的请求完成后连接自行关闭
+        while self.connections and loop.time() < deadline:
+            await asyncio.sleep(delay)
+            self._close_idle_connections(loop.time() - self.drain_new_connection_grace)
+            delay = min(delay * 2, DRAIN_POLL_INTERVAL)
+        await self.close()
+
+    async def serve_until_signal(self, reload_config: bool = True, **kwargs) -> None:
+        """运行服务直到收到退出信号，收到退出信号后优雅退出
+
+        :param reload_config: 收到重新加载信号时是否重新加载配置，工作进程由主进程处理重新加载信号
+        """
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        loop.add_signal_handler(self.stop_signal, stopped.set)
+        if reload_config:
+            loop.add_signal_handler(self.reload_signal, self.config.reload)
+        try:
+            await self.start(**kwargs)
+            await stopped.wait()
+            await self.shutdown()
+        finally:
+            loop.remove_signal_handler(self.stop_signal)
+            if reload_config:
+                loop.remove_signal_handler(self.reload_signal)
+
+    def run(self) -> None:
+        """运行服务，配置了多个工作进程时由主进程 fork 工作进程 ."""
+        if self.workers > 1:
+            from x_rpc.server.supervisor import Supervisor
+
+            Supervisor(self, self.workers).run()
+            return
+        try:
+            asyncio.run(self.serve_until_signal())
+        except KeyboardInterrupt:
+            pass
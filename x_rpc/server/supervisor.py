@@ -0,0 +1,221 @@
+import asyncio
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from x_rpc.plugin import load_plugins
+from x_rpc.server.constants import MIN_WORKER_LIFETIME, WORKER_RESTART_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+class Supervisor:
+    """预先 fork 多个工作进程的主进程
+
+    主进程在 fork 之前加载配置、初始化插件并编译路由表，工作进程通过写时复制共享这些内存；
+    主进程为每个工作进程创建一个设置了 SO_REUSEPORT 的监听套接字，由内核在套接字之间分配连接，
+    监听套接字一直由主进程持有，重启的工作进程继承同一个套接字，等待 accept 的连接不会丢失。
+
+    - 工作进程异常退出后自动重启
+    - 收到重新加载信号（默认 SIGHUP）后重新加载配置，启动新一代工作进程，旧的工作进程优雅退出；
+      配置加载失败时记录日志，当前的工作进程继续运行
+    - 收到退出信号（默认 SIGTERM）或 SIGINT 后通知所有工作进程优雅退出
+
+    信号处理函数只记录收到的信号，通过 signal.set_wakeup_fd 唤醒主循环，由主循环重新加载或退出，
+    避免在信号处理函数中 fork 或抛出异常。
+    """
+
+    def __init__(self, server, workers: Optional[int] = None):
+        self.server = server
+        # 默认使用配置中的工作进程数，没有配置时使用 CPU 核数
+        self.workers = workers or server.config.get("SERVER_WORKERS") or os.cpu_count() or 1
+        # 工作进程ID -> (工作进程序号, 启动时间, 代数)
+        self.processes: Dict[int, tuple] = {}
+        self.running = False
+        # 当前这一代工作进程，重新加载后加一
+        self.generation = 0
+        # 每个工作进程序号对应的监听套接字
+        self.sockets: List[socket.socket] = []
+        # 等待主循环处理的信号
+        self._signals: Deque[int] = deque()
+        # 唤醒主循环的管道 (读端, 写端)
+        self._wakeup_fds: tuple = ()
+
+    def _create_sockets(self) -> None:
+        family, socktype, proto, _, address = socket.getaddrinfo(
+            self.server.host, self.server.port, type=socket.SOCK_STREAM
+        )[0]
+        for _ in range(self.workers):
+            sock = socket.socket(family, socktype, proto)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(address)
+            sock.listen(self.server.backlog)
+            sock.setblocking(False)
+            self.sockets.append(sock)
+            # 监听随机端口时，所有套接字使用第一个套接字分配到的端口
+            address = sock.getsockname()
+        self.server.port = address[1]
+
+    def _prepare(self) -> None:
+        """fork 之前在主进程中完成初始化 ."""
+        # 生成配置快照
+        _ = self.server.config.snapshot
+        self.server.router.compile()
+        load_plugins()
+        self._create_sockets()
+        # 之后创建的对象不会修改已有对象的引用计数页，减少写时复制
+        gc.freeze()
+
+    def spawn(self, index: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(index)
+        self.processes[pid] = (index, time.monotonic(), self.generation)
+        logger.info("worker %d started, pid %d, generation %d", index, pid, self.generation)
+        return pid
+
+    def _run_worker(self, index: int) -> None:
+        """工作进程入口，不会返回 ."""
+        code = 0
+        try:
+            # 工作进程不管理其他工作进程
+            self.processes.clear()
+            signal.set_wakeup_fd(-1)
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(self.server.stop_signal, signal.SIG_DFL)
+            # 由主进程统一处理 Ctrl+C 和重新加载
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(self.server.reload_signal, signal.SIG_IGN)
+            sock = self.sockets[index]
+            for other in self.sockets:
+                if other is not sock:
+                    other.close()
+            asyncio.run(self.server.serve_until_signal(reload_config=False, sock=sock))
+        except BaseException:
+            logger.exception("worker %d failed", index)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _terminate(self, pids) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, self.server.stop_signal)
+            except ProcessLookupError:
+                pass
+
+    def stop(self, *_) -> None:
+        """通知所有工作进程优雅退出 ."""
+        self.running = False
+        self._terminate(list(self.processes))
+
+    def reload(self, *_) -> None:
+        """重新加载配置并启动新一代工作进程，然后通知旧的工作进程优雅退出
+
+        新旧工作进程共享同一组监听套接字，旧的工作进程停止 accept 后由新的工作进程继续 accept。
+        配置加载失败时不启动新一代工作进程。
+        """
+        if not self.running:
+            return
+        try:
+            self.server.config.reload()
+        except Exception:
+            logger.exception("failed to reload config, keep workers of generation %d running", self.generation)
+            return
+        old_pids = [pid for pid, (_, _, generation) in self.processes.items() if generation == self.generation]
+        self.generation += 1
+        gc.freeze()
+        for index in range(self.workers):
+            self.spawn(index)
+        self._terminate(old_pids)
+
+    def _on_exit(self, pid: int, status: int) -> None:
+        index, started, generation = self.processes.pop(pid)
+        code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+        # 旧的工作进程退出不需要重启
+        if not self.running or generation != self.generation:
+            return
+        logger.warning("worker %d exited with %d, restarting", index, code)
+        # 启动后很快就退出，延迟重启避免频繁 fork
+        if time.monotonic() - started < MIN_WORKER_LIFETIME:
+            time.sleep(WORKER_RESTART_DELAY)
+        # 等待期间可能收到了重新加载信号，新一代工作进程已经启动，不需要再重启
+        if self.running and generation == self.generation:
+            self.spawn(index)
+
+    def _on_signal(self, signum: int, _) -> None:
+        self._signals.append(signum)
+
+    def _handle_signals(self) -> None:
+        while self._signals:
+            signum = self._signals.popleft()
+            if signum == self.server.reload_signal:
+                self.reload()
+            elif signum != signal.SIGCHLD:
+                self.stop()
+
+    def _reap(self) -> bool:
+        """回收所有已退出的工作进程，没有子进程时返回 False ."""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return False
+            if pid == 0:
+                return True
+            if pid in self.processes:
+                self._on_exit(pid, status)
+
+    def _wait_signal(self) -> None:
+        """等待信号唤醒主循环 ."""
+        wakeup_fd = self._wakeup_fds[0]
+        select.select([wakeup_fd], [], [])
+        try:
+            while os.read(wakeup_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def run(self) -> None:
+        """启动所有工作进程，并在工作进程退出后重启，直到收到退出信号 ."""
+        self._prepare()
+        self.running = True
+        self._wakeup_fds = os.pipe()
+        for fd in self._wakeup_fds:
+            os.set_blocking(fd, False)
+        previous_wakeup_fd = signal.set_wakeup_fd(self._wakeup_fds[1])
+        # 工作进程退出时也需要唤醒主循环
+        previous_handlers = {
+            signum: signal.signal(signum, self._on_signal)
+            for signum in (self.server.stop_signal, signal.SIGINT, self.server.reload_signal, signal.SIGCHLD)
+        }
+        try:
+            for index in range(self.workers):
+                self.spawn(index)
+            # 先回收已退出的工作进程再处理信号，处理信号期间收到的信号会再次唤醒主循环
+            while self.processes and self._reap():
+                if self._signals:
+                    self._handle_signals()
+                    continue
+                self._wait_signal()
+        finally:
+            self.stop()
+            signal.set_wakeup_fd(previous_wakeup_fd)
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            self._wakeup_fds = ()
+            for sock in self.sockets:
+                sock.close()
+            self.sockets.clear()
+            gc.unfreeze()
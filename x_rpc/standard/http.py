@@ -65,6 +65,9 @@ STATUS_CODES: Dict[int, bytes] = {
     511: b"Network Authentication Required",
 }
 
+# 解码后的状态码描述，避免每次创建异常时解码
+STATUS_MESSAGES: Dict[int, str] = {code: phrase.decode("ascii") for code, phrase in STATUS_CODES.items()}
+
 # According to https://tools.ietf.org/html/rfc2616#section-7.1
 _ENTITY_HEADERS = frozenset(
     [
@@ -0,0 +1,4 @@
+from .base import BaseTransport, TransportType
+from .tcp_transport import TcpTransport
+
+__all__ = ["BaseTransport", "TcpTransport", "TransportType"]
@@ -0,0 +1,17 @@
+from abc import ABCMeta, abstractmethod
+from enum import IntEnum, unique
+
+
+@unique
+class TransportType(IntEnum):
+    TCP = 1
+
+
+class BaseTransport(metaclass=ABCMeta):
+    @abstractmethod
+    async def create_server(self, protocol_factory, host: str, port: int, backlog: int, **kwargs):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_connection(self, protocol_factory, host: str, port: int, **kwargs):
+        raise NotImplementedError
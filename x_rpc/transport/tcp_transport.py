@@ -0,0 +1,19 @@
+import asyncio
+
+from x_rpc.plugin import PluginType, register_plugin
+from x_rpc.transport.base import BaseTransport, TransportType
+
+
+@register_plugin(PluginType.TRANSPORT, TransportType.TCP)
+class TcpTransport(BaseTransport):
+    async def create_server(self, protocol_factory, host: str, port: int, backlog: int, **kwargs):
+        """监听TCP端口，asyncio 会为每个连接设置 TCP_NODELAY，传入 sock 时使用已经监听的套接字 ."""
+        loop = asyncio.get_running_loop()
+        if kwargs.get("sock") is not None:
+            return await loop.create_server(protocol_factory, backlog=backlog, **kwargs)
+        return await loop.create_server(protocol_factory, host, port, backlog=backlog, **kwargs)
+
+    async def create_connection(self, protocol_factory, host: str, port: int, **kwargs):
+        """建立TCP连接 ."""
+        loop = asyncio.get_running_loop()
+        return await loop.create_connection(protocol_factory, host, port, **kwargs)
@@ -0,0 +1,36 @@
+"""请求截止时间
+
+服务端在调用处理函数时把请求的截止时间保存到上下文变量中，处理函数中发起的下游调用
+使用剩余时间作为超时时间，并继续传递给下游服务。截止时间使用事件循环的时钟。
+"""
+import asyncio
+from contextvars import ContextVar, Token
+from typing import Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("x_rpc_deadline", default=None)
+
+
+def get_deadline() -> Optional[float]:
+    """获得当前请求的截止时间，没有截止时间时返回 None ."""
+    return _deadline.get()
+
+
+def set_deadline(deadline: Optional[float]) -> Token:
+    """设置当前上下文的截止时间，返回用于恢复的 token ."""
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def get_timeout(timeout: Optional[float] = None) -> Optional[float]:
+    """计算下游调用的超时时间，取指定的超时时间和当前请求剩余时间中较小的一个
+
+    :return: 都没有时返回 None，已经过期时返回的值小于等于 0
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout
+    remaining = deadline - asyncio.get_running_loop().time()
+    return remaining if timeout is None or remaining < timeout else timeout
@@ -1,20 +1,38 @@
+import re
+from typing import Union
+
+TRUE_VALUES = frozenset({"y", "yes", "yep", "yup", "t", "true", "on", "enable", "enabled", "1"})
+FALSE_VALUES = frozenset({"n", "no", "f", "false", "off", "disable", "disabled", "0"})
+
+# 与 int() 和 float() 接受的字符串格式一致
+DIGITS = r"\d+(?:_\d+)*"
+INT_PATTERN = re.compile(rf"\s*[+-]?{DIGITS}\s*")
+FLOAT_PATTERN = re.compile(
+    rf"\s*[+-]?(?:(?:{DIGITS}\.(?:{DIGITS})?|\.{DIGITS}|{DIGITS})(?:[eE][+-]?{DIGITS})?|inf|infinity|nan)\s*",
+    re.IGNORECASE,
+)
+
+
 def str_to_bool(val: str) -> bool:
     """将字符串转换为bool类型 ."""
     val = val.lower()
-    if val in {
-        "y",
-        "yes",
-        "yep",
-        "yup",
-        "t",
-        "true",
-        "on",
-        "enable",
-        "enabled",
-        "1",
-    }:
+    if val in TRUE_VALUES:
         return True
-    elif val in {"n", "no", "f", "false", "off", "disable", "disabled", "0"}:
+    elif val in FALSE_VALUES:
         return False
     else:
         raise ValueError(f"Invalid truth value {val}")
+
+
+def guess_value(val: str) -> Union[int, float, bool, str]:
+    """按 int、float、bool、str 的顺序推断字符串的类型，先匹配格式再转换，不依赖捕获异常 ."""
+    if INT_PATTERN.fullmatch(val):
+        return int(val)
+    if FLOAT_PATTERN.fullmatch(val):
+        return float(val)
+    lower_val = val.lower()
+    if lower_val in TRUE_VALUES:
+        return True
+    if lower_val in FALSE_VALUES:
+        return False
+    return val
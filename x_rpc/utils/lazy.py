@@ -0,0 +1,24 @@
+import sys
+from importlib import import_module
+
+
+def lazy_exports(module_name: str, exports: dict) -> tuple:
+    """生成包的 __getattr__ 和 __dir__，导出的名称在第一次访问时才导入所在模块
+
+    :param exports: 导出名称 -> 所在模块
+    本模块不导入 typing，保证包的导入足够快。
+    """
+
+    def __getattr__(name: str):
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(import_module(target), name)
+        # 缓存到包中，之后的访问不再调用 __getattr__
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,14 +1,67 @@
 import types
 from importlib import import_module
 from importlib.util import module_from_spec, spec_from_file_location
-from inspect import ismodule
 from os import environ as os_environ
+from os import stat as os_stat
 from pathlib import Path
 from re import findall as re_findall
-from typing import Union
+from time import perf_counter
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from x_rpc.exceptions import LoadFileException, PyFileException
 
+# 文件路径 -> (文件签名, 字节码)
+_code_cache: Dict[str, Tuple[Tuple[int, int], CodeType]] = {}
+
+
+class _ImportFailure:
+    """导入失败的模块字符串 ."""
+
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+# (模块字符串, 包名) -> 模块/类/函数，或者导入失败的异常
+_import_cache: Dict[Tuple[str, Optional[str]], Any] = {}
+# 模块字符串 -> 首次导入的耗时（秒）
+_import_times: Dict[str, float] = {}
+
+
+def resolve_string(module_name: str, package=None):
+    """按模块字符串获得模块/类/函数，结果会被缓存
+
+    导入失败的模块字符串也会被缓存，再次导入时直接抛出相同的异常，调用 clear_import_cache() 后才会重新导入。
+    """
+    key = (module_name, package)
+    try:
+        obj = _import_cache[key]
+    except KeyError:
+        pass
+    else:
+        if isinstance(obj, _ImportFailure):
+            raise obj.exception.with_traceback(None)
+        return obj
+
+    start = perf_counter()
+    try:
+        module, klass = module_name.rsplit(".", 1)
+        obj = getattr(import_module(module, package=package), klass)
+    except (ImportError, AttributeError, ValueError) as exc:
+        _import_cache[key] = _ImportFailure(exc)
+        raise
+    finally:
+        _import_times[module_name] = perf_counter() - start
+    _import_cache[key] = obj
+    return obj
+
+
+def instantiate_string(module_name: str, *args, **kwargs):
+    """按模块字符串获得类并创建一个新的实例，类的查找结果会被缓存 ."""
+    return resolve_string(module_name)(*args, **kwargs)
+
 
 def import_string(module_name, package=None):
     """按模块字符串加载
@@ -20,16 +73,24 @@ def import_string(module_name, package=None):
     module_name is a valid path to class
 
     """
-    module, klass = module_name.rsplit(".", 1)
-    module = import_module(module, package=package)
-    obj = getattr(module, klass)
-    if ismodule(obj):
+    obj = resolve_string(module_name, package)
+    if isinstance(obj, types.ModuleType):
         return obj
     return obj()
 
 
-def load_module_from_path(location: Union[bytes, str], encoding: str = "utf8", *args, **kwargs):
-    # 1) Parse location.
+def get_import_times() -> List[Tuple[str, float]]:
+    """获得每个模块字符串首次导入的耗时（秒），按耗时从大到小排列 ."""
+    return sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+
+
+def clear_import_cache() -> None:
+    _import_cache.clear()
+    _import_times.clear()
+
+
+def resolve_location(location: Union[bytes, str, Path], encoding: str = "utf8") -> str:
+    """将路径中的环境变量 ${some_env_var} 替换为环境变量的值 ."""
     # 文件路径转换为str类型
     if isinstance(location, bytes):
         location = location.decode(encoding)
@@ -54,7 +115,34 @@ def load_module_from_path(location: Union[bytes, str], encoding: str = "utf8", *
         for env_var in env_vars_in_location:
             location = location.replace("${" + env_var + "}", os_environ[env_var])
 
-    location = str(location)
+    return str(location)
+
+
+def get_file_signature(location: str) -> Tuple[int, int]:
+    """获得文件的修改时间和大小，用于判断文件是否发生变化 ."""
+    stat_result = os_stat(location)
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def compile_file(location: str) -> CodeType:
+    """编译文件，文件没有变化时使用缓存的字节码 ."""
+    signature = get_file_signature(location)
+    cached = _code_cache.get(location)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(location) as config_file:
+        code = compile(config_file.read(), location, "exec")
+    _code_cache[location] = (signature, code)
+    return code
+
+
+def clear_code_cache() -> None:
+    _code_cache.clear()
+
+
+def load_module_from_path(location: Union[bytes, str], encoding: str = "utf8", *args, **kwargs):
+    # 1) Parse location.
+    location = resolve_location(location, encoding)
     if ".py" in location:
         # 获得文件名，去掉后缀，例如：a / b.c -> b
         name = location.split("/")[-1].split(".")[
@@ -72,11 +160,7 @@ def load_module_from_path(location: Union[bytes, str], encoding: str = "utf8", *
         module = types.ModuleType("config")
         module.__file__ = str(location)
         try:
-            with open(location) as config_file:
-                exec(  # nosec
-                    compile(config_file.read(), location, "exec"),
-                    module.__dict__,
-                )
+            exec(compile_file(location), module.__dict__)  # nosec
         except IOError as e:
             e.strerror = "Unable to load configuration file (e.strerror)"
             raise